@@ -0,0 +1,92 @@
+"""Per-request database overhead: connect-per-call vs pooled connections.
+
+Replays the DB traffic of one ``POST /api/posts/<id>/post-now`` request
+(read the post, flip it to 'posting', store the result, re-read it) against
+a throwaway database, first with the old "open, PRAGMA, query, close" helper
+and then with the pooled helpers from ``server/database.py``.
+
+Usage:
+    python benchmarks/bench_db.py [--requests 2000]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+import database  # noqa: E402
+
+
+def _legacy_connection(db_path):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _legacy_request(db_path, post_id):
+    conn = _legacy_connection(db_path)
+    conn.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
+    conn.close()
+
+    conn = _legacy_connection(db_path)
+    conn.execute('UPDATE posts SET status = ?, updated_at = ? WHERE id = ?',
+                 ('posting', datetime.now().isoformat(), post_id))
+    conn.commit()
+    conn.close()
+
+    conn = _legacy_connection(db_path)
+    now = datetime.now().isoformat()
+    conn.execute('UPDATE posts SET status = ?, posted_at = ?, tweet_url = ?, updated_at = ? WHERE id = ?',
+                 ('posted', now, 'https://x.com/bench/status/1', now, post_id))
+    conn.commit()
+    conn.close()
+
+    conn = _legacy_connection(db_path)
+    conn.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
+    conn.close()
+
+
+def _pooled_request(post_id):
+    database.get_post(post_id)
+    database.update_post_status(post_id, 'posting')
+    database.update_post(post_id, status='posted', posted_at=datetime.now().isoformat(),
+                         tweet_url='https://x.com/bench/status/1')
+    database.get_post(post_id)
+
+
+def _run(label, fn, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_request_ms = elapsed / requests * 1000
+    print(f"{label:<20} {requests:>6} requests  {elapsed:7.3f}s  {per_request_ms:7.3f} ms/request")
+    return per_request_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, 'bench.db')
+        database.init_db()
+        post_id = database.create_post(text='benchmark post', status='draft')
+
+        legacy = _run('connect-per-call', lambda: _legacy_request(database.DB_PATH, post_id), args.requests)
+        pooled = _run('pooled', lambda: _pooled_request(post_id), args.requests)
+        database.close_all()
+
+    print(f"speedup: {legacy / pooled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
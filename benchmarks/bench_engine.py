@@ -0,0 +1,94 @@
+"""Bot throughput: sync engine vs asyncio engine, in operations per minute.
+
+Sends ``--ops`` posts through the real bot.post_to_x() from ``--callers``
+threads at once (like the app's job executor), first with
+``BOT_ENGINE=sync`` (the browser worker pool, ``--pool-size`` workers),
+then with ``BOT_ENGINE=async`` (``--concurrency`` pages of one browser).
+Both run against the local x.com stand-in of benchmarks/fake_x.py, with
+the bot's own waits and pauses, so no X account is needed.
+
+Each engine is warmed up with one unmeasured post (browser launch and
+login). Throughput counts successful posts only; the exit status is 1 if
+any post failed.
+
+Usage:
+    python benchmarks/bench_engine.py [--ops 12] [--callers 3] [--concurrency 3] [--pool-size 1]
+
+Needs Playwright's Chromium (``playwright install chromium``) or Chrome.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'server'))
+sys.path.insert(0, HERE)
+
+import fake_x  # noqa: E402
+
+TEXT = "Benchmark post {} - " + "lorem ipsum dolor sit amet " * 8
+
+
+def _run(bot, engine, ops, callers):
+    """Post ``ops`` times on ``engine``; returns (successes, elapsed seconds)."""
+    os.environ['BOT_ENGINE'] = engine
+    bot.restart_browser()
+    warm_up = bot.post_to_x(TEXT.format(f'{engine} warm-up'))
+    if not warm_up.get('success'):
+        raise SystemExit(f"{engine} warm-up failed, not measuring: {warm_up.get('error')}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        results = list(executor.map(lambda i: bot.post_to_x(TEXT.format(f'{engine}-{i}')), range(ops)))
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if not result.get('success'):
+            print(f"  {engine} post failed: {result.get('error')}")
+    return sum(1 for r in results if r.get('success')), elapsed
+
+
+def _report(label, ok, ops, elapsed):
+    ops_per_min = ok / elapsed * 60
+    print(f"{label:<12} {ok:>4}/{ops:<4} ok  {elapsed:7.2f}s  {ops_per_min:7.1f} ops/min")
+    return ops_per_min
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=12)
+    parser.add_argument('--callers', type=int, default=3, help='threads calling post_to_x() at once')
+    parser.add_argument('--concurrency', type=int, default=3, help='BOT_ASYNC_CONCURRENCY')
+    parser.add_argument('--pool-size', type=int, default=1, help='BROWSER_POOL_SIZE of the sync engine')
+    parser.add_argument('--latency', type=float, default=80, help='ms added to every fake X response')
+    parser.add_argument('--render-ms', type=float, default=300, help='ms before a page renders its content')
+    args = parser.parse_args()
+
+    server, _, base_url = fake_x.start(0, args.latency, 40, args.render_ms)
+    fake_x.configure_bot(base_url)
+    os.environ['BROWSER_POOL_SIZE'] = str(args.pool_size)
+    os.environ['BOT_ASYNC_CONCURRENCY'] = str(args.concurrency)
+    import bot
+
+    print(f"Fake X at {base_url}, {args.ops} posts from {args.callers} caller(s)")
+    try:
+        sync_ok, sync_elapsed = _run(bot, 'sync', args.ops, args.callers)
+        async_ok, async_elapsed = _run(bot, 'async', args.ops, args.callers)
+    finally:
+        bot.close()
+        if 'bot_async' in sys.modules:
+            sys.modules['bot_async'].close()
+        server.shutdown()
+
+    sync_rate = _report(f'sync x{args.pool_size}', sync_ok, args.ops, sync_elapsed)
+    async_rate = _report(f'async x{args.concurrency}', async_ok, args.ops, async_elapsed)
+    if sync_rate:
+        print(f"speedup: {async_rate / sync_rate:.1f}x")
+    if sync_ok < args.ops or async_ok < args.ops:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""End-to-end bot flows against the local x.com stand-in (benchmarks/fake_x.py).
+
+Runs the public bot API the app uses: post_to_x (post now), post_to_x with
+a date (schedule on X), delete_tweet on the posted tweets,
+delete_scheduled_tweet on the scheduled ones, then fetch_profile. It
+reports per operation how many succeeded and, over the successful runs,
+p50/p95/max latency and throughput. The exit status is 1 if any operation
+failed.
+
+The bot runs with its real delays and waits, on a scratch Chrome profile
+and data directory, so the account, cookies and selector stats of the
+installed app are left alone.
+
+``--save`` writes the results as JSON; ``--baseline`` compares a run with
+a saved one, e.g. before and after an engine change:
+
+    python benchmarks/bench_flows.py --save before.json
+    python benchmarks/bench_flows.py --engine async --baseline before.json
+
+Usage:
+    python benchmarks/bench_flows.py [--ops 5] [--latency 80] [--render-ms 300] [--engine sync]
+
+Needs Playwright's Chromium (``playwright install chromium``) or Chrome.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'server'))
+sys.path.insert(0, HERE)
+
+import fake_x  # noqa: E402
+
+OPERATIONS = ('post', 'schedule', 'delete', 'delete_scheduled', 'fetch_profile')
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _timed(results, name, func, *args):
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    results[name].append((time.perf_counter() - started, bool(result.get('success')), result))
+    if not result.get('success'):
+        print(f"  {name} failed: {result.get('error')}")
+    return result
+
+
+def _run(bot, ops):
+    results = {name: [] for name in OPERATIONS}
+    stamp = datetime.now().strftime('%H%M%S')
+    when = (datetime.now() + timedelta(days=2)).replace(second=0, microsecond=0)
+
+    # Start the browser and log in outside the measurements
+    warm_up = bot.test_connection()
+    if not warm_up.get('success'):
+        raise SystemExit(f"Warm-up failed, not measuring: {warm_up.get('error')}")
+
+    urls = []
+    for i in range(ops):
+        result = _timed(results, 'post', bot.post_to_x, f"Bench post {stamp}-{i} " + "lorem ipsum " * 10)
+        if result.get('tweet_url'):
+            urls.append(result['tweet_url'])
+    texts = []
+    for i in range(ops):
+        text = f"Bench scheduled {stamp}-{i} " + "dolor sit amet " * 8
+        if _timed(results, 'schedule', bot.post_to_x, text, '', when.isoformat()).get('success'):
+            texts.append(text)
+    for url in urls:
+        _timed(results, 'delete', bot.delete_tweet, url)
+    for text in texts:
+        _timed(results, 'delete_scheduled', bot.delete_scheduled_tweet, text)
+    for _ in range(ops):
+        _timed(results, 'fetch_profile', bot.fetch_profile)
+    return results
+
+
+def _summary(results):
+    """Per operation: runs, successes, and latency/throughput of the
+    successful runs only (None when there are none)."""
+    summary = {}
+    for name, runs in results.items():
+        if not runs:
+            continue
+        seconds = [s for s, ok, _ in runs if ok]
+        summary[name] = {
+            'ops': len(runs),
+            'ok': len(seconds),
+            'p50': round(_percentile(seconds, 0.5), 3) if seconds else None,
+            'p95': round(_percentile(seconds, 0.95), 3) if seconds else None,
+            'max': round(max(seconds), 3) if seconds else None,
+            'ops_per_min': round(len(seconds) / sum(seconds) * 60, 2) if seconds else None,
+        }
+    return summary
+
+
+def _cell(value, unit='s', width=8):
+    if value is None:
+        return f"{'-':>{width}}"
+    return f"{value:>{width - len(unit)}.{1 if unit == '' else 2}f}{unit}"
+
+
+def _report(summary, baseline=None):
+    print(f"{'operation':<18} {'ok':>7} {'p50':>8} {'p95':>8} {'max':>8} {'ops/min':>9}")
+    for name, row in summary.items():
+        line = (f"{name:<18} {row['ok']:>3}/{row['ops']:<3} {_cell(row['p50'])} {_cell(row['p95'])} "
+                f"{_cell(row['max'])} {_cell(row['ops_per_min'], '', 9)}")
+        before = (baseline or {}).get(name)
+        if before and before.get('p50') and row['p50'] is not None:
+            line += f"   p50 {(row['p50'] - before['p50']) / before['p50'] * 100:+.0f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=5, help='runs of each operation')
+    parser.add_argument('--latency', type=float, default=80, help='ms added to every response')
+    parser.add_argument('--jitter', type=float, default=40)
+    parser.add_argument('--render-ms', type=float, default=300, help='ms before a page renders its content')
+    parser.add_argument('--engine', choices=('sync', 'async'), default='sync', help='BOT_ENGINE')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with results saved by --save')
+    args = parser.parse_args()
+
+    server, fake, base_url = fake_x.start(0, args.latency, args.jitter, args.render_ms)
+    fake_x.configure_bot(base_url, args.engine)
+    import bot
+
+    print(f"Fake X at {base_url} (latency {args.latency:.0f}ms +{args.jitter:.0f}, render {args.render_ms:.0f}ms), "
+          f"engine {args.engine}, {args.ops} run(s) per operation")
+    try:
+        results = _run(bot, args.ops)
+    finally:
+        bot.close()
+        server.shutdown()
+
+    summary = _summary(results)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['operations']
+    _report(summary, baseline)
+    print(f"Left on fake X: {fake.counts()}")
+    failed = sum(row['ops'] - row['ok'] for row in summary.values())
+    if failed:
+        # A run with failures is not a baseline worth comparing against
+        raise SystemExit(f"{failed} operation(s) failed" + (", results not saved" if args.save else ''))
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'engine': args.engine, 'latency_ms': args.latency, 'render_ms': args.render_ms,
+                       'operations': summary}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""Local stand-in for x.com, for benchmarking the browser flows offline.
+
+Serves synthetic pages with the markup the bot looks for (the first
+selector of each chain in ``bot._SELECTORS``) and keeps posted and
+scheduled tweets in memory:
+
+    /home                            logged-in home (sets the auth_token cookie)
+    /compose/tweet                   compose dialog, media input, schedule dialog
+    /compose/tweet/unsent/scheduled  Drafts modal with its Scheduled tab
+    /<user>/status/<id>              a posted tweet with its More > Delete menu
+    /<user>                          profile header (name, bio, counts, avatar)
+
+Every response is delayed by ``--latency`` ms (plus up to ``--jitter`` ms)
+and pages render their content ``--render-ms`` after load, like X's
+client-side rendering. Point the bot at it with ``X_BASE_URL``.
+
+Usage:
+    python benchmarks/fake_x.py [--port 8765] [--latency 80] [--jitter 40] [--render-ms 300]
+    X_BASE_URL=http://127.0.0.1:8765 python server/app.py
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from random import uniform
+from urllib.parse import urlsplit
+
+USERNAME = 'bench'
+
+_SHELL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>X (local)</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0 }}
+  nav, main {{ padding: 8px }}
+  [data-testid="toast"] {{ position: fixed; bottom: 16px; left: 16px; background: #1d9bf0; color: #fff; padding: 8px }}
+  [contenteditable] {{ min-height: 80px; border: 1px solid #ccc; padding: 4px }}
+</style></head>
+<body>
+<nav><a href="/home" data-testid="AppTabBar_Home_Link">Home</a></nav>
+<main id="app"></main>
+<template id="view">{content}</template>
+<script>
+const USERNAME = {username};
+function toast(html) {{
+  const t = document.createElement('div');
+  t.setAttribute('data-testid', 'toast');
+  t.innerHTML = html;
+  document.body.appendChild(t);
+}}
+function render() {{
+  const app = document.getElementById('app');
+  app.innerHTML = '';
+  app.appendChild(document.getElementById('view').content.cloneNode(true));
+  if (window.onRendered) onRendered();
+}}
+{script}
+setTimeout(render, {render_ms});
+</script>
+</body></html>"""
+
+_HOME = """<h1>Home</h1><p>Local stand-in for x.com</p>"""
+
+_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+           'August', 'September', 'October', 'November', 'December']
+
+
+def _select(values):
+    return '<select>' + ''.join(f'<option value="{v}">{v}</option>' for v in values) + '</select>'
+
+
+_COMPOSE = """
+<div role="dialog">
+  <div data-testid="tweetTextarea_0" contenteditable="true" role="textbox"></div>
+  <div id="attachments"></div>
+  <input type="file" data-testid="fileInput" onchange="attach(this)">
+  <button data-testid="scheduleOption" aria-label="Schedule post" onclick="openSchedule()">Schedule</button>
+  <button data-testid="tweetButton" aria-disabled="false" onclick="send(this)">Post</button>
+</div>
+<div id="schedule-dialog" role="dialog" hidden>
+  %s %s %s %s %s %s
+  <button data-testid="scheduledConfirmationPrimaryAction" onclick="confirmSchedule()">Confirm</button>
+</div>
+""" % (
+    _select(_MONTHS),
+    _select(range(1, 32)),
+    _select(range(2024, 2031)),
+    _select(range(1, 13)),
+    _select(f'{m:02d}' for m in range(60)),
+    _select(['AM', 'PM']),
+)
+
+_COMPOSE_JS = """
+let scheduledAt = null;
+function attach(input) {
+  const box = document.getElementById('attachments');
+  box.innerHTML = '';
+  const el = document.createElement('div');
+  el.setAttribute('data-testid', 'attachments');
+  el.textContent = input.files.length + ' file(s)';
+  box.appendChild(el);
+}
+function openSchedule() {
+  document.getElementById('schedule-dialog').hidden = false;
+}
+function confirmSchedule() {
+  const [month, day, year, hour, minute, ampm] =
+    Array.from(document.querySelectorAll('#schedule-dialog select')).map(s => s.value);
+  scheduledAt = `${month} ${day}, ${year} at ${hour}:${minute} ${ampm}`;
+  document.getElementById('schedule-dialog').hidden = true;
+  document.querySelector('[data-testid="tweetButton"]').textContent = 'Schedule';
+}
+async function send(button) {
+  const box = document.querySelector('[data-testid="tweetTextarea_0"]');
+  const response = await fetch('/_fake/tweets', {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({text: box.innerText.trim(), scheduled_at: scheduledAt}),
+  });
+  const post = await response.json();
+  box.innerText = '';
+  button.textContent = 'Post';
+  if (scheduledAt) {
+    toast(`Your post will be sent on ${scheduledAt}`);
+  } else {
+    toast(`Your post was sent. <a href="/${USERNAME}/status/${post.id}">View</a>`);
+  }
+  scheduledAt = null;
+}
+"""
+
+_STATUS = """
+<article data-testid="tweet">
+  <div><span>{text}</span></div>
+  <button data-testid="caret" aria-label="More" onclick="openMenu()">...</button>
+</article>
+<div data-testid="Dropdown" hidden>
+  <div role="menuitem" onclick="askDelete()">Delete</div>
+</div>
+<div data-testid="confirmationSheetDialog" hidden>
+  <button data-testid="confirmationSheetConfirm" onclick="confirmDelete()">Delete</button>
+</div>
+"""
+
+_STATUS_JS = """
+function openMenu() { document.querySelector('[data-testid="Dropdown"]').hidden = false; }
+function askDelete() {
+  document.querySelector('[data-testid="Dropdown"]').hidden = true;
+  document.querySelector('[data-testid="confirmationSheetDialog"]').hidden = false;
+}
+async function confirmDelete() {
+  await fetch('/_fake/tweets/' + TWEET_ID, {method: 'DELETE'});
+  document.getElementById('app').innerHTML = '';
+  toast('Your post was deleted');
+}
+"""
+
+_DELETED = """<div><span>This post was deleted</span></div>"""
+
+# The Drafts modal is redrawn from script on every visit (tab click,
+# history back) so the bot can walk it like X's single-page app
+_DRAFTS = """<div role="dialog" id="drafts"></div>"""
+
+_DRAFTS_JS = """
+function drawTabs() {
+  document.getElementById('drafts').innerHTML =
+    '<div role="tablist"><div role="tab" onclick="showUnsent()">Unsent posts</div>' +
+    '<div role="tab" onclick="showScheduled()">Scheduled</div></div><div id="list"></div>';
+}
+function showUnsent() { document.getElementById('list').innerHTML = '<p>No drafts</p>'; }
+async function showScheduled() {
+  const posts = await (await fetch('/_fake/scheduled')).json();
+  const list = document.getElementById('list');
+  list.innerHTML = '';
+  for (const post of posts) {
+    const entry = document.createElement('div');
+    entry.innerHTML = '<div><span></span></div><div><span></span></div>';
+    const spans = entry.querySelectorAll('span');
+    spans[0].textContent = post.text.length > 120 ? post.text.slice(0, 120) + '…' : post.text;
+    spans[1].textContent = post.scheduled_at;
+    entry.onclick = () => openEntry(post);
+    list.appendChild(entry);
+  }
+}
+function openEntry(post) {
+  history.pushState({id: post.id}, '', '/compose/tweet');
+  const app = document.getElementById('app');
+  app.innerHTML = '<div role="dialog"><div data-testid="tweetTextarea_0" contenteditable="true"></div>' +
+    '<span id="will-send">Will send on ' + post.scheduled_at + '</span></div>';
+  app.querySelector('[contenteditable]').textContent = post.text;
+  app.querySelector('#will-send').onclick = () => openPicker(post);
+}
+function openPicker(post) {
+  const picker = document.createElement('div');
+  picker.setAttribute('role', 'dialog');
+  picker.innerHTML = '<button>Clear</button>';
+  picker.querySelector('button').onclick = () => askClear(post, picker);
+  document.getElementById('app').appendChild(picker);
+}
+function askClear(post, picker) {
+  picker.remove();
+  const sheet = document.createElement('div');
+  sheet.setAttribute('data-testid', 'confirmationSheetDialog');
+  sheet.innerHTML = '<button data-testid="confirmationSheetConfirm">Discard</button>';
+  sheet.querySelector('button').onclick = async () => {
+    await fetch('/_fake/scheduled/' + post.id, {method: 'DELETE'});
+    sheet.remove();
+  };
+  document.getElementById('app').appendChild(sheet);
+}
+window.onRendered = drawTabs;
+window.onpopstate = render;
+"""
+
+_PROFILE = """
+<div data-testid="UserAvatar-Container-{username}"><img src="{base}/media/avatar_normal.jpg" width="48" height="48"></div>
+<div data-testid="UserName"><div><span><span>Bench User</span></span></div><div><span>@{username}</span></div></div>
+<div data-testid="UserDescription">Local stand-in profile for benchmarks</div>
+<span data-testid="UserJoinDate">Joined March 2020</span>
+<a href="/{username}/following"><span>123</span> Following</a>
+<a href="/{username}/verified_followers"><span>4,567</span> Followers</a>
+"""
+
+# Smallest valid JPEG-ish payload; the bot only saves the bytes
+_AVATAR = bytes.fromhex('ffd8ffe000104a46494600010100000100010000ffd9')
+
+
+class FakeX:
+    """In-memory state of the stand-in: posted and scheduled tweets."""
+
+    def __init__(self, latency_ms=80, jitter_ms=40, render_ms=300):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.render_ms = render_ms
+        self.lock = threading.Lock()
+        self.ids = count(1000)
+        self.tweets = {}        # id -> text
+        self.scheduled = {}     # id -> {'id', 'text', 'scheduled_at'}
+        self.requests = 0
+
+    def delay(self):
+        with self.lock:
+            self.requests += 1
+        seconds = (self.latency_ms + uniform(0, self.jitter_ms)) / 1000
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def page(self, content, script=''):
+        return _SHELL.format(content=content, script=script, username=json.dumps(USERNAME),
+                             render_ms=int(self.render_ms))
+
+    def add(self, text, scheduled_at):
+        with self.lock:
+            post_id = next(self.ids)
+            if scheduled_at:
+                self.scheduled[post_id] = {'id': post_id, 'text': text, 'scheduled_at': scheduled_at}
+            else:
+                self.tweets[post_id] = text
+        return post_id
+
+    def counts(self):
+        with self.lock:
+            return {'tweets': len(self.tweets), 'scheduled': len(self.scheduled), 'requests': self.requests}
+
+
+_STATUS_RE = re.compile(r'^/([^/]+)/status/(\d+)$')
+
+
+def _handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, body, content_type='text/html; charset=utf-8', status=200, cookie=False):
+            data = body if isinstance(body, bytes) else body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('Cache-Control', 'no-store')
+            if cookie:
+                self.send_header('Set-Cookie', 'auth_token=local-bench; Path=/; Max-Age=86400')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, data, status=200):
+            self._send(json.dumps(data), 'application/json', status)
+
+        def do_GET(self):
+            fake.delay()
+            path = urlsplit(self.path).path.rstrip('/') or '/'
+            if path in ('/', '/home'):
+                return self._send(fake.page(_HOME), cookie=True)
+            if path == '/compose/tweet':
+                return self._send(fake.page(_COMPOSE, _COMPOSE_JS), cookie=True)
+            if path == '/compose/tweet/unsent/scheduled':
+                return self._send(fake.page(_DRAFTS, _DRAFTS_JS), cookie=True)
+            if path == '/_fake/scheduled':
+                with fake.lock:
+                    return self._json(list(fake.scheduled.values()))
+            if path == '/_fake/stats':
+                return self._json(fake.counts())
+            if path.startswith('/media/avatar'):
+                return self._send(_AVATAR, 'image/jpeg')
+            match = _STATUS_RE.match(path)
+            if match:
+                tweet_id = int(match.group(2))
+                with fake.lock:
+                    text = fake.tweets.get(tweet_id)
+                if text is None:
+                    return self._send(fake.page(_DELETED))
+                return self._send(fake.page(_STATUS.format(text=html.escape(text)),
+                                            f'const TWEET_ID = {tweet_id};' + _STATUS_JS))
+            if path.count('/') == 1 and path[1:] and not path.startswith('/_') and '.' not in path:
+                username = html.escape(path[1:])
+                base = f'http://{self.headers.get("Host")}'
+                return self._send(fake.page(_PROFILE.format(username=username, base=base)))
+            self._send('Not found', 'text/plain', 404)
+
+        def do_POST(self):
+            fake.delay()
+            if urlsplit(self.path).path != '/_fake/tweets':
+                return self._send('Not found', 'text/plain', 404)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            post_id = fake.add(body.get('text', ''), body.get('scheduled_at'))
+            self._json({'id': post_id})
+
+        def do_DELETE(self):
+            fake.delay()
+            parts = urlsplit(self.path).path.strip('/').split('/')
+            if len(parts) != 3 or parts[0] != '_fake' or not parts[2].isdigit():
+                return self._send('Not found', 'text/plain', 404)
+            store = {'tweets': fake.tweets, 'scheduled': fake.scheduled}.get(parts[1])
+            if store is None:
+                return self._send('Not found', 'text/plain', 404)
+            with fake.lock:
+                found = store.pop(int(parts[2]), None) is not None
+            self._json({'deleted': found}, 200 if found else 404)
+
+    return Handler
+
+
+def start(port=0, latency_ms=80, jitter_ms=40, render_ms=300):
+    """Serve the stand-in on a background thread. Returns (server, fake, base_url)."""
+    fake = FakeX(latency_ms, jitter_ms, render_ms)
+    server = ThreadingHTTPServer(('127.0.0.1', port), _handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='fake-x').start()
+    return server, fake, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def configure_bot(base_url, engine='sync'):
+    """Point the bot at ``base_url`` with the fake account, a scratch Chrome
+    profile and a scratch data directory, so the installed app's session,
+    cookies and selector stats are left alone. Call it before importing
+    bot (server/ must be on sys.path). Returns the scratch directory."""
+    scratch = tempfile.mkdtemp(prefix='xpm-bench-')
+    os.environ.update({
+        'X_BASE_URL': base_url,
+        'X_USERNAME': USERNAME,
+        'X_PASSWORD': 'bench',
+        'HEADLESS': 'true',
+        'CHROME_PROFILE_DIR': os.path.join(scratch, 'chrome_profile'),
+        'BOT_ENGINE': engine,
+    })
+    import paths
+    paths.DATA_DIR = scratch
+    return scratch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=80, help='ms added to every response')
+    parser.add_argument('--jitter', type=float, default=40, help='up to this many ms more, at random')
+    parser.add_argument('--render-ms', type=float, default=300, help='ms before a page renders its content')
+    args = parser.parse_args()
+
+    server, _, base_url = start(args.port, args.latency, args.jitter, args.render_ms)
+    print(f"Fake X listening on {base_url} (set X_BASE_URL={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
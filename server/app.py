@@ -4,12 +4,13 @@ import platform
 import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
+from time import sleep, monotonic
 import threading
 
 import json
 import shutil
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from dotenv import load_dotenv
 from werkzeug.utils import secure_filename
 
@@ -17,6 +18,11 @@ import paths
 import database
 import bot
 import scheduler
+import jobs
+import events
+import logtail
+import logbuffer
+import metrics
 
 load_dotenv(os.path.join(paths.BASE_DIR, '.env'))
 
@@ -28,6 +34,7 @@ def add_headers(response):
     response.headers['Access-Control-Allow-Origin'] = '*'
     response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
+    response.headers['Access-Control-Expose-Headers'] = 'X-Total-Count, X-Next-Cursor'
     # Prevent browser from caching HTML pages so new builds are always loaded
     if response.content_type and 'text/html' in response.content_type:
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -45,6 +52,7 @@ DATA_DIR = paths.DATA_DIR
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 MAX_IMAGE_SIZE = 5 * 1024 * 1024   # 5 MB
+MAX_PAGE_SIZE = 500
 
 
 # --- Logging setup ---
@@ -62,6 +70,13 @@ def setup_logging():
     stream_handler.setFormatter(formatter)
     root_logger.addHandler(stream_handler)
 
+    # Recent records as structured data for GET /api/logs/records
+    logbuffer.install(
+        capacity=int(os.getenv('LOG_BUFFER_SIZE', '5000') or 5000),
+        spill_dir=os.path.join(LOG_DIR, 'records'),
+        max_segments=int(os.getenv('LOG_SPILL_SEGMENTS', '20') or 20),
+    )
+
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -140,17 +155,76 @@ def api_create_post():
         status=status
     )
     logger.info(f"Post #{post_id} created (status={status})")
+    if status == 'scheduled':
+        scheduler.notify()
     return jsonify({'id': post_id, 'status': status}), 201
 
 
 @app.route('/api/posts', methods=['GET'])
 def api_list_posts():
-    status = request.args.get('status')
-    if status:
-        posts = database.get_posts_by_status(status)
-    else:
-        posts = database.get_all_posts()
-    return jsonify(posts)
+    """List posts newest first.
+
+    Optional query parameters:
+      status  - comma-separated statuses to include
+      from/to - date range (from inclusive, to exclusive) on each post's own
+                date: created_at for drafts, posted_at for published posts,
+                scheduled_at otherwise
+      limit   - page size (max MAX_PAGE_SIZE); without it every post is returned
+      after   - cursor from the previous page's X-Next-Cursor header
+      fields  - comma-separated columns to return (id and created_at are always included)
+    The total number of matching posts is returned in the X-Total-Count header.
+    """
+    statuses = [s.strip() for s in request.args.get('status', '').split(',') if s.strip()] or None
+    if statuses:
+        unknown = [s for s in statuses if s not in database.STATUSES]
+        if unknown:
+            return jsonify({'error': f"Unknown status: {', '.join(unknown)}"}), 400
+
+    date_from = request.args.get('from') or None
+    date_to = request.args.get('to') or None
+    for value in (date_from, date_to):
+        if value:
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                return jsonify({'error': f'Invalid date: {value}'}), 400
+
+    # Parsed by hand: type=int would turn limit=abc into None, i.e. every post
+    limit = None
+    raw_limit = request.args.get('limit', '')
+    if raw_limit:
+        if not raw_limit.isdigit() or not 1 <= int(raw_limit) <= MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be an integer between 1 and {MAX_PAGE_SIZE}'}), 400
+        limit = int(raw_limit)
+
+    after = None
+    cursor = request.args.get('after', '')
+    if cursor:
+        created_at, _, last_id = cursor.rpartition('|')
+        if not created_at or not last_id.isdigit():
+            return jsonify({'error': 'Invalid cursor'}), 400
+        after = (created_at, int(last_id))
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+        unknown = [f for f in fields if f not in database.POST_COLUMNS]
+        if unknown:
+            return jsonify({'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    # Fetch one extra row to know whether another page follows
+    filters = {'statuses': statuses, 'date_from': date_from, 'date_to': date_to}
+    posts = database.list_posts(**filters, limit=limit + 1 if limit else None, after=after, fields=fields)
+    next_cursor = None
+    if limit and len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = f"{posts[-1]['created_at']}|{posts[-1]['id']}"
+
+    response = jsonify(posts)
+    response.headers['X-Total-Count'] = str(database.count_posts(**filters))
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
 
 
 @app.route('/api/posts/<int:post_id>', methods=['GET'])
@@ -172,7 +246,12 @@ def api_update_post(post_id):
     scheduled_at = data.get('scheduled_at', post['scheduled_at'])
     status = data.get('status', post['status'])
 
-    database.update_post(post_id, text=text, scheduled_at=scheduled_at, status=status)
+    if status == 'scheduled':
+        # An edited post is retried right away rather than after its backoff
+        database.update_post(post_id, text=text, scheduled_at=scheduled_at, status=status, next_attempt_at=None)
+        scheduler.notify()
+    else:
+        database.update_post(post_id, text=text, scheduled_at=scheduled_at, status=status)
     logger.info(f"Post #{post_id} updated")
     return jsonify({'id': post_id, 'updated': True})
 
@@ -197,74 +276,117 @@ def api_delete_post(post_id):
     return jsonify({'deleted': True})
 
 
-@app.route('/api/posts/<int:post_id>/post-now', methods=['POST'])
-def api_post_now(post_id):
-    post = database.get_post(post_id)
-    if not post:
-        return jsonify({'error': 'Post not found'}), 404
+def _claim_or_error(post_id, status, **kwargs):
+    """Claim a post for an action on X, or build the 404/409 response explaining why not."""
+    post = database.claim_post(post_id, status, **kwargs)
+    if post:
+        return post, None
+    if not database.get_post(post_id):
+        return None, (jsonify({'error': 'Post not found'}), 404)
+    return None, (jsonify({'error': 'Post is already being sent to or deleted from X'}), 409)
+
+
+def _job_accepted(job_id):
+    """202 response for an action that now runs as a background job."""
+    return jsonify({'job_id': job_id, 'status': 'queued'}), 202
+
 
-    database.update_post_status(post_id, 'posting')
+def _publish_claimed(post, label):
+    """Job body: publish a post claimed as 'posting' and release it."""
+    post_id = post['id']
     result = bot.post_to_x(text=post.get('text', ''), image_path=post.get('image_path', ''))
 
     if result.get('success'):
         tweet_url = result.get('tweet_url', '')
-        database.update_post(post_id, status='posted', posted_at=datetime.now().isoformat(), tweet_url=tweet_url)
-        logger.info(f"Post #{post_id} published immediately (tweet_url={tweet_url})")
-        return jsonify({'success': True, 'tweet_url': tweet_url})
-    else:
-        error = result.get('error', 'Unknown error')
-        database.update_post_status(post_id, 'error', error_message=error)
-        logger.error(f"Post #{post_id} failed: {error}")
-        return jsonify({'success': False, 'error': error}), 500
+        database.release_post(post_id, post['lease_owner'], status='posted', posted_at=datetime.now().isoformat(),
+                              tweet_url=tweet_url)
+        logger.info(f"Post #{post_id} {label} (tweet_url={tweet_url})")
+        return {'success': True, 'tweet_url': tweet_url}
+    error = result.get('error', 'Unknown error')
+    database.release_post(post_id, post['lease_owner'], status='error', error_message=error)
+    logger.error(f"Post #{post_id} failed: {error}")
+    return {'success': False, 'error': error}
 
 
-@app.route('/api/posts/<int:post_id>/schedule-now', methods=['POST'])
-def api_schedule_now(post_id):
-    post = database.get_post(post_id)
-    if not post:
-        return jsonify({'error': 'Post not found'}), 404
+@app.route('/api/posts/<int:post_id>/post-now', methods=['POST'])
+def api_post_now(post_id):
+    post, error_response = _claim_or_error(post_id, 'posting')
+    if error_response:
+        return error_response
 
-    scheduled_at = post.get('scheduled_at')
-    if not scheduled_at:
-        return jsonify({'error': 'Post has no scheduled date'}), 400
+    return _job_accepted(jobs.submit('post_now', _publish_claimed, post, 'published immediately', post_id=post_id))
 
-    database.update_post_status(post_id, 'scheduling')
+
+def _schedule_claimed(post):
+    """Job body: schedule a post claimed as 'scheduling' on X and release it."""
+    post_id = post['id']
     result = bot.post_to_x(
         text=post.get('text', ''),
         image_path=post.get('image_path', ''),
-        scheduled_at=scheduled_at,
+        scheduled_at=post.get('scheduled_at'),
     )
 
     if result.get('success'):
-        database.update_post_status(post_id, 'scheduled_on_x')
-        logger.info(f"Post #{post_id} scheduled on X for {scheduled_at}")
-        return jsonify({'success': True})
-    else:
-        error = result.get('error', 'Unknown error')
-        database.update_post_status(post_id, 'error', error_message=error)
-        logger.error(f"Post #{post_id} scheduling failed: {error}")
-        return jsonify({'success': False, 'error': error}), 500
+        database.release_post(post_id, post['lease_owner'], status='scheduled_on_x')
+        logger.info(f"Post #{post_id} scheduled on X for {post.get('scheduled_at')}")
+        return {'success': True}
+    error = result.get('error', 'Unknown error')
+    database.release_post(post_id, post['lease_owner'], status='error', error_message=error)
+    logger.error(f"Post #{post_id} scheduling failed: {error}")
+    return {'success': False, 'error': error}
 
 
-@app.route('/api/posts/<int:post_id>/retry', methods=['POST'])
-def api_retry_post(post_id):
+@app.route('/api/posts/<int:post_id>/schedule-now', methods=['POST'])
+def api_schedule_now(post_id):
     post = database.get_post(post_id)
     if not post:
         return jsonify({'error': 'Post not found'}), 404
 
-    database.update_post(post_id, status='posting', error_message='', retries_count=0)
-    result = bot.post_to_x(text=post.get('text', ''), image_path=post.get('image_path', ''))
+    if not post.get('scheduled_at'):
+        return jsonify({'error': 'Post has no scheduled date'}), 400
+
+    post, error_response = _claim_or_error(post_id, 'scheduling')
+    if error_response:
+        return error_response
+
+    return _job_accepted(jobs.submit('schedule_now', _schedule_claimed, post, post_id=post_id))
+
+
+@app.route('/api/posts/<int:post_id>/retry', methods=['POST'])
+def api_retry_post(post_id):
+    post, error_response = _claim_or_error(post_id, 'posting', error_message='', retries_count=0)
+    if error_response:
+        return error_response
+
+    return _job_accepted(jobs.submit('retry', _publish_claimed, post, 'retry successful', post_id=post_id))
+
+
+def _delete_post_and_media(post):
+    """Remove a post deleted from X from disk and database."""
+    image_path = post.get('image_path', '')
+    if image_path and os.path.isfile(image_path):
+        try:
+            os.remove(image_path)
+            logger.info(f"Media file deleted: {image_path}")
+        except OSError as e:
+            logger.warning(f"Could not delete media file: {e}")
+    database.delete_post(post['id'])
+
+
+def _delete_from_x(post):
+    """Job body: delete a published tweet, then the post (claimed, status unchanged)."""
+    post_id = post['id']
+    tweet_url = post.get('tweet_url', '')
+    result = bot.delete_tweet(tweet_url)
 
     if result.get('success'):
-        tweet_url = result.get('tweet_url', '')
-        database.update_post(post_id, status='posted', posted_at=datetime.now().isoformat(), tweet_url=tweet_url)
-        logger.info(f"Post #{post_id} retry successful (tweet_url={tweet_url})")
-        return jsonify({'success': True, 'tweet_url': tweet_url})
-    else:
-        error = result.get('error', 'Unknown error')
-        database.update_post_status(post_id, 'error', error_message=error)
-        logger.error(f"Post #{post_id} retry failed: {error}")
-        return jsonify({'success': False, 'error': error}), 500
+        _delete_post_and_media(post)
+        logger.info(f"Post #{post_id} deleted from X and database (was {tweet_url})")
+        return {'success': True, 'already_deleted': result.get('already_deleted', False)}
+    error = result.get('error', 'Unknown error')
+    database.release_post(post_id, post['lease_owner'])
+    logger.error(f"Post #{post_id} delete from X failed: {error}")
+    return {'success': False, 'error': error}
 
 
 @app.route('/api/posts/<int:post_id>/delete-from-x', methods=['POST'])
@@ -273,30 +395,30 @@ def api_delete_from_x(post_id):
     if not post:
         return jsonify({'error': 'Post not found'}), 404
 
-    tweet_url = post.get('tweet_url', '')
-    if not tweet_url:
+    if not post.get('tweet_url', ''):
         return jsonify({'error': 'No tweet URL stored for this post'}), 400
 
-    result = bot.delete_tweet(tweet_url)
+    # A double click or a second tab must not queue a second delete
+    post, error_response = _claim_or_error(post_id, post['status'], from_statuses=[post['status']])
+    if error_response:
+        return error_response
 
-    if result.get('success'):
-        # Delete uploaded media file from disk
-        image_path = post.get('image_path', '')
-        if image_path and os.path.isfile(image_path):
-            try:
-                os.remove(image_path)
-                logger.info(f"Media file deleted: {image_path}")
-            except OSError as e:
-                logger.warning(f"Could not delete media file: {e}")
+    return _job_accepted(jobs.submit('delete_from_x', _delete_from_x, post, post_id=post_id))
 
-        # Delete the post from database
-        database.delete_post(post_id)
-        logger.info(f"Post #{post_id} deleted from X and database (was {tweet_url})")
-        return jsonify({'success': True, 'already_deleted': result.get('already_deleted', False)})
-    else:
-        error = result.get('error', 'Unknown error')
-        logger.error(f"Post #{post_id} delete from X failed: {error}")
-        return jsonify({'success': False, 'error': error}), 500
+
+def _delete_scheduled_from_x(post):
+    """Job body: delete a tweet scheduled on X, then the post (claimed, status unchanged)."""
+    post_id = post['id']
+    result = bot.delete_scheduled_tweet(post.get('text', ''))
+
+    if result.get('success'):
+        _delete_post_and_media(post)
+        logger.info(f"Post #{post_id} scheduled tweet deleted from X and database")
+        return {'success': True}
+    error = result.get('error', 'Unknown error')
+    database.release_post(post_id, post['lease_owner'])
+    logger.error(f"Post #{post_id} delete scheduled from X failed: {error}")
+    return {'success': False, 'error': error}
 
 
 @app.route('/api/posts/<int:post_id>/delete-scheduled-from-x', methods=['POST'])
@@ -312,26 +434,74 @@ def api_delete_scheduled_from_x(post_id):
     if not post_text or not post_text.strip():
         return jsonify({'error': 'Post has no text, cannot match on X'}), 400
 
-    result = bot.delete_scheduled_tweet(post_text)
+    post, error_response = _claim_or_error(post_id, 'scheduled_on_x', from_statuses=['scheduled_on_x'])
+    if error_response:
+        return error_response
 
-    if result.get('success'):
-        # Delete uploaded media file from disk
-        image_path = post.get('image_path', '')
-        if image_path and os.path.isfile(image_path):
-            try:
-                os.remove(image_path)
-                logger.info(f"Media file deleted: {image_path}")
-            except OSError as e:
-                logger.warning(f"Could not delete media file: {e}")
+    return _job_accepted(jobs.submit('delete_scheduled_from_x', _delete_scheduled_from_x, post, post_id=post_id))
+
+
+def _bulk_results(results):
+    return [dict(post_id=post_id, **result) for post_id, result in results.items()]
 
-        # Delete the post from database
-        database.delete_post(post_id)
-        logger.info(f"Post #{post_id} scheduled tweet deleted from X and database")
-        return jsonify({'success': True})
-    else:
-        error = result.get('error', 'Unknown error')
-        logger.error(f"Post #{post_id} delete scheduled from X failed: {error}")
-        return jsonify({'success': False, 'error': error}), 500
+
+def _bulk_delete_scheduled_from_x(posts, results):
+    """Job body: cancel several tweets scheduled on X in one browser pass,
+    then delete the posts that were cancelled and release the others.
+
+    The ``posts`` are claimed (status unchanged).
+
+    ``results`` maps every requested post id, in request order, to its
+    rejection or to None for the ``posts`` sent to X.
+    """
+    results = dict(results)
+    outcomes = bot.delete_scheduled_tweets([post.get('text', '') for post in posts])
+    for post, result in zip(posts, outcomes):
+        post_id = post['id']
+        if result.get('success'):
+            _delete_post_and_media(post)
+            results[post_id] = {'success': True}
+        else:
+            database.release_post(post_id, post['lease_owner'])
+            results[post_id] = {'success': False, 'error': result.get('error', 'Unknown error')}
+            logger.error(f"Post #{post_id} delete scheduled from X failed: {results[post_id]['error']}")
+    deleted = sum(1 for r in results.values() if r['success'])
+    logger.info(f"Bulk delete scheduled: {deleted}/{len(results)} post(s) deleted from X and database")
+    return {
+        'success': deleted == len(results),
+        'deleted': deleted,
+        'results': _bulk_results(results),
+    }
+
+
+@app.route('/api/posts/bulk-delete-scheduled', methods=['POST'])
+def api_bulk_delete_scheduled():
+    data = request.get_json(silent=True) or {}
+    post_ids = data.get('post_ids')
+    # type() rather than isinstance(): true/false would pass as ids 1/0
+    if not isinstance(post_ids, list) or not post_ids or any(type(p) is not int for p in post_ids):
+        return jsonify({'error': 'post_ids must be a non-empty list of post ids'}), 400
+
+    posts, results = [], {}
+    for post_id in dict.fromkeys(post_ids):
+        post = database.get_post(post_id)
+        if not post:
+            results[post_id] = {'success': False, 'error': 'Post not found'}
+        elif post.get('status') != 'scheduled_on_x':
+            results[post_id] = {'success': False, 'error': 'Post is not scheduled on X'}
+        elif not (post.get('text') or '').strip():
+            results[post_id] = {'success': False, 'error': 'Post has no text, cannot match on X'}
+        else:
+            post = database.claim_post(post_id, 'scheduled_on_x', from_statuses=['scheduled_on_x'])
+            if post:
+                posts.append(post)
+                results[post_id] = None
+            else:
+                results[post_id] = {'success': False, 'error': 'Post is already being sent to or deleted from X'}
+    if not posts:
+        return jsonify({'error': 'None of these posts can be deleted from X', 'results': _bulk_results(results)}), 400
+
+    return _job_accepted(jobs.submit('bulk_delete_scheduled', _bulk_delete_scheduled_from_x, posts, results))
 
 
 @app.route('/api/posts/<int:post_id>/remove-media', methods=['POST'])
@@ -386,8 +556,42 @@ ENV_KEYS = [
     'HEADLESS',
     'CHECK_INTERVAL_SECONDS',
     'MAX_RETRIES',
+    'LOGIN_CACHE_TTL_SECONDS',
+    'TEXT_INPUT_MODE',
+    'TYPED_PREFIX_CHARS',
+    'BLOCK_RESOURCES',
+    'BROWSER_POOL_SIZE',
+    'BOT_ENGINE',
+    'BOT_ASYNC_CONCURRENCY',
+    'BROWSER_IDLE_TIMEOUT_SECONDS',
+    'PRELAUNCH_BROWSER',
+    'COMPOSE_PREWARM',
+    'STEP_JITTER_SECONDS',
+    'LOG_BUFFER_SIZE',
+    'LOG_SPILL_SEGMENTS',
+    'X_BASE_URL',
 ]
 
+# Values used when a key is missing or left empty in .env
+ENV_DEFAULTS = {
+    'CHECK_INTERVAL_SECONDS': '15',
+    'MAX_RETRIES': '1',
+    'LOGIN_CACHE_TTL_SECONDS': '600',
+    'TEXT_INPUT_MODE': 'hybrid',
+    'TYPED_PREFIX_CHARS': '20',
+    'BLOCK_RESOURCES': 'true',
+    'BROWSER_POOL_SIZE': '1',
+    'BOT_ENGINE': 'sync',
+    'BOT_ASYNC_CONCURRENCY': '3',
+    'BROWSER_IDLE_TIMEOUT_SECONDS': '300',
+    'PRELAUNCH_BROWSER': 'false',
+    'COMPOSE_PREWARM': 'true',
+    'STEP_JITTER_SECONDS': '0.5',
+    'LOG_BUFFER_SIZE': '5000',
+    'LOG_SPILL_SEGMENTS': '20',
+    'X_BASE_URL': 'https://x.com',
+}
+
 
 @app.route('/api/settings/preferences', methods=['GET'])
 def api_get_preferences():
@@ -441,13 +645,7 @@ def api_get_env():
                             values[key] = val
     for k in ENV_KEYS:
         if k not in values:
-            # Defaults
-            if k == 'CHECK_INTERVAL_SECONDS':
-                values[k] = '15'
-            elif k == 'MAX_RETRIES':
-                values[k] = '1'
-            else:
-                values[k] = ''
+            values[k] = ENV_DEFAULTS.get(k, '')
     return jsonify(values)
 
 
@@ -477,10 +675,7 @@ def api_save_env():
             val = existing.get('X_PASSWORD', '')
         # Apply defaults if empty
         if not val:
-            if key == 'CHECK_INTERVAL_SECONDS':
-                val = '15'
-            elif key == 'MAX_RETRIES':
-                val = '1'
+            val = ENV_DEFAULTS.get(key, '')
         lines.append(f'{key}={val}')
 
     with open(env_path, 'w', encoding='utf-8') as f:
@@ -492,6 +687,7 @@ def api_save_env():
     # Restart browser so it picks up new settings (headless, chrome path, etc.)
     bot.restart_browser()
 
+    events.publish('settings', {'configured': bool(os.getenv('X_USERNAME') and os.getenv('X_PASSWORD'))})
     logger.info("Environment settings updated")
     return jsonify({'success': True})
 
@@ -506,6 +702,8 @@ def api_test_connection():
 def api_connect_google():
     """Open Chrome via Playwright on Google login page for manual authentication."""
     result = bot.open_google_login()
+    if result.get('success'):
+        events.publish('settings', {'google_connected': True})
     return jsonify(result)
 
 
@@ -516,8 +714,8 @@ def api_check_google():
     return jsonify(result)
 
 
-@app.route('/api/profile/fetch', methods=['POST'])
-def api_fetch_profile():
+def _fetch_profile():
+    """Job body: scrape the X profile and store it with a followers snapshot."""
     result = bot.fetch_profile()
     if result.get('success'):
         followers_count = result.get('followers_count', 0)
@@ -538,7 +736,13 @@ def api_fetch_profile():
             json.dump(info, f)
         # Save snapshot to followers history
         database.add_follower_snapshot(followers_count, following_count, username=info.get('username', ''))
-    return jsonify(result)
+        events.publish('profile', {'username': info['username']})
+    return result
+
+
+@app.route('/api/profile/fetch', methods=['POST'])
+def api_fetch_profile():
+    return _job_accepted(jobs.submit('fetch_profile', _fetch_profile))
 
 
 @app.route('/api/profile', methods=['GET'])
@@ -594,20 +798,154 @@ def api_profile_picture():
     return '', 404
 
 
+MAX_LOG_LINES = 2000
+LOG_STREAM_POLL_SECONDS = 0.5
+
+
+def _log_filters():
+    return request.args.get('level') or None, request.args.get('logger') or None
+
+
 @app.route('/api/logs', methods=['GET'])
 def api_get_logs():
+    """Last ``lines`` log lines, or with ``since`` only what was appended
+    after that byte offset. ``level``/``logger`` filter records. The
+    returned ``offset`` is the cursor for the next call."""
+    level, logger_name = _log_filters()
+    lines = min(request.args.get('lines', 200, type=int), MAX_LOG_LINES)
+    since = request.args.get('since', type=int)
     try:
-        if not os.path.isfile(LOG_FILE):
-            return jsonify({'logs': ''})
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        # Return last 200 lines
-        content = ''.join(lines[-200:])
-        return jsonify({'logs': content})
+        if since is not None:
+            text, offset, reset = logtail.read_since(LOG_FILE, since, level, logger_name)
+            if not reset:
+                return jsonify({'logs': text, 'offset': offset, 'reset': False})
+        else:
+            reset = False
+        # First call, or the log was rotated under the client's cursor
+        text, offset = logtail.tail(LOG_FILE, lines, level, logger_name)
+        return jsonify({'logs': text, 'offset': offset, 'reset': reset})
     except Exception as e:
         return jsonify({'logs': f'Error reading logs: {e}'}), 500
 
 
+@app.route('/api/logs/stream', methods=['GET'])
+def api_stream_logs():
+    """Server-Sent Events of new log lines ('log' events with lines and
+    offset). Starts at ``since`` (or Last-Event-ID, or the current end of
+    the log); a 'reset' event carries a fresh tail after a rotation."""
+    level, logger_name = _log_filters()
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+
+    def _stream(offset):
+        if offset is None:
+            offset = logtail.tail(LOG_FILE, 0)[1]
+        keep = logtail.make_filter(level, logger_name)
+        last_sent = monotonic()
+        yield "retry: 3000\n\n"
+        while True:
+            text, offset, reset = logtail.read_since(LOG_FILE, offset, keep=keep)
+            if reset:
+                text, offset = logtail.tail(LOG_FILE, 200, level, logger_name)
+                yield f"id: {offset}\nevent: reset\ndata: {json.dumps({'lines': text, 'offset': offset})}\n\n"
+                last_sent = monotonic()
+            elif text:
+                yield f"id: {offset}\nevent: log\ndata: {json.dumps({'lines': text, 'offset': offset})}\n\n"
+                last_sent = monotonic()
+            elif monotonic() - last_sent > events.KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = monotonic()
+            sleep(LOG_STREAM_POLL_SECONDS)
+
+    return Response(
+        stream_with_context(_stream(since)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+def _time_arg(name):
+    """Query-string time as epoch seconds; accepts a number or an ISO date."""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+@app.route('/api/logs/records', methods=['GET'])
+def api_get_log_records():
+    """Recent log records as structured data, from memory (see logbuffer.py).
+    Filters: ``post_id``, ``job_id``, ``level``, ``logger``, ``since``/``until``
+    (epoch seconds or ISO dates). ``spilled=true`` also searches the records
+    written to disk once the buffer was full."""
+    handler = logbuffer.get_handler()
+    if handler is None:
+        return jsonify({'error': 'Log buffer not installed'}), 503
+    level, logger_name = _log_filters()
+    try:
+        since, until = _time_arg('since'), _time_arg('until')
+    except ValueError:
+        return jsonify({'error': 'since/until must be epoch seconds or ISO dates'}), 400
+    records = handler.query(
+        post_id=request.args.get('post_id', type=int),
+        job_id=request.args.get('job_id', type=int),
+        level=level,
+        logger_name=logger_name,
+        since=since,
+        until=until,
+        limit=max(1, min(request.args.get('limit', 200, type=int), MAX_LOG_LINES)),
+        spilled=request.args.get('spilled', '').lower() in ('1', 'true', 'yes'),
+    )
+    return jsonify({'records': records, 'buffer': handler.stats()})
+
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def api_get_job(job_id):
+    job = database.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    if not database.get_job(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    if not jobs.cancel(job_id):
+        return jsonify({'error': 'Job already finished'}), 409
+    return jsonify({'success': True})
+
+
+@app.route('/api/events', methods=['GET'])
+def api_events():
+    """Server-Sent Events: post changes, job progress, scheduler ticks,
+    settings and profile updates (see events.py)."""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(
+        stream_with_context(events.stream(last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/bot/stats', methods=['GET'])
+def api_bot_stats():
+    """Selector hit/fallback statistics and popup check timings."""
+    return jsonify(bot.get_stats())
+
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Prometheus text: p50/p95/p99 of bot operations and their steps,
+    scheduler passes and SQLite queries, queue depth and worker busy time
+    (see metrics.py)."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 # Global reference to pywebview window (set in __main__)
 _webview_window = None
 
@@ -727,7 +1065,10 @@ if __name__ == '__main__':
     import webbrowser
 
     database.init_db()
+    jobs.start()
     scheduler.start()
+    if os.getenv('PRELAUNCH_BROWSER', 'false').lower() == 'true':
+        bot.prelaunch()
     logger.info("X Post Management starting...")
 
     # Try to use pywebview if available, otherwise fall back to browser
@@ -750,7 +1091,9 @@ if __name__ == '__main__':
         # Cleanup after window close
         logger.info("Window closed, shutting down...")
         scheduler.stop()
+        jobs.stop()
         bot.close()
+        database.close_all()
 
     except Exception as e:
         # Fallback: run Flask directly and open browser
@@ -767,4 +1110,6 @@ if __name__ == '__main__':
             pass
         finally:
             scheduler.stop()
+            jobs.stop()
             bot.close()
+            database.close_all()
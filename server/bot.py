@@ -4,12 +4,17 @@ import json
 import logging
 import threading
 import queue
-from time import sleep
+import itertools
+from contextlib import contextmanager
+from time import sleep, monotonic
 from random import uniform
 from datetime import datetime
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+import metrics
 import paths
+import selector_cache
 
 load_dotenv(os.path.join(paths.BASE_DIR, '.env'))
 
@@ -31,15 +36,79 @@ logger = logging.getLogger(__name__)
 
 # Dedicated thread for all Playwright operations.
 # Playwright sync API uses greenlets and cannot be called across threads.
-_task_queue = queue.Queue()
-_worker_thread = None
-_worker_started = False
+# Tasks are served by priority, then in submission order.
+PRIORITY_INTERACTIVE = 0    # a user is waiting (post now, delete, test connection)
+PRIORITY_SCHEDULED = 1      # scheduled posts the scheduler found due
+PRIORITY_BACKGROUND = 2     # profile fetch, Google login
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: 'interactive', PRIORITY_SCHEDULED: 'scheduled', PRIORITY_BACKGROUND: 'background'}
+
+_task_queue = queue.PriorityQueue()
+_task_seq = itertools.count()
+_worker_threads = []
 _worker_lock = threading.Lock()
 
-# Playwright state (only accessed from _worker_thread)
-_playwright = None
-_context = None
-_page = None
+# Name of the task each worker is running, for get_stats()
+_running = {}
+
+# Bumped by restart_browser() and after a Google login; a worker whose
+# browser was launched under an older generation relaunches it
+_browser_generation = 0
+
+# Session exported by worker 0 (the persistent profile) for the other workers
+POOL_STATE_PATH = os.path.join(paths.DATA_DIR, 'pool_state.json')
+# Set while neither engine has the persistent Chrome profile open: Chrome
+# refuses a second launch on the same user_data_dir
+_profile_free = threading.Event()
+_profile_free.set()
+# How long an engine switch waits for the other engine to let go of the profile
+_PROFILE_HANDOVER_SECONDS = 30
+# Longest a worker with an open browser blocks on the queue before checking
+# whether its browser is stale (settings changed, engine switched)
+_BROWSER_CHECK_SECONDS = 5
+
+# Caller side: cancel event that tasks submitted from this thread inherit
+_caller = threading.local()
+
+# Guards the counters below (_queue_stats, _net_stats, _popup_stats,
+# _compose_stats): every pool worker, CDP callback and the async engine
+# updates them
+_stats_lock = threading.Lock()
+
+# Time spent queued, per priority name: count, total and max seconds
+_queue_stats = {}
+
+
+class _WorkerState(threading.local):
+    """Browser state of one pool worker. Each worker thread sees its own copy."""
+    index = None                # position in the pool; worker 0 owns the persistent profile
+    generation = 0              # _browser_generation this browser was launched under
+    playwright = None
+    browser = None              # set for workers without the persistent profile
+    context = None
+    page = None
+    cdp = None                  # CDP session of page, used for request blocking
+    network_key = None          # stats bucket of the running operation, e.g. 'post:on'
+    # monotonic() time of the last successful login check, None when unknown.
+    # Cleared when the browser closes or a page lands on a login/flow URL.
+    login_verified_at = None
+    # Task being run, checked by _wait()/_human_delay() so a cancelled or
+    # overrunning task stops at its next wait
+    task = None
+    # monotonic() time the last task finished, for the visible-mode idle timeout
+    idle_since = None
+    # monotonic() time the running task started; cleared by the first post
+    # that reports its time to first keystroke
+    task_started_at = None
+    # monotonic() time page was left on a freshly loaded compose dialog,
+    # None once anything else navigates or a post uses it
+    compose_warmed_at = None
+    # monotonic() time before which a failed warm-up is not retried
+    warm_retry_at = None
+    # True while this worker's context is the persistent Chrome profile
+    owns_profile = False
+
+
+_state = _WorkerState()
 
 # Realistic user agent to avoid headless detection
 _USER_AGENT = (
@@ -81,6 +150,16 @@ def _find_chrome():
     return ''
 
 
+def _x_url(path=''):
+    """Absolute URL of ``path`` on X, or on the site X_BASE_URL points to
+    (e.g. the local stand-in of benchmarks/fake_x.py)."""
+    return (os.getenv('X_BASE_URL', '').strip() or 'https://x.com').rstrip('/') + path
+
+
+def _headless():
+    return os.getenv('HEADLESS', 'true').lower() == 'true'
+
+
 def _get_config():
     chrome_path = os.getenv('CHROME_PATH', '')
     if not chrome_path:
@@ -92,42 +171,294 @@ def _get_config():
         'password': os.getenv('X_PASSWORD', ''),
         'profile_path': os.getenv('CHROME_PROFILE_DIR', ''),
         'chrome_path': chrome_path,
-        'headless': os.getenv('HEADLESS', 'true').lower() == 'true',
+        'headless': _headless(),
     }
 
 
+class TaskAborted(Exception):
+    """Raised inside the worker when the running task was cancelled or ran out of time."""
+
+
+def _check_aborted():
+    task = _state.task
+    if task is None:
+        return
+    if task.cancel_event.is_set():
+        task.aborted = True
+        raise TaskAborted('Cancelled')
+    if monotonic() > task.run_deadline:
+        task.aborted = True
+        raise TaskAborted(f'Timed out after {task.timeout}s')
+
+
+def _capped_timeout(timeout_ms):
+    """Shorten a Playwright timeout so it cannot outlast the running task."""
+    task = _state.task
+    if task is None:
+        return timeout_ms
+    return max(1, min(timeout_ms, int((task.run_deadline - monotonic()) * 1000)))
+
+
 def _wait(page, selector, timeout=8000):
     """Wait for a selector and return element, or None on timeout."""
+    _check_aborted()
     try:
-        el = page.wait_for_selector(selector, timeout=timeout)
+        el = page.wait_for_selector(selector, timeout=_capped_timeout(timeout))
         return el
     except Exception:
         return None
 
 
+def _wait_for_js(page, script, arg=None, timeout=8000):
+    """Poll ``script`` in the page until it returns a truthy value and return
+    that value, or None on timeout. Scripts may click what they find, since
+    they stop being polled as soon as they succeed."""
+    _check_aborted()
+    try:
+        handle = page.wait_for_function(script, arg=arg, timeout=_capped_timeout(timeout), polling=100)
+        return handle.json_value()
+    except Exception:
+        return None
+
+
 def _human_delay(low=1.0, high=2.5):
     """Small randomized delay to mimic human behavior."""
-    sleep(uniform(low, high))
+    delay = uniform(low, high)
+    task = _state.task
+    if task is None:
+        sleep(delay)
+        return
+    # Wake up early if the task is cancelled
+    task.cancel_event.wait(delay)
+    _check_aborted()
+
+
+def _step_jitter():
+    """Optional humanizing pause between UI steps (STEP_JITTER_SECONDS, 0 = none)."""
+    high = float(os.getenv('STEP_JITTER_SECONDS', '0.5'))
+    if high > 0:
+        _human_delay(0, high)
+
+
+# URL patterns (Chrome wildcard syntax) dropped by the request blocker
+_BLOCKED_URLS = {
+    'media': ['*video.twimg.com/*', '*.mp4*', '*.m3u8*'],
+    'images': [
+        '*pbs.twimg.com/media/*', '*pbs.twimg.com/profile_banners/*',
+        '*pbs.twimg.com/card_img/*', '*pbs.twimg.com/*video_thumb/*',
+        '*twimg.com/emoji/*',
+    ],
+    'avatars': ['*pbs.twimg.com/profile_images/*'],
+    'fonts': ['*.woff*', '*.ttf*', '*.otf*'],
+    'trackers': [
+        '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+        '*ads-twitter.com/*', '*ads-api.x.com/*', '*/1.1/jot/*', '*/i/jot/*',
+    ],
+}
+
+# What each operation can do without. Documents, XHR, scripts and styles are
+# always allowed. The profile fetch keeps avatars: the <img> must be laid out
+# for the scraper to find its src.
+NETWORK_POLICIES = {
+    'login': ('media', 'images', 'avatars', 'fonts', 'trackers'),
+    'post': ('media', 'images', 'avatars', 'fonts', 'trackers'),
+    'delete': ('media', 'images', 'avatars', 'fonts', 'trackers'),
+    'profile': ('media', 'images', 'fonts', 'trackers'),
+}
+
+# Per operation and blocking state ('post:on', 'post:off'): page loads, time
+# to DOMContentLoaded, requests, blocked requests and bytes received
+_net_stats = {}
+
+
+def _blocking_enabled():
+    return os.getenv('BLOCK_RESOURCES', 'true').lower() == 'true'
+
+
+def _count_network(**amounts):
+    """Add ``amounts`` to the network counters of the current operation."""
+    key = _state.network_key or 'other'
+    with _stats_lock:
+        bucket = _net_stats.setdefault(key, {
+            'pages': 0, 'load_seconds': 0.0, 'requests': 0, 'blocked': 0, 'bytes': 0,
+        })
+        for name, amount in amounts.items():
+            bucket[name] += amount
+
+
+def _on_network_event(kind, event):
+    if kind == 'request':
+        _count_network(requests=1)
+    elif kind == 'finished':
+        _count_network(bytes=int(event.get('encodedDataLength', 0)))
+    elif kind == 'failed' and event.get('blockedReason'):
+        _count_network(blocked=1)
+
+
+def _attach_page(page):
+    """Hook the worker page: login cache invalidation and network accounting."""
+    page.on('framenavigated', _on_frame_navigated)
+    try:
+        _state.cdp = page.context.new_cdp_session(page)
+        _state.cdp.send('Network.enable')
+        _state.cdp.on('Network.requestWillBeSent', lambda e: _on_network_event('request', e))
+        _state.cdp.on('Network.loadingFinished', lambda e: _on_network_event('finished', e))
+        _state.cdp.on('Network.loadingFailed', lambda e: _on_network_event('failed', e))
+    except Exception as e:
+        _state.cdp = None
+        logger.warning(f"Request blocking unavailable: {e}")
+
+
+def _policy_groups(operation):
+    return NETWORK_POLICIES.get(operation, ()) if _blocking_enabled() else ()
+
+
+def _blocked_urls(groups):
+    return [url for group in groups for url in _BLOCKED_URLS[group]]
+
+
+def _apply_network_policy(operation):
+    """Block the resources ``operation`` does not need (see NETWORK_POLICIES).
+
+    Blocking happens inside Chrome (Network.setBlockedURLs), so no request
+    has to round-trip through Python. ``None`` or BLOCK_RESOURCES=false
+    lets everything through.
+    """
+    groups = _policy_groups(operation)
+    _state.network_key = f"{operation or 'other'}:{'on' if groups else 'off'}"
+    if _state.cdp is None:
+        return
+    urls = _blocked_urls(groups)
+    try:
+        _state.cdp.send('Network.setBlockedURLs', {'urls': urls})
+    except Exception as e:
+        logger.warning(f"Could not apply network policy '{operation}': {e}")
+
+
+def _goto(page, url, **kwargs):
+    """page.goto() that records the time to DOMContentLoaded per operation."""
+    _check_aborted()
+    _state.compose_warmed_at = None
+    kwargs.setdefault('wait_until', 'domcontentloaded')
+    started = monotonic()
+    response = page.goto(url, **kwargs)
+    _count_network(pages=1, load_seconds=monotonic() - started)
+    return response
 
 
-def _ensure_browser():
-    global _playwright, _context, _page
-    if _context is not None:
+@metrics.span('browser')
+def _ensure_browser(network_policy=None):
+    """Return the worker page, launching the browser if needed.
+
+    ``network_policy`` names the operation about to run (a key of
+    NETWORK_POLICIES) and selects which resources are blocked.
+    """
+    page = _get_browser_page()
+    _apply_network_policy(network_policy)
+    return page
+
+
+def _page_is_healthy(page):
+    """Cheap liveness probe: the page is open and its renderer answers."""
+    try:
+        return not page.is_closed() and page.evaluate('1') == 1
+    except Exception:
+        return False
+
+
+def _get_browser_page():
+    if _state.context is not None and _state.generation != _browser_generation:
+        logger.info(f"Worker {_state.index or 0}: settings changed, relaunching browser")
+        _close_browser_internal()
+    if _state.context is not None:
         try:
-            if _page and not _page.is_closed():
-                return _page
+            if _state.page and _page_is_healthy(_state.page):
+                return _state.page
+            if _state.page and not _state.page.is_closed():
+                logger.warning(f"Worker {_state.index or 0}: page unresponsive, replacing it")
+                _state.page.close()
             # Page closed but context alive — open a new page
-            if _context.pages:
-                _page = _context.new_page()
-                return _page
+            if _state.context.pages:
+                _state.page = _state.context.new_page()
+                _attach_page(_state.page)
+                return _state.page
         except Exception:
             pass
         _close_browser_internal()
 
     from playwright.sync_api import sync_playwright
     cfg = _get_config()
-    _playwright = sync_playwright().start()
+    _state.playwright = sync_playwright().start()
+    launch_kwargs = _launch_kwargs(cfg)
+
+    _state.generation = _browser_generation
+    try:
+        if _uses_profile():
+            launch_kwargs['user_data_dir'] = _profile_path(cfg)
+            logger.info(f"Launching browser (headless={cfg['headless']}, profile={launch_kwargs['user_data_dir']})")
+            _claim_profile()
+            _state.owns_profile = True
+            _state.context = _state.playwright.chromium.launch_persistent_context(**launch_kwargs)
+        else:
+            # A Chrome profile can only be opened once: other pool workers get a
+            # plain context seeded with the session worker 0 exported
+            context_kwargs = {k: launch_kwargs.pop(k) for k in ('viewport', 'ignore_https_errors', 'user_agent')}
+            if os.path.exists(POOL_STATE_PATH):
+                context_kwargs['storage_state'] = POOL_STATE_PATH
+            logger.info(f"Launching browser for worker {_state.index or 0} (headless={cfg['headless']})")
+            _state.browser = _state.playwright.chromium.launch(**launch_kwargs)
+            _state.context = _state.browser.new_context(**context_kwargs)
+    except Exception:
+        # Stop the Playwright instance too: a started one left on this thread
+        # makes every later sync_playwright().start() fail with "Sync API
+        # inside the asyncio loop" instead of the real launch error
+        _close_browser_internal()
+        raise
+
+    _state.page = _state.context.new_page()
+    _attach_page(_state.page)
+
+    # Close the default blank tab opened by persistent context
+    for p in _state.context.pages:
+        if p != _state.page:
+            try:
+                p.close()
+            except Exception:
+                pass
+
+    # Apply stealth patches to hide automation
+    _stealth().apply_stealth_sync(_state.page)
+    logger.info("Stealth patches applied")
+
+    # Load saved session cookies from state.json if it exists (from Google login)
+    cookies = _saved_cookies()
+    if cookies:
+        _state.context.add_cookies(cookies)
+        logger.info(f"Loaded {len(cookies)} cookies from state.json")
+
+    return _state.page
+
+
+def _engine():
+    """'sync' (worker threads) or 'async' (bot_async handles posts and deletes)."""
+    return os.getenv('BOT_ENGINE', 'sync').strip().lower()
 
+
+def _uses_profile():
+    """Whether this thread's browser opens the persistent Chrome profile.
+
+    Only pool worker 0 does, and only while the sync engine owns the profile
+    (with BOT_ENGINE=async the asyncio engine opens it instead).
+    """
+    return not _state.index and _engine() == 'sync'
+
+
+def _profile_path(cfg):
+    return cfg['profile_path'] or os.path.join(paths.DATA_DIR, 'chrome_profile')
+
+
+def _launch_kwargs(cfg):
+    """Chromium launch options shared by both engines."""
     chrome_path = cfg['chrome_path']
     if chrome_path:
         logger.info(f"Using real Chrome: {chrome_path}")
@@ -157,114 +488,316 @@ def _ensure_browser():
     }
     if chrome_path:
         launch_kwargs['executable_path'] = chrome_path
+    return launch_kwargs
 
-    profile_path = cfg['profile_path']
-    if not profile_path:
-        profile_path = os.path.join(paths.DATA_DIR, 'chrome_profile')
-    launch_kwargs['user_data_dir'] = profile_path
-
-    logger.info(f"Launching browser (headless={cfg['headless']}, profile={profile_path})")
-    _context = _playwright.chromium.launch_persistent_context(**launch_kwargs)
-
-    _page = _context.new_page()
-
-    # Close the default blank tab opened by persistent context
-    for p in _context.pages:
-        if p != _page:
-            try:
-                p.close()
-            except Exception:
-                pass
 
-    # Apply stealth patches to hide automation
+def _stealth():
     from playwright_stealth import Stealth
-    stealth = Stealth(
+    return Stealth(
         navigator_languages_override=('fr-FR', 'fr'),
     )
-    stealth.apply_stealth_sync(_page)
-    logger.info("Stealth patches applied")
 
-    # Load saved session cookies from state.json if it exists (from Google login)
+
+def _saved_cookies():
+    """Session cookies saved by the Google login flow (data/state.json), if any."""
     state_path = os.path.join(paths.DATA_DIR, 'state.json')
-    if os.path.exists(state_path):
-        try:
-            import json
-            with open(state_path, 'r') as f:
-                state_data = json.load(f)
-            cookies = state_data.get('cookies', [])
-            if cookies:
-                _context.add_cookies(cookies)
-                logger.info(f"Loaded {len(cookies)} cookies from state.json")
-        except Exception as e:
-            logger.warning(f"Could not load state.json cookies: {e}")
+    if not os.path.exists(state_path):
+        return []
+    try:
+        with open(state_path, 'r') as f:
+            return json.load(f).get('cookies', [])
+    except Exception as e:
+        logger.warning(f"Could not load state.json cookies: {e}")
+        return []
 
-    return _page
+
+def _claim_profile():
+    """Wait for the persistent profile to be free, then mark it taken."""
+    if not _profile_free.wait(_PROFILE_HANDOVER_SECONDS):
+        raise RuntimeError('Chrome profile still in use by the other bot engine')
+    _profile_free.clear()
 
 
 def _close_browser_internal():
-    global _playwright, _context, _page
+    _state.login_verified_at = None
+    _state.cdp = None
     try:
-        if _context:
-            _context.close()
+        if _state.context:
+            _state.context.close()
     except Exception:
         pass
     try:
-        if _playwright:
-            _playwright.stop()
+        if _state.playwright:
+            _state.playwright.stop()
     except Exception:
         pass
-    _playwright = None
-    _context = None
-    _page = None
+    _state.playwright = None
+    _state.browser = None
+    _state.context = None
+    _state.page = None
+    _state.compose_warmed_at = None
+    _state.warm_retry_at = None
+    if _state.owns_profile:
+        _state.owns_profile = False
+        _profile_free.set()
 
 
-def _close_if_visible():
-    """Close browser after action if running in visible mode."""
-    cfg = _get_config()
-    if not cfg['headless']:
-        logger.info("Closing browser (visible mode)")
+def _idle_timeout():
+    """Seconds a visible-mode browser stays open after its last task (0 = close at once)."""
+    return max(0, int(os.getenv('BROWSER_IDLE_TIMEOUT_SECONDS', '300')))
+
+
+def _idle_remaining():
+    """Seconds before this worker's browser counts as idle, None if it never does.
+
+    Headless browsers stay open; a visible window is closed once it has been
+    unused for BROWSER_IDLE_TIMEOUT_SECONDS.
+    """
+    if _state.context is None or _state.idle_since is None or _headless():
+        return None
+    return max(0, _state.idle_since + _idle_timeout() - monotonic())
+
+
+def _queue_wait():
+    """How long the worker may block on the queue before it has something
+    to check on its browser (idle timeout, warmed compose page going stale).
+    None (block forever) when no browser is open."""
+    if _state.context is None:
+        return None
+    waits = [w for w in (_idle_remaining(), _warm_remaining()) if w is not None]
+    return min(waits + [_BROWSER_CHECK_SECONDS])
+
+
+def _close_if_idle():
+    if _idle_remaining() == 0:
+        logger.info(f"Closing browser (visible mode, idle for {_idle_timeout()}s)")
         _close_browser_internal()
 
 
-def _dismiss_popups(page):
-    """Dismiss cookie banners, notification prompts, etc."""
-    dismiss_selectors = [
-        'div[role="button"]:has-text("Accept all cookies")',
-        'div[role="button"]:has-text("Accepter tous les cookies")',
-        'div[role="button"]:has-text("Refuser les cookies non essentiels")',
-        'div[role="button"]:has-text("Not now")',
-        'div[role="button"]:has-text("Pas maintenant")',
-    ]
-    for sel in dismiss_selectors:
+# Fallback selector chains for elements both engines look up (see selector_cache)
+_SELECTORS = {
+    'login_next_button': [
+        'div[role="button"]:has-text("Next")',
+        'div[role="button"]:has-text("Suivant")',
+    ],
+    'login_checkpoint': [
+        'text="Confirm your identity"',
+        'text="Confirmez votre identite"',
+    ],
+    'login_button': [
+        'div[role="button"]:has-text("Log in")',
+        'div[role="button"]:has-text("Se connecter")',
+    ],
+    'logged_in_marker': [
+        'a[href="/home"]',
+        'div[data-testid="SideNav_AccountSwitcher_Button"]',
+        'a[data-testid="AppTabBar_Home_Link"]',
+    ],
+    'compose_file_input': [
+        'input[data-testid="fileInput"]',
+        'input[type="file"]',
+    ],
+    'post_button': [
+        'button[data-testid="tweetButton"]',
+        'div[data-testid="tweetButton"]',
+    ],
+    'schedule_button': [
+        'button[data-testid="scheduleOption"]',
+        'button[aria-label*="Schedule"]',
+        'button[aria-label*="Planifier"]',
+        'button[aria-label*="chedul"]',
+        'button[aria-label*="lanifi"]',
+    ],
+    'schedule_confirm_button': [
+        'button[data-testid="scheduledConfirmationPrimaryAction"]',
+        'button[data-testid="confirmationSheetConfirm"]',
+        # Fallback: find button by text
+        'button:has-text("Confirm")',
+        'button:has-text("Confirmer")',
+    ],
+    'tweet_deleted_notice': [
+        'text="This post was deleted"',
+        'text="Ce post a été supprimé"',
+    ],
+    'tweet_more_button': [
+        'article[data-testid="tweet"] button[data-testid="caret"]',
+        'article[data-testid="tweet"] div[aria-label*="More"]',
+        'article[data-testid="tweet"] div[aria-label*="Plus"]',
+    ],
+    'tweet_delete_menuitem': [
+        'div[data-testid="Dropdown"] div[role="menuitem"]:has-text("Delete")',
+        'div[data-testid="Dropdown"] div[role="menuitem"]:has-text("Supprimer")',
+        'div[role="menuitem"]:has-text("Delete")',
+        'div[role="menuitem"]:has-text("Supprimer")',
+    ],
+    'tweet_delete_confirm': [
+        'button[data-testid="confirmationSheetConfirm"]',
+        'div[data-testid="confirmationSheetDialog"] button:has-text("Delete")',
+        'div[data-testid="confirmationSheetDialog"] button:has-text("Supprimer")',
+        'button:has-text("Delete")',
+        'button:has-text("Supprimer")',
+    ],
+}
+
+
+# Cookie banners and notification prompts X may show on top of a page
+_POPUP_SELECTOR = ', '.join([
+    'div[role="button"]:has-text("Accept all cookies")',
+    'div[role="button"]:has-text("Accepter tous les cookies")',
+    'div[role="button"]:has-text("Refuser les cookies non essentiels")',
+    'div[role="button"]:has-text("Not now")',
+    'div[role="button"]:has-text("Pas maintenant")',
+])
+
+# Cumulative cost of _dismiss_popups (both engines)
+_popup_stats = {'calls': 0, 'dismissed': 0, 'seconds': 0.0}
+
+
+@metrics.span('popups')
+def _dismiss_popups(page, timeout=1500):
+    """Dismiss cookie banners, notification prompts, etc.
+
+    All known banners are matched by one combined selector, so a page
+    without popups costs a single wait instead of one per selector.
+    """
+    started = monotonic()
+    dismissed = 0
+    wait = timeout
+    # A cookie banner and a "Not now" prompt can be stacked
+    for _ in range(3):
         try:
-            btn = page.wait_for_selector(sel, timeout=1500)
-            if btn:
-                btn.click()
-                _human_delay(0.5, 1)
+            btn = page.wait_for_selector(_POPUP_SELECTOR, timeout=wait)
         except Exception:
-            pass
+            break
+        if not btn:
+            break
+        try:
+            btn.click()
+            dismissed += 1
+            _human_delay(0.5, 1)
+        except TaskAborted:
+            raise
+        except Exception:
+            break
+        wait = 500
+
+    _record_popup_check(dismissed, monotonic() - started)
+    return dismissed
+
+
+def _record_popup_check(dismissed, elapsed):
+    with _stats_lock:
+        _popup_stats['calls'] += 1
+        _popup_stats['dismissed'] += dismissed
+        _popup_stats['seconds'] += elapsed
+    logger.info(f"Popup check took {elapsed:.2f}s ({dismissed} dismissed)")
+
+
+def _login_cache_ttl():
+    return int(os.getenv('LOGIN_CACHE_TTL_SECONDS', '600'))
+
+
+def _is_login_url(url):
+    """Whether ``url`` is one of X's sign-in pages (/login, /i/flow/...).
+
+    Matches the path only, so a handle or tweet that merely contains
+    "login" or "flow" does not count.
+    """
+    path = urlsplit(url or '').path.rstrip('/')
+    return path == '/login' or path.startswith('/i/flow/')
+
+
+def _on_frame_navigated(frame):
+    """Forget the cached login state as soon as X redirects to a login/flow page."""
+    if frame.parent_frame is None and _is_login_url(frame.url):
+        if _state.login_verified_at is not None:
+            logger.info("Redirected to login page, login cache invalidated")
+        _state.login_verified_at = None
+
+
+def _has_auth_cookie():
+    try:
+        return any(c.get('name') == 'auth_token' for c in _state.context.cookies(_x_url()))
+    except Exception:
+        return False
+
+
+def _login_cached(page):
+    """True if login was verified within the TTL and the session still looks valid."""
+    if _state.login_verified_at is None:
+        return False
+    if monotonic() - _state.login_verified_at > _login_cache_ttl():
+        return False
+    return not _is_login_url(page.url) and _has_auth_cookie()
+
+
+def _session_shared():
+    """Whether browsers without the profile may need its session: other
+    pool workers, or the sync workers that still run some tasks while the
+    async engine owns the profile."""
+    return _pool_size() > 1 or _engine() == 'async'
+
+
+def _mark_logged_in():
+    _state.login_verified_at = monotonic()
+    if _uses_profile() and _session_shared():
+        # Share the session with the browsers that do not open the profile
+        try:
+            _state.context.storage_state(path=POOL_STATE_PATH)
+        except Exception as e:
+            logger.warning(f"Could not export session for the browser pool: {e}")
+    return {'success': True}
 
 
-def _login(page):
+# Login flow shared by both engines (bot_async._login follows the same steps)
+_LOGIN_ATTEMPTS = 3
+_LOGIN_USERNAME_INPUT = 'input[name="text"]'
+_LOGIN_EXTRA_INPUT = 'input[data-testid="ocfEnterTextTextInput"]'
+_LOGIN_PASSWORD_INPUT = 'input[type="password"]'
+_LOGIN_IDENTITY_CHECK = 'text="Confirm your identity"'
+_LOGIN_BLOCKED = {
+    'checkpoint': 'X security checkpoint detected. Please login manually.',
+    'verification': 'X requires additional verification (phone/email). Please login manually.',
+    'identity': 'X security checkpoint detected after login.',
+}
+_LOGIN_FAILED = 'Login failed after maximum attempts'
+
+
+def _login_blocked(reason):
+    """Result of a login step only the user can get past (see _LOGIN_BLOCKED)."""
+    return {'success': False, 'needs_manual_intervention': True, 'error': _LOGIN_BLOCKED[reason]}
+
+
+@metrics.span('login')
+def _login(page, force=False):
+    """Make sure the session is logged in to X.
+
+    Skips the /home round trip when login was verified recently (see
+    LOGIN_CACHE_TTL_SECONDS) and the auth cookie is still present, unless
+    ``force`` is set.
+    """
+    if not force and _login_cached(page):
+        logger.info("Login state cached, skipping login check")
+        return {'success': True}
+
     cfg = _get_config()
     logger.info("Navigating to X home to check login state...")
-    page.goto("https://x.com/home", wait_until='domcontentloaded')
+    _goto(page, _x_url("/home"))
     _dismiss_popups(page)
 
     # Already logged in?
-    if 'login' not in page.url and 'flow' not in page.url:
+    if not _is_login_url(page.url):
         logger.info("Already logged in")
-        return {'success': True}
+        return _mark_logged_in()
 
     logger.info("Login required, starting login flow...")
-    max_attempts = 3
-    for attempt in range(max_attempts):
+    for attempt in range(_LOGIN_ATTEMPTS):
         try:
             page.wait_for_load_state('networkidle', timeout=15000)
             _human_delay(1, 2)
 
             # Username step
-            username_input = _wait(page, 'input[name="text"]', timeout=8000)
+            username_input = _wait(page, _LOGIN_USERNAME_INPUT, timeout=8000)
             if username_input:
                 username_input.click()
                 _human_delay(0.3, 0.6)
@@ -272,40 +805,32 @@ def _login(page):
                 page.keyboard.type(cfg['username'], delay=uniform(30, 70))
                 _human_delay(0.5, 1)
 
-                next_btn = _wait(page, 'div[role="button"]:has-text("Next")', timeout=5000)
-                if not next_btn:
-                    next_btn = _wait(page, 'div[role="button"]:has-text("Suivant")', timeout=3000)
+                next_btn = selector_cache.find(page, 'login_next_button', _SELECTORS['login_next_button'], timeout=5000)
                 if next_btn:
                     next_btn.click()
                     _human_delay(0.3, 0.5)
 
             # Check for checkpoint/verification
-            checkpoint = _wait(page, 'text="Confirm your identity"', timeout=2000)
-            if not checkpoint:
-                checkpoint = _wait(page, 'text="Confirmez votre identite"', timeout=1500)
+            checkpoint = selector_cache.find(page, 'login_checkpoint', _SELECTORS['login_checkpoint'], timeout=2000)
             if checkpoint:
                 logger.warning("Checkpoint detected - manual intervention needed")
-                return {'success': False, 'needs_manual_intervention': True,
-                        'error': 'X security checkpoint detected. Please login manually.'}
+                return _login_blocked('checkpoint')
 
             # Extra verification step (phone/email)
-            extra_input = _wait(page, 'input[data-testid="ocfEnterTextTextInput"]', timeout=3000)
+            extra_input = _wait(page, _LOGIN_EXTRA_INPUT, timeout=3000)
             if extra_input:
                 logger.warning("Extra verification step detected (phone/email)")
-                return {'success': False, 'needs_manual_intervention': True,
-                        'error': 'X requires additional verification (phone/email). Please login manually.'}
+                return _login_blocked('verification')
 
             # Password step
-            password_input = _wait(page, 'input[type="password"]', timeout=8000)
+            password_input = _wait(page, _LOGIN_PASSWORD_INPUT, timeout=8000)
             if password_input:
                 password_input.click()
                 _human_delay(0.3, 0.6)
                 page.keyboard.type(cfg['password'], delay=uniform(30, 70))
                 _human_delay(0.5, 1)
 
-                login_btn = _wait(page, 'div[role="button"]:has-text("Log in")', timeout=5000)
-                if not login_btn:
-                    login_btn = _wait(page, 'div[role="button"]:has-text("Se connecter")', timeout=3000)
+                login_btn = selector_cache.find(page, 'login_button', _SELECTORS['login_button'], timeout=5000)
                 if login_btn:
                     login_btn.click()
                     try:
@@ -318,145 +843,331 @@ def _login(page):
             _dismiss_popups(page)
 
             # Verify login
-            for selector in [
-                'a[href="/home"]',
-                'div[data-testid="SideNav_AccountSwitcher_Button"]',
-                'a[data-testid="AppTabBar_Home_Link"]',
-            ]:
-                el = _wait(page, selector, timeout=5000)
-                if el:
-                    logger.info("Login successful")
-                    return {'success': True}
+            el = selector_cache.find(page, 'logged_in_marker', _SELECTORS['logged_in_marker'], timeout=5000)
+            if el:
+                logger.info("Login successful")
+                return _mark_logged_in()
 
             # Check for checkpoint again after login attempt
-            checkpoint = _wait(page, 'text="Confirm your identity"', timeout=2000)
+            checkpoint = _wait(page, _LOGIN_IDENTITY_CHECK, timeout=2000)
             if checkpoint:
-                return {'success': False, 'needs_manual_intervention': True,
-                        'error': 'X security checkpoint detected after login.'}
+                return _login_blocked('identity')
 
+        except TaskAborted:
+            raise
         except Exception as e:
             logger.error(f"Login attempt {attempt + 1} failed: {e}")
-            if attempt < max_attempts - 1:
+            if attempt < _LOGIN_ATTEMPTS - 1:
                 _human_delay(1, 2)
-                page.goto("https://x.com/home", wait_until='domcontentloaded')
+                _goto(page, _x_url("/home"))
                 try:
                     page.wait_for_load_state('networkidle', timeout=10000)
                 except Exception:
                     pass
 
-    return {'success': False, 'error': 'Login failed after maximum attempts'}
+    return {'success': False, 'error': _LOGIN_FAILED}
 
 
-def _do_post(text, image_path, scheduled_at=None):
-    """Actual posting logic - runs in the worker thread."""
-    try:
-        page = _ensure_browser()
+TEXT_INPUT_MODES = ('type', 'insert', 'hybrid')
 
-        # Login if needed
-        login_result = _login(page)
-        if not login_result['success']:
-            _close_if_visible()
-            return login_result
 
-        # Navigate to compose
-        page.goto("https://x.com/compose/tweet", wait_until='domcontentloaded')
+# ===== Pre-warmed compose page =====
 
-        # Type text if provided
-        if text:
-            text_input = _wait(page, 'div[data-testid="tweetTextarea_0"]', timeout=10000)
-            if not text_input:
-                _close_if_visible()
-                return {'success': False, 'error': 'Could not find tweet text area'}
+COMPOSE_PATH = "/compose/tweet"
+_COMPOSE_TEXTAREA = 'div[data-testid="tweetTextarea_0"]'
+_ATTACHMENTS = 'div[data-testid="attachments"]'
+_TOAST = 'div[data-testid="toast"]'
+# A warmed dialog older than this is reloaded rather than trusted
+_COMPOSE_MAX_AGE_SECONDS = 600
 
-            text_input.click()
-            _human_delay(0.3, 0.5)
-            page.keyboard.type(text, delay=uniform(20, 50))
-            _human_delay(0.3, 0.5)
+# Time from the start of a post to its first keystroke, split by whether
+# the compose dialog was already loaded ('warm') or had to be opened ('cold')
+_compose_stats = {}
 
-        # Upload image if provided
-        if image_path and os.path.isfile(image_path):
-            file_input = _wait(page, 'input[data-testid="fileInput"]', timeout=3000)
-            if not file_input:
-                file_input = _wait(page, 'input[type="file"]', timeout=3000)
+
+def _prewarm_enabled():
+    return os.getenv('COMPOSE_PREWARM', 'true').lower() == 'true'
+
+
+def _record_first_keystroke(warm, seconds):
+    with _stats_lock:
+        stats = _compose_stats.setdefault('warm' if warm else 'cold',
+                                          {'posts': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+        stats['posts'] += 1
+        stats['seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+    logger.info(f"First keystroke after {seconds:.2f}s ({'warm' if warm else 'cold'} compose page)")
+
+
+def _warm_remaining():
+    """Seconds before the warmed compose page goes stale, None if there is none."""
+    if _state.compose_warmed_at is None:
+        return None
+    return max(0, _state.compose_warmed_at + _COMPOSE_MAX_AGE_SECONDS - monotonic())
+
+
+def _warm_compose():
+    """Leave this worker's idle page on a loaded compose dialog.
+
+    Runs between tasks and again whenever the warmed page goes stale (the
+    worker wakes up for it, see _queue_wait()), so an idle worker always
+    has a fresh one. Only on a browser that is already open and signed in:
+    it never launches Chrome or starts a login by itself.
+    """
+    if not _prewarm_enabled() or _state.context is None or _state.generation != _browser_generation:
+        return
+    if _state.compose_warmed_at is not None:
+        if _warm_remaining() > 0:
+            return
+        logger.info("Warmed compose page is stale, reloading it")
+        _state.compose_warmed_at = None
+    if _state.warm_retry_at is not None and monotonic() < _state.warm_retry_at:
+        return
+    page = _state.page
+    try:
+        # Signed in during this browser's life, and not sent back to a login
+        # page since (that clears login_verified_at)
+        if (not page or _state.login_verified_at is None or not _page_is_healthy(page)
+                or _is_login_url(page.url) or not _has_auth_cookie()):
+            return
+        started = monotonic()
+        _apply_network_policy('post')
+        page.goto(_x_url(COMPOSE_PATH), wait_until='domcontentloaded')
+        if _wait(page, _COMPOSE_TEXTAREA, timeout=10000) and not _is_login_url(page.url):
+            _state.compose_warmed_at = monotonic()
+            # X only serves the compose dialog to a signed-in session
+            _state.login_verified_at = _state.compose_warmed_at
+            logger.info(f"Compose page warmed in {monotonic() - started:.1f}s")
+            return
+    except Exception as e:
+        logger.warning(f"Could not warm compose page: {e}")
+    # Not before the next task, or a while from now
+    _state.warm_retry_at = monotonic() + _COMPOSE_MAX_AGE_SECONDS
+
+
+def _take_warm_compose(page):
+    """True if ``page`` still shows a fresh warmed compose dialog. Either way
+    the warmed page is used up: the next post gets a fresh one."""
+    warmed_at, _state.compose_warmed_at = _state.compose_warmed_at, None
+    if warmed_at is None or monotonic() - warmed_at > _COMPOSE_MAX_AGE_SECONDS:
+        return False
+    return '/compose/' in page.url and _wait(page, _COMPOSE_TEXTAREA, timeout=1000) is not None
+
+
+def _text_entry_plan(text):
+    """(mode, part to type, part to insert) for ``text`` under TEXT_INPUT_MODE."""
+    mode = os.getenv('TEXT_INPUT_MODE', 'hybrid').strip().lower()
+    if mode not in TEXT_INPUT_MODES:
+        logger.warning(f"Unknown TEXT_INPUT_MODE '{mode}', using hybrid")
+        mode = 'hybrid'
+    if mode == 'type':
+        return mode, text, ''
+    if mode == 'insert':
+        return mode, '', text
+    prefix_len = int(os.getenv('TYPED_PREFIX_CHARS', '20'))
+    return mode, text[:prefix_len], text[prefix_len:]
+
+
+@metrics.span('type')
+def _enter_text(page, text):
+    """Enter the post body in the focused compose box.
+
+    TEXT_INPUT_MODE picks the strategy:
+      - type: key by key like a human (about 35ms per character)
+      - insert: the whole text in one input event, like a paste
+      - hybrid (default): type the first TYPED_PREFIX_CHARS characters,
+        insert the rest, so long posts cost the same as short ones
+    """
+    mode, prefix, rest = _text_entry_plan(text)
+    started = monotonic()
+    if prefix:
+        page.keyboard.type(prefix, delay=uniform(20, 50))
+    if rest:
+        page.keyboard.insert_text(rest)
+    logger.info(f"Entered {len(text)} chars in {monotonic() - started:.1f}s ({mode})")
+
+
+def _compose_post(page, text, image_path, scheduled_at=None):
+    """Fill the compose dialog and post or schedule. Expects a logged-in page."""
+    started, _state.task_started_at = _state.task_started_at or monotonic(), None
+
+    # Navigate to compose, unless the worker left it loaded while idle
+    with metrics.span('open compose'):
+        warm = _take_warm_compose(page)
+        if not warm:
+            _goto(page, _x_url(COMPOSE_PATH))
+        text_input = _wait(page, _COMPOSE_TEXTAREA, timeout=10000) if text else None
+
+    # Type text if provided
+    if text:
+        if not text_input:
+            return {'success': False, 'error': 'Could not find tweet text area'}
+
+        text_input.click()
+        _human_delay(0.3, 0.5)
+        _record_first_keystroke(warm, monotonic() - started)
+        _enter_text(page, text)
+        _human_delay(0.3, 0.5)
+
+    # Upload image if provided
+    if image_path and os.path.isfile(image_path):
+        with metrics.span('upload'):
+            file_input = selector_cache.find(page, 'compose_file_input', _SELECTORS['compose_file_input'], timeout=3000)
             if not file_input:
-                _close_if_visible()
                 return {'success': False, 'error': 'Could not find file input for media upload'}
 
             logger.info(f"Uploading image: {os.path.basename(image_path)}")
             file_input.set_input_files(image_path)
 
-            _wait(page, 'div[data-testid="attachments"]', timeout=15000)
+            _wait(page, _ATTACHMENTS, timeout=15000)
             _human_delay(0.3, 0.5)
 
-        # --- Schedule on X natively, or post immediately ---
-        if scheduled_at:
-            result = _schedule_on_x(page, scheduled_at)
-        else:
-            result = _click_post(page)
+    # --- Schedule on X natively, or post immediately ---
+    if scheduled_at:
+        schedule_result = _schedule_on_x(page, scheduled_at)
+        if not schedule_result['success']:
+            return schedule_result
+    return _click_post(page)
+
 
-        _close_if_visible()
+def _do_post(text, image_path, scheduled_at=None):
+    """Actual posting logic - runs in the worker thread."""
+    try:
+        page = _ensure_browser('post')
+
+        # Login if needed
+        login_result = _login(page)
+        if not login_result['success']:
+            return login_result
+
+        result = _compose_post(page, text, image_path, scheduled_at)
         return result
 
     except Exception as e:
         logger.error(f"post_to_x error: {e}")
-        _close_if_visible()
         return {'success': False, 'error': str(e)}
 
 
+def _do_post_many(items, on_result=None):
+    """Post or schedule several items in one browser session - runs in the worker thread.
+
+    Logs in once and reuses the same page for every item. A failure on one
+    item does not stop the others, but a cancelled or timed-out task does:
+    the remaining items are reported as failed. ``on_result(index, result)``
+    is called as soon as each item finishes.
+    """
+    results = []
+
+    def _record(result):
+        index = len(results)
+        results.append(result)
+        if on_result:
+            try:
+                on_result(index, result)
+            except Exception as e:
+                logger.error(f"post_many result callback failed for item {index}: {e}")
+
+    try:
+        page = _ensure_browser('post')
+        login_result = _login(page)
+    except Exception as e:
+        logger.error(f"post_many error: {e}")
+        login_result = {'success': False, 'error': str(e)}
+
+    if not login_result['success']:
+        for _ in items:
+            _record(login_result)
+        return results
+
+    logger.info(f"Posting {len(items)} item(s) in one browser session")
+    for item in items:
+        try:
+            with metrics.span('item'):
+                result = _compose_post(
+                    page,
+                    item.get('text', ''),
+                    item.get('image_path', ''),
+                    item.get('scheduled_at'),
+                )
+        except TaskAborted as e:
+            # Keep what was already sent to X; the rest is reported as failed
+            logger.warning(f"post_many stopped after {len(results)}/{len(items)} item(s): {e}")
+            for _ in items[len(results):]:
+                _record({'success': False, 'error': str(e)})
+            break
+        except Exception as e:
+            logger.error(f"post_many item error: {e}")
+            result = {'success': False, 'error': str(e)}
+            try:
+                page = _ensure_browser('post')
+            except Exception:
+                pass
+        _record(result)
+
+    return results
+
+
+# A toast with one of these words confirms a post or a schedule
+_POST_TOAST_KEYWORDS = ('sent', 'posted', 'envoy', 'publi', 'schedul', 'program')
+# Checks of the Post button, 0.5s apart, while X enables it (upload, processing...)
+_POST_BUTTON_POLLS = 30
+_POST_BUTTON_DISABLED = 'Post button is disabled - check text/image content'
+
+
+def _post_toast_result(toast_text, href=None):
+    """Result of a post from X's toast and the href of its "View" link."""
+    if not any(kw in toast_text.lower() for kw in _POST_TOAST_KEYWORDS):
+        return {'success': False, 'error': f'X error: {toast_text}'}
+    tweet_url = href
+    if tweet_url and not tweet_url.startswith('http'):
+        tweet_url = _x_url(tweet_url)
+    if tweet_url:
+        logger.info(f"Tweet URL captured: {tweet_url}")
+    logger.info("Post published successfully (confirmed by X toast)")
+    return {'success': True, 'tweet_url': tweet_url}
+
+
+def _post_without_toast(compose_visible):
+    """Result of a post X did not confirm with a toast."""
+    if compose_visible:
+        logger.warning("Post status uncertain - compose area still visible, no toast")
+    else:
+        logger.info("Post published successfully (compose dialog closed)")
+    return {'success': True, 'tweet_url': None}
+
+
+@metrics.span('publish')
 def _click_post(page):
     """Click the Post button and verify success. Returns tweet_url if found."""
-    post_btn = None
-    for selector in [
-        'button[data-testid="tweetButton"]',
-        'div[data-testid="tweetButton"]',
-    ]:
-        post_btn = _wait(page, selector, timeout=5000)
-        if post_btn:
-            break
+    post_btn = selector_cache.find(page, 'post_button', _SELECTORS['post_button'], timeout=5000)
 
     if not post_btn:
         return {'success': False, 'error': 'Could not find Post button'}
 
-    # Wait up to 15s for the button to become enabled (image upload, X processing…)
-    for _ in range(30):
+    for _ in range(_POST_BUTTON_POLLS):
         if post_btn.get_attribute('aria-disabled') != 'true':
             break
-        sleep(0.5)
+        _human_delay(0.5, 0.5)
     else:
-        return {'success': False, 'error': 'Post button is disabled - check text/image content'}
+        return {'success': False, 'error': _POST_BUTTON_DISABLED}
 
     post_btn.scroll_into_view_if_needed()
     _human_delay(0.2, 0.4)
     post_btn.click(timeout=10000)
 
-    tweet_url = None
-    toast_el = _wait(page, 'div[data-testid="toast"]', timeout=10000)
+    toast_el = _wait(page, _TOAST, timeout=10000)
     if toast_el:
-        toast_text = toast_el.inner_text().lower()
-        success_keywords = ['sent', 'posted', 'envoy', 'publi', 'schedul', 'program']
-        if any(kw in toast_text for kw in success_keywords):
-            # Try to get the tweet URL from the "View" link in the toast
-            try:
-                view_link = toast_el.query_selector('a[href*="/status/"]')
-                if view_link:
-                    tweet_url = view_link.get_attribute('href')
-                    if tweet_url and not tweet_url.startswith('http'):
-                        tweet_url = 'https://x.com' + tweet_url
-                    logger.info(f"Tweet URL captured: {tweet_url}")
-            except Exception as e:
-                logger.warning(f"Could not capture tweet URL from toast: {e}")
-            logger.info("Post published successfully (confirmed by X toast)")
-            return {'success': True, 'tweet_url': tweet_url}
-        else:
-            return {'success': False, 'error': f'X error: {toast_el.inner_text()}'}
-
-    compose_still_visible = _wait(page, 'div[data-testid="tweetTextarea_0"]', timeout=2000)
-    if not compose_still_visible:
-        logger.info("Post published successfully (compose dialog closed)")
-        return {'success': True, 'tweet_url': tweet_url}
+        # The "View" link of the toast points to the new tweet
+        href = None
+        try:
+            view_link = toast_el.query_selector('a[href*="/status/"]')
+            if view_link:
+                href = view_link.get_attribute('href')
+        except Exception as e:
+            logger.warning(f"Could not capture tweet URL from toast: {e}")
+        return _post_toast_result(toast_el.inner_text(), href)
 
-    logger.warning("Post status uncertain - compose area still visible, no toast")
-    return {'success': True, 'tweet_url': tweet_url}
+    return _post_without_toast(_wait(page, _COMPOSE_TEXTAREA, timeout=2000) is not None)
 
 
 def _identify_select_role(options):
@@ -513,10 +1224,78 @@ def _identify_select_role(options):
     return 'unknown'
 
 
+# Month name maps (index 0 unused, 1=Jan … 12=Dec)
+_MONTH_NAMES_EN = ['', 'January', 'February', 'March', 'April', 'May', 'June',
+                   'July', 'August', 'September', 'October', 'November', 'December']
+_MONTH_NAMES_FR = ['', 'janvier', 'février', 'mars', 'avril', 'mai', 'juin',
+                   'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre']
+
+
+def _schedule_choices(dt, options):
+    """select_option() arguments to try, in order, for each schedule <select>.
+
+    ``options`` maps each identified role (see _identify_select_role) to its
+    option values. Returns a list of (role, [kwargs, ...]). The hour is 12h
+    when an AM/PM select exists.
+    """
+    use_24h = 'ampm' not in options
+    choices = []
+    if 'month' in options:
+        month_fr = _MONTH_NAMES_FR[dt.month]
+        # English name, French name, capitalized French name, case-insensitive
+        # match against the actual options, then position as a last resort
+        attempts = [{'value': _MONTH_NAMES_EN[dt.month]}, {'value': month_fr}, {'value': month_fr.capitalize()}]
+        attempts += [{'value': v} for v in options['month'] if v.lower().strip() == month_fr]
+        attempts.append({'index': dt.month - 1})
+        choices.append(('month', attempts))
+    if 'day' in options:
+        choices.append(('day', [{'value': str(dt.day)}]))
+    if 'year' in options:
+        choices.append(('year', [{'value': str(dt.year)}]))
+    if 'hour' in options:
+        hour = dt.hour if use_24h else (dt.hour % 12 or 12)
+        choices.append(('hour', [{'value': str(hour)}]))
+    if 'minute' in options:
+        choices.append(('minute', [{'value': str(dt.minute).zfill(2)}, {'value': str(dt.minute)}]))
+    if not use_24h:
+        choices.append(('ampm', [{'value': 'AM' if dt.hour < 12 else 'PM'}]))
+    return choices
+
+
+_SELECT_OPTIONS_JS = '(el) => Array.from(el.options).map(o => o.value)'
+
+
+def _select_roles(options):
+    """{role: index} of the schedule dialog's selects, given each one's option values."""
+    logger.info(f"Found {len(options)} select elements in schedule dialog")
+    roles = {}
+    for i, opts in enumerate(options):
+        role = _identify_select_role(opts)
+        if role != 'unknown' and role not in roles:
+            roles[role] = i
+            logger.info(f"  Select #{i}: {role} (sample: {opts[:3]})")
+        else:
+            logger.info(f"  Select #{i}: {role or 'unknown'} (sample: {(opts or [])[:3]})")
+
+    for role in ('month', 'day', 'year', 'hour', 'minute'):
+        if role not in roles:
+            logger.warning(f"Could not identify {role} select")
+    return roles
+
+
+def _log_schedule_set(dt, roles):
+    use_24h = 'ampm' not in roles
+    fmt_h = dt.hour if use_24h else (dt.hour % 12 or 12)
+    fmt_suffix = '' if use_24h else (' AM' if dt.hour < 12 else ' PM')
+    logger.info(f"Date/time set: {dt.day}/{dt.month}/{dt.year} {fmt_h}:{dt.minute:02d}{fmt_suffix} ({'24h' if use_24h else '12h'} format)")
+
+
+@metrics.span('schedule dialog')
 def _schedule_on_x(page, scheduled_at):
-    """Use X's native scheduling UI to schedule a post.
+    """Use X's native scheduling UI to set the post's date and time.
     Detects UI language (EN/FR/other) by reading select option values,
-    so it works regardless of X interface language.
+    so it works regardless of X interface language. The caller then clicks
+    Schedule (the Post button) with _click_post().
     """
     try:
         dt = datetime.fromisoformat(scheduled_at)
@@ -526,17 +1305,7 @@ def _schedule_on_x(page, scheduled_at):
     logger.info(f"Scheduling post on X for {dt.isoformat()}")
 
     # Click the schedule button (calendar icon) in compose toolbar
-    schedule_btn = None
-    for selector in [
-        'button[data-testid="scheduleOption"]',
-        'button[aria-label*="Schedule"]',
-        'button[aria-label*="Planifier"]',
-        'button[aria-label*="chedul"]',
-        'button[aria-label*="lanifi"]',
-    ]:
-        schedule_btn = _wait(page, selector, timeout=2000)
-        if schedule_btn:
-            break
+    schedule_btn = selector_cache.find(page, 'schedule_button', _SELECTORS['schedule_button'], timeout=4000)
 
     if not schedule_btn:
         return {'success': False, 'error': 'Could not find Schedule button in compose toolbar'}
@@ -547,153 +1316,27 @@ def _schedule_on_x(page, scheduled_at):
     _wait(page, 'select', timeout=8000)
     _human_delay(0.5, 1)
 
-    # Month name maps (index 0 unused, 1=Jan … 12=Dec)
-    month_names_en = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                      'July', 'August', 'September', 'October', 'November', 'December']
-    month_names_fr = ['', 'janvier', 'février', 'mars', 'avril', 'mai', 'juin',
-                      'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre']
-
     # ── Identify each <select> by its option values (language-independent) ──
     selects = page.query_selector_all('select')
-    logger.info(f"Found {len(selects)} select elements in schedule dialog")
-
-    roles = {}  # role -> {'el': element, 'options': [str]}
-    for i, sel in enumerate(selects):
-        opts = page.evaluate('(el) => Array.from(el.options).map(o => o.value)', sel)
-        role = _identify_select_role(opts)
-        if role != 'unknown' and role not in roles:
-            roles[role] = {'el': sel, 'options': opts}
-            logger.info(f"  Select #{i}: {role} (sample: {opts[:3]})")
-        else:
-            logger.info(f"  Select #{i}: {role or 'unknown'} (sample: {(opts or [])[:3]})")
+    options = [page.evaluate(_SELECT_OPTIONS_JS, sel) for sel in selects]
+    roles = _select_roles(options)
 
-    # ── Set Month ──
-    if 'month' in roles:
-        month_el = roles['month']['el']
-        month_opts = [o.lower() for o in roles['month']['options']]
-        month_set = False
-        # Try English name
-        try:
-            month_el.select_option(value=month_names_en[dt.month])
-            month_set = True
-        except Exception:
-            pass
-        # Try French name (exact)
-        if not month_set:
+    for role, attempts in _schedule_choices(dt, {role: options[i] for role, i in roles.items()}):
+        for kwargs in attempts:
             try:
-                month_el.select_option(value=month_names_fr[dt.month])
-                month_set = True
-            except Exception:
-                pass
-        # Try French name capitalized
-        if not month_set:
-            try:
-                month_el.select_option(value=month_names_fr[dt.month].capitalize())
-                month_set = True
-            except Exception:
-                pass
-        # Try case-insensitive match against actual options
-        if not month_set:
-            target = month_names_fr[dt.month].lower()
-            for opt_val in roles['month']['options']:
-                if opt_val.lower().strip() == target:
-                    try:
-                        month_el.select_option(value=opt_val)
-                        month_set = True
-                        break
-                    except Exception:
-                        pass
-        # Last resort: select by index
-        if not month_set:
-            try:
-                month_el.select_option(index=dt.month - 1)
+                selects[roles[role]].select_option(**kwargs)
+                break
             except Exception:
-                logger.warning("Failed to set month")
-        _human_delay(0.3, 0.5)
-    else:
-        logger.warning("Could not identify month select")
-
-    # ── Set Day ──
-    if 'day' in roles:
-        try:
-            roles['day']['el'].select_option(value=str(dt.day))
-        except Exception:
-            logger.warning("Failed to set day")
-        _human_delay(0.3, 0.5)
-    else:
-        logger.warning("Could not identify day select")
-
-    # ── Set Year ──
-    if 'year' in roles:
-        try:
-            roles['year']['el'].select_option(value=str(dt.year))
-        except Exception:
-            logger.warning("Failed to set year")
-        _human_delay(0.3, 0.5)
-    else:
-        logger.warning("Could not identify year select")
-
-    # ── Set Hour (detect 12h vs 24h by presence of AM/PM select) ──
-    use_24h = 'ampm' not in roles
-    if 'hour' in roles:
-        if use_24h:
-            hour_value = dt.hour
+                continue
         else:
-            hour_value = dt.hour % 12
-            if hour_value == 0:
-                hour_value = 12
-        try:
-            roles['hour']['el'].select_option(value=str(hour_value))
-        except Exception:
-            logger.warning("Failed to set hour")
+            logger.warning(f"Failed to set {role}")
         _human_delay(0.3, 0.5)
-    else:
-        logger.warning("Could not identify hour select")
-
-    # ── Set Minute ──
-    if 'minute' in roles:
-        try:
-            roles['minute']['el'].select_option(value=str(dt.minute).zfill(2))
-        except Exception:
-            try:
-                roles['minute']['el'].select_option(value=str(dt.minute))
-            except Exception:
-                logger.warning("Failed to set minute")
-        _human_delay(0.3, 0.5)
-    else:
-        logger.warning("Could not identify minute select")
-
-    # ── Set AM/PM (12h format only) ──
-    if not use_24h and 'ampm' in roles:
-        ampm = 'AM' if dt.hour < 12 else 'PM'
-        try:
-            roles['ampm']['el'].select_option(value=ampm)
-        except Exception:
-            logger.warning("Failed to set AM/PM")
-        _human_delay(0.3, 0.5)
-
-    fmt_h = dt.hour if use_24h else (dt.hour % 12 or 12)
-    fmt_suffix = '' if use_24h else (' AM' if dt.hour < 12 else ' PM')
-    logger.info(f"Date/time set: {dt.day}/{dt.month}/{dt.year} {fmt_h}:{dt.minute:02d}{fmt_suffix} ({'24h' if use_24h else '12h'} format)")
 
+    _log_schedule_set(dt, roles)
     _human_delay(0.5, 1)
 
     # Click Confirm button
-    confirm_btn = None
-    for selector in [
-        'button[data-testid="scheduledConfirmationPrimaryAction"]',
-        'button[data-testid="confirmationSheetConfirm"]',
-    ]:
-        confirm_btn = _wait(page, selector, timeout=3000)
-        if confirm_btn:
-            break
-
-    # Fallback: find button by text
-    if not confirm_btn:
-        for label in ['Confirm', 'Confirmer']:
-            confirm_btn = page.query_selector(f'button:has-text("{label}")')
-            if confirm_btn:
-                break
+    confirm_btn = selector_cache.find(page, 'schedule_confirm_button', _SELECTORS['schedule_confirm_button'], timeout=3000)
 
     if not confirm_btn:
         return {'success': False, 'error': 'Could not find Confirm button in schedule dialog'}
@@ -701,20 +1344,28 @@ def _schedule_on_x(page, scheduled_at):
     confirm_btn.click()
     _human_delay(0.3, 0.5)
     logger.info("Schedule confirmed, clicking Schedule button")
-
-    # Now click the "Schedule" button (same as tweet button but text changed)
-    return _click_post(page)
+    return {'success': True}
 
 
 def _do_test_connection():
     """Test connection logic - runs in the worker thread."""
     try:
-        page = _ensure_browser()
-        result = _login(page)
-        _close_if_visible()
+        page = _ensure_browser('login')
+        result = _login(page, force=True)
         return result
     except Exception as e:
-        _close_if_visible()
+        return {'success': False, 'error': str(e)}
+
+
+def _do_prelaunch():
+    """Start this worker's browser ahead of the first real task."""
+    try:
+        started = monotonic()
+        _ensure_browser()
+        logger.info(f"Browser pre-launched in {monotonic() - started:.1f}s")
+        return {'success': True}
+    except Exception as e:
+        logger.warning(f"Browser pre-launch failed: {e}")
         return {'success': False, 'error': str(e)}
 
 
@@ -741,16 +1392,15 @@ def _parse_count(text):
 def _do_fetch_profile():
     """Fetch profile picture and display name from X. Runs in worker thread."""
     try:
-        page = _ensure_browser()
+        page = _ensure_browser('profile')
 
         login_result = _login(page)
         if not login_result['success']:
-            _close_if_visible()
             return login_result
 
         cfg = _get_config()
         username = cfg['username']
-        page.goto(f"https://x.com/{username}", wait_until='domcontentloaded')
+        _goto(page, _x_url(f"/{username}"))
         _wait(page, 'div[data-testid="UserName"]', timeout=10000)
         _dismiss_popups(page)
 
@@ -765,24 +1415,21 @@ def _do_fetch_profile():
         verified_type = ''
         try:
             # Method 1: look for the verified badge SVG near the username
-            badge_selectors = [
+            badge_el = selector_cache.find(page, 'profile_verified_badge', [
                 'div[data-testid="UserName"] svg[aria-label*="Verified"]',
                 'div[data-testid="UserName"] svg[aria-label*="erifi"]',
                 'div[data-testid="UserName"] svg[aria-label*="Certifi"]',
-            ]
-            for sel in badge_selectors:
-                badge_el = _wait(page, sel, timeout=2000)
-                if badge_el:
-                    aria = badge_el.get_attribute('aria-label') or ''
-                    is_verified = True
-                    verified_type = 'blue'  # default
-                    # Gold badge = business, grey = government
-                    if 'business' in aria.lower() or 'entreprise' in aria.lower():
-                        verified_type = 'business'
-                    elif 'government' in aria.lower() or 'gouvernement' in aria.lower():
-                        verified_type = 'government'
-                    logger.info(f"Verification badge detected: {verified_type} ({aria})")
-                    break
+            ], timeout=2000)
+            if badge_el:
+                aria = badge_el.get_attribute('aria-label') or ''
+                is_verified = True
+                verified_type = 'blue'  # default
+                # Gold badge = business, grey = government
+                if 'business' in aria.lower() or 'entreprise' in aria.lower():
+                    verified_type = 'business'
+                elif 'government' in aria.lower() or 'gouvernement' in aria.lower():
+                    verified_type = 'government'
+                logger.info(f"Verification badge detected: {verified_type} ({aria})")
 
             # Method 2: intercept GraphQL data embedded in the page
             if not is_verified:
@@ -835,9 +1482,10 @@ def _do_fetch_profile():
         followers_count = 0
         following_count = 0
         try:
-            followers_link = _wait(page, f'a[href="/{username}/verified_followers"]', timeout=5000)
-            if not followers_link:
-                followers_link = _wait(page, f'a[href="/{username}/followers"]', timeout=3000)
+            followers_link = selector_cache.find(page, 'profile_followers_link', [
+                f'a[href="/{username}/verified_followers"]',
+                f'a[href="/{username}/followers"]',
+            ], timeout=5000)
             if followers_link:
                 raw = followers_link.inner_text().strip()
                 followers_count = _parse_count(raw)
@@ -853,21 +1501,16 @@ def _do_fetch_profile():
 
         # Get profile image URL from the avatar
         avatar_url = ''
-        avatar_selectors = [
+        img_el = selector_cache.find(page, 'profile_avatar', [
             f'div[data-testid="UserAvatar-Container-{username}"] img',
             'a[href$="/photo"] img',
             'div[data-testid^="UserAvatar"] img',
-        ]
-        for sel in avatar_selectors:
-            img_el = _wait(page, sel, timeout=5000)
-            if img_el:
-                avatar_url = img_el.get_attribute('src') or ''
-                if avatar_url:
-                    break
+        ], timeout=5000)
+        if img_el:
+            avatar_url = img_el.get_attribute('src') or ''
 
         if not avatar_url:
             logger.warning("Could not find profile picture element")
-            _close_if_visible()
             return {'success': False, 'error': 'Profile picture not found on page'}
 
         # Get the highest resolution version
@@ -891,10 +1534,8 @@ def _do_fetch_profile():
                     f.write(response.body())
                 logger.info(f"Profile picture saved (original size) to {save_path}")
             else:
-                _close_if_visible()
                 return {'success': False, 'error': f'Failed to download image (HTTP {response.status})'}
 
-        _close_if_visible()
         return {
             'success': True,
             'display_name': display_name,
@@ -910,23 +1551,16 @@ def _do_fetch_profile():
 
     except Exception as e:
         logger.error(f"fetch_profile error: {e}")
-        _close_if_visible()
         return {'success': False, 'error': str(e)}
 
 
-def _do_close():
-    """Close browser - runs in the worker thread."""
-    _close_browser_internal()
-    return {'success': True}
-
-
 def _do_open_google_login():
     """Open a plain browser on X login page, click 'Sign in with Google',
     wait for user to complete login, then save session to state.json.
     Based on the ddd/save-session.js + login-google-auto.js approach:
     plain browser (not persistent) + storageState save/load.
     """
-    global _playwright, _context, _page
+    global _browser_generation
     try:
         # Close any existing bot browser first
         _close_browser_internal()
@@ -963,7 +1597,7 @@ def _do_open_google_login():
 
         # Step 1: Go to X login page
         logger.info("Navigating to X login page...")
-        page.goto("https://x.com/i/flow/login", wait_until='domcontentloaded', timeout=30000)
+        page.goto(_x_url("/i/flow/login"), wait_until='domcontentloaded', timeout=30000)
         _human_delay(3, 4)
 
         # Step 2: Click "Sign in with Google" button
@@ -977,16 +1611,14 @@ def _do_open_google_login():
         ]
 
         clicked = False
-        for selector in google_selectors:
+        el = selector_cache.find(page, 'google_signin_button', google_selectors, timeout=5000)
+        if el:
             try:
-                el = page.wait_for_selector(selector, timeout=5000)
-                if el:
-                    el.click()
-                    logger.info(f"Google button found and clicked ({selector})")
-                    clicked = True
-                    break
+                el.click()
+                logger.info("Google button found and clicked")
+                clicked = True
             except Exception:
-                continue
+                pass
 
         if not clicked:
             logger.info("Google button not found automatically — user must click manually")
@@ -1001,6 +1633,8 @@ def _do_open_google_login():
             state_path = os.path.join(paths.DATA_DIR, 'state.json')
             context.storage_state(path=state_path)
             logger.info(f"Session saved to {state_path}")
+            # Pool workers relaunch with the new session
+            _browser_generation += 1
 
             browser.close()
             pw.stop()
@@ -1051,424 +1685,692 @@ def _do_check_google_connected():
         return {'connected': False, 'error': str(e)}
 
 
+_TWEET_ARTICLE = 'article[data-testid="tweet"]'
+# A toast with one of these words confirms a deletion
+_DELETE_TOAST_KEYWORDS = ('deleted', 'supprimé')
+
+
+def _delete_confirmed_by_toast(toast_text):
+    if any(kw in toast_text.lower() for kw in _DELETE_TOAST_KEYWORDS):
+        logger.info("Tweet deleted successfully (confirmed by toast)")
+        return True
+    return False
+
+
 def _do_delete_tweet(tweet_url):
     """Delete a tweet from X. Runs in worker thread."""
     try:
         if not tweet_url or '/status/' not in tweet_url:
             return {'success': False, 'error': 'Invalid tweet URL'}
 
-        page = _ensure_browser()
+        page = _ensure_browser('delete')
 
         login_result = _login(page)
         if not login_result['success']:
-            _close_if_visible()
             return login_result
 
         logger.info(f"Navigating to tweet: {tweet_url}")
-        page.goto(tweet_url, wait_until='domcontentloaded')
+        _goto(page, tweet_url)
         _human_delay(1, 2)
         _dismiss_popups(page)
 
         # Check if the tweet exists
-        tweet_article = _wait(page, 'article[data-testid="tweet"]', timeout=10000)
+        tweet_article = _wait(page, _TWEET_ARTICLE, timeout=10000)
         if not tweet_article:
             # Tweet might already be deleted or doesn't exist
-            deleted_text = _wait(page, 'text="This post was deleted"', timeout=2000)
-            if not deleted_text:
-                deleted_text = _wait(page, 'text="Ce post a été supprimé"', timeout=1000)
+            deleted_text = selector_cache.find(page, 'tweet_deleted_notice', _SELECTORS['tweet_deleted_notice'], timeout=2000)
             if deleted_text:
                 logger.info("Tweet already deleted")
-                _close_if_visible()
                 return {'success': True, 'already_deleted': True}
-            _close_if_visible()
             return {'success': False, 'error': 'Tweet not found'}
 
         # Click the "More" button (three dots) on the tweet
-        more_btn = None
-        for selector in [
-            'article[data-testid="tweet"] button[data-testid="caret"]',
-            'article[data-testid="tweet"] div[aria-label*="More"]',
-            'article[data-testid="tweet"] div[aria-label*="Plus"]',
-        ]:
-            more_btn = _wait(page, selector, timeout=3000)
-            if more_btn:
-                break
+        more_btn = selector_cache.find(page, 'tweet_more_button', _SELECTORS['tweet_more_button'], timeout=3000)
 
         if not more_btn:
-            _close_if_visible()
             return {'success': False, 'error': 'Could not find More button on tweet'}
 
         more_btn.click()
         _human_delay(0.5, 1)
 
         # Click "Delete" in the dropdown menu
-        delete_option = None
-        for selector in [
-            'div[data-testid="Dropdown"] div[role="menuitem"]:has-text("Delete")',
-            'div[data-testid="Dropdown"] div[role="menuitem"]:has-text("Supprimer")',
-            'div[role="menuitem"]:has-text("Delete")',
-            'div[role="menuitem"]:has-text("Supprimer")',
-        ]:
-            delete_option = _wait(page, selector, timeout=3000)
-            if delete_option:
-                break
+        delete_option = selector_cache.find(page, 'tweet_delete_menuitem', _SELECTORS['tweet_delete_menuitem'], timeout=3000)
 
         if not delete_option:
             # Close the menu and return error
             page.keyboard.press('Escape')
-            _close_if_visible()
             return {'success': False, 'error': 'Could not find Delete option in menu'}
 
         delete_option.click()
         _human_delay(0.5, 1)
 
         # Confirm deletion in the dialog
-        confirm_btn = None
-        for selector in [
-            'button[data-testid="confirmationSheetConfirm"]',
-            'div[data-testid="confirmationSheetDialog"] button:has-text("Delete")',
-            'div[data-testid="confirmationSheetDialog"] button:has-text("Supprimer")',
-            'button:has-text("Delete")',
-            'button:has-text("Supprimer")',
-        ]:
-            confirm_btn = _wait(page, selector, timeout=3000)
-            if confirm_btn:
-                break
+        confirm_btn = selector_cache.find(page, 'tweet_delete_confirm', _SELECTORS['tweet_delete_confirm'], timeout=3000)
 
         if not confirm_btn:
-            _close_if_visible()
             return {'success': False, 'error': 'Could not find confirmation button'}
 
         confirm_btn.click()
         _human_delay(1, 2)
 
         # Verify deletion - the tweet should disappear or show deleted message
-        toast_el = _wait(page, 'div[data-testid="toast"]', timeout=5000)
-        if toast_el:
-            toast_text = toast_el.inner_text().lower()
-            if 'deleted' in toast_text or 'supprimé' in toast_text:
-                logger.info("Tweet deleted successfully (confirmed by toast)")
-                _close_if_visible()
-                return {'success': True}
+        toast_el = _wait(page, _TOAST, timeout=5000)
+        if toast_el and _delete_confirmed_by_toast(toast_el.inner_text()):
+            return {'success': True}
 
         # Check if we're redirected away from the tweet
         _human_delay(0.5, 1)
         if '/status/' not in page.url:
             logger.info("Tweet deleted successfully (redirected away)")
-            _close_if_visible()
             return {'success': True}
 
         # Check if the tweet article is gone
-        tweet_still_visible = _wait(page, 'article[data-testid="tweet"]', timeout=2000)
+        tweet_still_visible = _wait(page, _TWEET_ARTICLE, timeout=2000)
         if not tweet_still_visible:
             logger.info("Tweet deleted successfully (tweet disappeared)")
-            _close_if_visible()
             return {'success': True}
 
         logger.warning("Tweet deletion status uncertain")
-        _close_if_visible()
         return {'success': True}
 
     except Exception as e:
         logger.error(f"delete_tweet error: {e}")
-        _close_if_visible()
         return {'success': False, 'error': str(e)}
 
 
+SCHEDULED_PATH = '/compose/tweet/unsent/scheduled'
+
+# Clicks the "Scheduled" tab of the Drafts modal once it is rendered
+_SCHEDULED_TAB_JS = '''() => {
+    const tabLabels = ["Scheduled", "Programmés", "Planifiés", "Programmé"];
+    const allElements = document.querySelectorAll('span, a, div[role="tab"], div[role="button"]');
+    for (const el of allElements) {
+        const text = el.textContent.trim();
+        if (tabLabels.some(label => text === label)) {
+            const rect = el.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0) {
+                el.click();
+                return {clicked: true, tag: el.tagName, text: text};
+            }
+        }
+    }
+    return null;
+}'''
+
+# Indexes the visible text fragments of the Scheduled list in one DOM pass:
+# keeps normalized text -> elements in window.__xpmScheduled and returns the
+# keys. Only direct text nodes count, to avoid matching containers.
+_SCHEDULED_INDEX_JS = '''() => {
+    const index = new Map();
+    for (const el of document.querySelectorAll('span, div, p')) {
+        const directText = Array.from(el.childNodes)
+            .filter(n => n.nodeType === Node.TEXT_NODE)
+            .map(n => n.textContent)
+            .join(' ')
+            .replace(/\\s+/g, ' ')
+            .trim()
+            .toLowerCase();
+        if (!directText) continue;
+        const rect = el.getBoundingClientRect();
+        if (rect.width > 0 && rect.height > 0 && rect.top > 0) {
+            if (!index.has(directText)) index.set(directText, []);
+            index.get(directText).push(el);
+        }
+    }
+    window.__xpmScheduled = index;
+    return index.size ? Array.from(index.keys()) : null;
+}'''
+
+# Clicks the first still-attached element indexed under a key
+_SCHEDULED_CLICK_JS = '''(key) => {
+    const els = (window.__xpmScheduled && window.__xpmScheduled.get(key)) || [];
+    for (const el of els) {
+        if (el.isConnected && el.getBoundingClientRect().height > 0) {
+            el.click();
+            return true;
+        }
+    }
+    return false;
+}'''
+
+# Clicks "Will send on..." in the editor. Takes the SMALLEST element
+# (shortest text) to avoid clicking on a parent container.
+_WILL_SEND_JS = '''() => {
+    const allElements = document.querySelectorAll('span, div, a');
+    const candidates = [];
+    for (const el of allElements) {
+        const text = el.textContent.trim();
+        if (text.startsWith("Will send on") || text.startsWith("Sera envoyé")) {
+            const rect = el.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0) {
+                candidates.push({el: el, text: text, len: text.length});
+            }
+        }
+    }
+    if (candidates.length === 0) return null;
+    candidates.sort((a, b) => a.len - b.len);
+    candidates[0].el.click();
+    return {found: true, text: candidates[0].text, total: candidates.length};
+}'''
+
+# Clicks "Clear" (top-right of the schedule picker)
+_CLEAR_SCHEDULE_JS = '''() => {
+    const allElements = document.querySelectorAll('span, button, a, div[role="button"]');
+    for (const el of allElements) {
+        const text = el.textContent.trim();
+        if (text === "Clear" || text === "Effacer") {
+            const rect = el.getBoundingClientRect();
+            if (rect.width > 0 && rect.height > 0) {
+                el.click();
+                return {found: true, text: text};
+            }
+        }
+    }
+    return null;
+}'''
+
+# Clicks the confirmation dialog button (Discard/Delete/Confirm) if X shows one
+_CONFIRM_CLEAR_JS = '''() => {
+    const buttonTexts = ["Discard", "Delete", "Confirm", "Supprimer", "Confirmer"];
+    for (const btnText of buttonTexts) {
+        const buttons = document.querySelectorAll('button, div[role="button"], [data-testid="confirmationSheetConfirm"]');
+        for (const btn of buttons) {
+            const text = btn.textContent.trim();
+            if (text === btnText || btn.getAttribute("data-testid") === "confirmationSheetConfirm") {
+                const rect = btn.getBoundingClientRect();
+                if (rect.width > 0 && rect.height > 0) {
+                    btn.click();
+                    return {found: true, text: text};
+                }
+            }
+        }
+    }
+    return null;
+}'''
+
+# Debug: visible text fragments, to understand what is on screen
+_VISIBLE_TEXTS_JS = '''() => {
+    const visibleTexts = [];
+    for (const el of document.querySelectorAll('span')) {
+        const t = el.textContent.trim();
+        if (t && t.length > 1 && t.length < 100) {
+            const r = el.getBoundingClientRect();
+            if (r.width > 0 && r.height > 0) {
+                visibleTexts.push(t.substring(0, 60));
+            }
+        }
+        if (visibleTexts.length >= 30) break;
+    }
+    return visibleTexts;
+}'''
+
+
+def _normalize_text(text):
+    return ' '.join((text or '').split()).lower()
+
+
+def _match_scheduled(search_text, keys):
+    """The Scheduled-list key for ``search_text``: an exact (normalized) match,
+    else the longest entry that starts it or contains it. X shortens long
+    posts in the list, so a trailing ellipsis is ignored."""
+    target = _normalize_text(search_text)
+    if target in keys:
+        return target
+    candidates = []
+    for key in keys:
+        shown = key.rstrip('…').rstrip('.').strip()
+        if shown and (target.startswith(shown) or target in shown):
+            candidates.append(key)
+    return max(candidates, key=len) if candidates else None
+
+
+def _open_scheduled_list(page):
+    """Open the Drafts modal on its Scheduled tab and index its entries.
+    Returns the entry keys (see _SCHEDULED_INDEX_JS), empty if none showed up."""
+    logger.info(f"Navigating to scheduled tweets: {_x_url(SCHEDULED_PATH)}")
+    with metrics.span('open drafts'):
+        _goto(page, _x_url(SCHEDULED_PATH))
+        _dismiss_popups(page)
+    return _show_scheduled_tab(page)
+
+
+@metrics.span('index scheduled list')
+def _show_scheduled_tab(page, timeout=15000):
+    tab_result = _wait_for_js(page, _SCHEDULED_TAB_JS, timeout=timeout)
+    logger.info(f"Scheduled tab click: {tab_result}")
+    keys = _wait_for_js(page, _SCHEDULED_INDEX_JS, timeout=10000) or []
+    logger.info(f"Scheduled list: {len(keys)} text fragment(s) indexed")
+    return keys
+
+
+def _back_to_scheduled_list(page):
+    """Return to the Scheduled list after clearing a tweet, without reloading
+    when possible (X's in-app history). Returns the fresh entry keys."""
+    if '/unsent/scheduled' not in page.url:
+        try:
+            page.go_back(wait_until='commit', timeout=_capped_timeout(5000))
+        except Exception:
+            pass
+    if '/unsent/scheduled' not in page.url:
+        logger.info("Scheduled list not reachable through history, reloading it")
+        return _open_scheduled_list(page)
+    return _show_scheduled_tab(page, timeout=5000)
+
+
+def _clear_open_scheduled_tweet(page):
+    """With a scheduled tweet open in the editor, remove its schedule.
+    Returns a result dict."""
+    logger.info("Looking for 'Will send on...' text in editor...")
+    with metrics.span('open schedule picker'):
+        will_send_result = _wait_for_js(page, _WILL_SEND_JS, timeout=10000)
+    logger.info(f"'Will send on' click result: {will_send_result}")
+    if not will_send_result:
+        logger.error("Could not find 'Will send on...' in editor")
+        page.keyboard.press('Escape')
+        return {'success': False, 'error': 'Could not find "Will send on..." link in editor'}
+
+    _step_jitter()
+
+    logger.info("Looking for 'Clear' button in schedule picker...")
+    with metrics.span('clear schedule'):
+        clear_result = _wait_for_js(page, _CLEAR_SCHEDULE_JS, timeout=10000)
+    logger.info(f"Clear click result: {clear_result}")
+    if not clear_result:
+        logger.error("Could not find 'Clear' button")
+        page.keyboard.press('Escape')
+        return {'success': False, 'error': 'Could not find Clear button in schedule picker'}
+
+    with metrics.span('confirm'):
+        confirm_result = _wait_for_js(page, _CONFIRM_CLEAR_JS, timeout=3000)
+        if confirm_result:
+            logger.info(f"Clicked confirmation: '{confirm_result.get('text')}'")
+            # Done once X has closed the confirmation sheet
+            _wait_for_js(page, '''() => !document.querySelector('[data-testid="confirmationSheetConfirm"]')''',
+                         timeout=5000)
+    return {'success': True}
+
+
+def _cancel_scheduled(page, search_text, keys):
+    """Open the entry of ``keys`` matching ``search_text`` and clear its schedule."""
+    with metrics.span('find tweet'):
+        key = _match_scheduled(search_text, keys)
+        if key is None or not page.evaluate(_SCHEDULED_CLICK_JS, key):
+            # The list may have re-rendered since it was indexed: index it once more
+            keys = _wait_for_js(page, _SCHEDULED_INDEX_JS, timeout=3000) or []
+            key = _match_scheduled(search_text, keys)
+            if key is None or not page.evaluate(_SCHEDULED_CLICK_JS, key):
+                logger.error(f"Tweet '{search_text[:80]}' not found. Visible texts on page: {page.evaluate(_VISIBLE_TEXTS_JS)}")
+                return {'success': False, 'error': 'Tweet not found in scheduled list'}
+    logger.info(f"Clicked scheduled tweet: '{key[:80]}'")
+    _step_jitter()
+    return _clear_open_scheduled_tweet(page)
+
+
 def _do_delete_scheduled_tweet(post_text):
     """Delete a scheduled tweet from X by matching its text content.
     Uses JavaScript DOM traversal for reliable element detection inside modal overlays.
     Flow: Drafts modal (Scheduled tab) -> click tweet -> click "Will send on..." -> click "Clear"
+
+    Each step waits for its element to show up (bounded by a timeout) rather
+    than sleeping a fixed time, so the flow runs as fast as X renders.
     """
     try:
         if not post_text or not post_text.strip():
             return {'success': False, 'error': 'No text provided to match scheduled tweet'}
 
-        page = _ensure_browser()
+        page = _ensure_browser('delete')
 
         login_result = _login(page)
         if not login_result['success']:
-            _close_if_visible()
             return login_result
 
-        # Navigate to scheduled tweets page — opens the "Drafts" modal with "Scheduled" tab
-        scheduled_url = 'https://x.com/compose/tweet/unsent/scheduled'
-        logger.info(f"Navigating to scheduled tweets: {scheduled_url}")
-        page.goto(scheduled_url, wait_until='domcontentloaded')
-        _human_delay(4, 6)
-        _dismiss_popups(page)
-
         search_text = post_text.strip()
         logger.info(f"Looking for scheduled tweet: '{search_text[:80]}'")
+        keys = _open_scheduled_list(page)
+        _step_jitter()
 
-        # Step 1: Wait for the page to settle and click the "Scheduled" tab
-        # Use JavaScript to find and click the "Scheduled" tab text
-        _human_delay(2, 3)
-
-        # Click the "Scheduled" tab to make sure we see scheduled tweets
-        tab_result = page.evaluate('''() => {
-            const tabLabels = ["Scheduled", "Programmés", "Planifiés", "Programmé"];
-            const allElements = document.querySelectorAll('span, a, div[role="tab"], div[role="button"]');
-            for (const el of allElements) {
-                const text = el.textContent.trim();
-                if (tabLabels.some(label => text === label)) {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        el.click();
-                        return {clicked: true, tag: el.tagName, text: text};
-                    }
-                }
-            }
-            return {clicked: false};
-        }''')
-        logger.info(f"Scheduled tab click: {tab_result}")
-        _human_delay(3, 4)
-
-        # Step 2: Find and click the scheduled tweet matching our text
-        # Use JS to scan ALL visible text nodes and find the one matching search_text
-        click_result = page.evaluate('''(searchText) => {
-            const searchLower = searchText.toLowerCase().trim();
-            const allElements = document.querySelectorAll('span, div, p');
-            const candidates = [];
-
-            for (const el of allElements) {
-                // Only check direct text content (not children) to avoid clicking containers
-                const directText = Array.from(el.childNodes)
-                    .filter(n => n.nodeType === Node.TEXT_NODE)
-                    .map(n => n.textContent.trim())
-                    .join(' ')
-                    .trim();
-
-                if (!directText) continue;
-
-                const elText = directText.toLowerCase();
-                if (elText.includes(searchLower) || searchLower.includes(elText)) {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0 && rect.top > 0) {
-                        candidates.push({
-                            element: el,
-                            text: directText,
-                            exactMatch: elText === searchLower,
-                            top: rect.top,
-                            tag: el.tagName
-                        });
-                    }
-                }
-            }
-
-            // Sort: prefer exact matches, then by position (higher = more likely in modal)
-            candidates.sort((a, b) => {
-                if (a.exactMatch && !b.exactMatch) return -1;
-                if (!a.exactMatch && b.exactMatch) return 1;
-                return a.top - b.top;
-            });
-
-            // Log what we found
-            const debugInfo = candidates.slice(0, 5).map(c => ({text: c.text, tag: c.tag, top: Math.round(c.top)}));
-
-            if (candidates.length > 0) {
-                candidates[0].element.click();
-                return {found: true, clicked: candidates[0].text, tag: candidates[0].tag, allCandidates: debugInfo};
-            }
-
-            // Debug: list all visible text fragments to understand what's on screen
-            const visibleTexts = [];
-            for (const el of document.querySelectorAll('span')) {
-                const t = el.textContent.trim();
-                if (t && t.length > 1 && t.length < 100) {
-                    const r = el.getBoundingClientRect();
-                    if (r.width > 0 && r.height > 0) {
-                        visibleTexts.push(t.substring(0, 60));
-                    }
-                }
-                if (visibleTexts.length >= 30) break;
-            }
-            return {found: false, visibleTexts: visibleTexts};
-        }''', search_text)
-
-        logger.info(f"Tweet search result: {click_result}")
-
-        if not click_result.get('found'):
-            visible = click_result.get('visibleTexts', [])
-            logger.error(f"Tweet '{search_text}' not found. Visible texts on page: {visible}")
-            _close_if_visible()
-            return {'success': False, 'error': 'Tweet not found in scheduled list'}
-
-        logger.info(f"Clicked tweet text: '{click_result.get('clicked')}'")
-        _human_delay(2, 3)
-
-        # Step 3: In the editor, click "Will send on..." to open the schedule picker
-        # We need the SMALLEST element (shortest text) to avoid clicking on a parent container
-        logger.info("Looking for 'Will send on...' text in editor...")
-        will_send_result = page.evaluate('''() => {
-            const allElements = document.querySelectorAll('span, div, a');
-            const candidates = [];
-            for (const el of allElements) {
-                const text = el.textContent.trim();
-                if (text.startsWith("Will send on") || text.startsWith("Sera envoyé")) {
-                    const rect = el.getBoundingClientRect();
-                    if (rect.width > 0 && rect.height > 0) {
-                        candidates.push({el: el, text: text, len: text.length});
-                    }
-                }
-            }
-            // Sort by text length — shortest = most specific element
-            candidates.sort((a, b) => a.len - b.len);
-            if (candidates.length > 0) {
-                candidates[0].el.click();
-                return {found: true, text: candidates[0].text, total: candidates.length};
-            }
-            return {found: false};
-        }''')
-        logger.info(f"'Will send on' click result: {will_send_result}")
-
-        if not will_send_result.get('found'):
-            logger.error("Could not find 'Will send on...' in editor")
-            page.keyboard.press('Escape')
-            _human_delay(0.5, 1)
-            _close_if_visible()
-            return {'success': False, 'error': 'Could not find "Will send on..." link in editor'}
+        result = _cancel_scheduled(page, search_text, keys)
+        if result['success']:
+            logger.info("Scheduled tweet deleted successfully")
+        return result
 
-        _human_delay(3, 4)
+    except Exception as e:
+        logger.error(f"delete_scheduled_tweet error: {e}")
+        return {'success': False, 'error': str(e)}
 
-        # Step 4: In the schedule picker, click "Clear" (top-right)
-        # Retry a few times in case the picker takes time to open
-        logger.info("Looking for 'Clear' button in schedule picker...")
-        clear_result = {'found': False}
-        for attempt in range(4):
-            clear_result = page.evaluate('''() => {
-                const allElements = document.querySelectorAll('span, button, a, div[role="button"]');
-                for (const el of allElements) {
-                    const text = el.textContent.trim();
-                    if (text === "Clear" || text === "Effacer") {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.width > 0 && rect.height > 0) {
-                            el.click();
-                            return {found: true, text: text};
-                        }
-                    }
-                }
-                return {found: false};
-            }''')
-            if clear_result.get('found'):
-                break
-            logger.info(f"Clear not found yet (attempt {attempt + 1}/4), waiting...")
-            _human_delay(2, 3)
 
-        logger.info(f"Clear click result: {clear_result}")
+def _do_delete_scheduled_many(post_texts):
+    """Cancel several scheduled tweets in one pass over the Scheduled list.
 
-        if not clear_result.get('found'):
-            logger.error("Could not find 'Clear' button after retries")
-            page.keyboard.press('Escape')
-            _human_delay(0.5, 1)
-            _close_if_visible()
-            return {'success': False, 'error': 'Could not find Clear button in schedule picker'}
-
-        _human_delay(2, 3)
-
-        # Step 5: Handle any confirmation dialog (Discard/Delete/Confirm)
-        confirm_result = page.evaluate('''() => {
-            const buttonTexts = ["Discard", "Delete", "Confirm", "Supprimer", "Confirmer"];
-            for (const btnText of buttonTexts) {
-                const buttons = document.querySelectorAll('button, div[role="button"], [data-testid="confirmationSheetConfirm"]');
-                for (const btn of buttons) {
-                    const text = btn.textContent.trim();
-                    if (text === btnText || btn.getAttribute("data-testid") === "confirmationSheetConfirm") {
-                        const rect = btn.getBoundingClientRect();
-                        if (rect.width > 0 && rect.height > 0) {
-                            btn.click();
-                            return {found: true, text: text};
-                        }
-                    }
-                }
-            }
-            return {found: false};
-        }''')
-        if confirm_result.get('found'):
-            logger.info(f"Clicked confirmation: '{confirm_result.get('text')}'")
-            _human_delay(1, 2)
+    The list is loaded and indexed once; after each tweet the worker goes
+    back to it through X's history instead of reloading it. Returns one
+    result dict per text, in order.
+    """
+    try:
+        page = _ensure_browser('delete')
 
-        logger.info("Scheduled tweet deleted successfully")
-        _close_if_visible()
-        return {'success': True}
+        login_result = _login(page)
+        if not login_result['success']:
+            return [login_result] * len(post_texts)
 
+        keys = _open_scheduled_list(page)
     except Exception as e:
-        logger.error(f"delete_scheduled_tweet error: {e}")
-        _close_if_visible()
-        return {'success': False, 'error': str(e)}
-
+        logger.error(f"delete_scheduled_many error: {e}")
+        return [{'success': False, 'error': str(e)}] * len(post_texts)
 
-def _worker_loop():
-    """Worker thread main loop. Processes all Playwright tasks sequentially."""
+    results = []
+    for i, post_text in enumerate(post_texts):
+        if not post_text or not post_text.strip():
+            results.append({'success': False, 'error': 'No text provided to match scheduled tweet'})
+            continue
+        try:
+            if i:
+                keys = _back_to_scheduled_list(page)
+            _step_jitter()
+            results.append(_cancel_scheduled(page, post_text.strip(), keys))
+        except TaskAborted as e:
+            # Keep what was already cancelled on X; the rest is reported as failed
+            results += [{'success': False, 'error': str(e)}] * (len(post_texts) - len(results))
+            break
+        except Exception as e:
+            logger.error(f"delete_scheduled_many item {i} error: {e}")
+            results.append({'success': False, 'error': str(e)})
+
+    done = sum(1 for r in results if r['success'])
+    logger.info(f"Cancelled {done}/{len(post_texts)} scheduled tweet(s)")
+    return results
+
+
+class _Task:
+    """One unit of work for the Playwright worker."""
+
+    def __init__(self, func, args, priority, timeout, deadline, cancel_event):
+        self.func = func
+        self.args = args
+        self.priority = priority
+        self.timeout = timeout                      # max run time once started (seconds)
+        self.deadline = deadline                    # monotonic() time it must start by, or None
+        self.cancel_event = cancel_event or threading.Event()
+        self.enqueued_at = monotonic()
+        self.run_deadline = None
+        self.aborted = False
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.result = None
+
+    def finish(self, result):
+        self.result = result
+        self.done.set()
+
+
+def _record_queue_wait(task):
+    waited = monotonic() - task.enqueued_at
+    priority = _PRIORITY_NAMES.get(task.priority, str(task.priority))
+    metrics.observe('xpm_bot_queue_wait_seconds', waited, priority=priority)
+    with _stats_lock:
+        stats = _queue_stats.setdefault(priority, {'tasks': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0})
+        stats['tasks'] += 1
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+    if waited > 5:
+        logger.info(f"{task.func.__name__} waited {waited:.1f}s in the queue")
+
+
+def _operation_name(func):
+    """Metrics name of a worker task: _do_post -> post."""
+    name = func.__name__
+    return name[len('_do_'):] if name.startswith('_do_') else name
+
+
+metrics.describe('xpm_bot_queue_wait_seconds', 'Time browser tasks waited for a free worker, by priority.')
+metrics.describe('xpm_bot_worker_busy_seconds_total', 'Time each browser worker spent running tasks.')
+metrics.gauge('xpm_bot_queue_depth', lambda: _task_queue.qsize(), 'Browser tasks waiting for a worker.')
+metrics.gauge('xpm_bot_workers', lambda: len(_worker_threads), 'Browser worker threads.')
+metrics.gauge('xpm_bot_tasks_running', lambda: len(_running), 'Browser tasks being run right now.')
+
+
+def _pool_size():
+    return max(1, int(os.getenv('BROWSER_POOL_SIZE', '1')))
+
+
+def concurrency():
+    """How many browser actions can run at once with the current settings:
+    the pool workers, or with BOT_ENGINE=async the engine's pages (the
+    pool still runs the tasks that engine leaves to it)."""
+    if _engine() == 'async':
+        return max(_pool_size(), int(os.getenv('BOT_ASYNC_CONCURRENCY', '3')))
+    return _pool_size()
+
+
+def _worker_loop(index):
+    """Worker thread main loop. Runs Playwright tasks one at a time on this
+    worker's own browser; several workers drain the same queue."""
+    _state.index = index
+    name = threading.current_thread().name
     while True:
-        task = _task_queue.get()
+        if _state.context is not None and _state.generation != _browser_generation:
+            # Close now rather than at the next task, so an engine switch
+            # gets the Chrome profile back without waiting for work
+            logger.info(f"Worker {index}: settings changed, closing browser")
+            _close_browser_internal()
+        if _task_queue.empty():
+            _warm_compose()
+        try:
+            _, _, task = _task_queue.get(timeout=_queue_wait())
+        except queue.Empty:
+            _close_if_idle()
+            continue
         if task is None:
             _close_browser_internal()
             break
 
-        func, args, result_event, result_holder = task
-        try:
-            result_holder['result'] = func(*args)
-        except Exception as e:
-            result_holder['result'] = {'success': False, 'error': str(e)}
-        finally:
-            result_event.set()
+        task.started.set()
+        _record_queue_wait(task)
+        if task.cancel_event.is_set():
+            task.finish({'success': False, 'error': 'Cancelled before it started'})
+            continue
+        if task.deadline is not None and monotonic() > task.deadline:
+            logger.warning(f"{task.func.__name__} dropped: deadline passed while queued")
+            task.finish({'success': False, 'error': 'Deadline passed before the browser was free'})
+            continue
+
+        task.run_deadline = monotonic() + task.timeout
+        _state.task = task
+        _state.task_started_at = monotonic()
+        _state.warm_retry_at = None
+        _running[name] = task.func.__name__
+        # Times the task and its steps (see metrics.py) and logs the breakdown
+        with metrics.operation(_operation_name(task.func), log=logger) as timer:
+            try:
+                result = timer.set_result(task.func(*task.args))
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+                timer.outcome = 'exception'
+            finally:
+                _state.task = None
+                _running.pop(name, None)
+            if task.aborted:
+                timer.outcome = 'aborted'
+        metrics.inc('xpm_bot_worker_busy_seconds_total', timer.elapsed(), worker=index)
+        if task.aborted:
+            # The page was left mid-flow; start the next task from a fresh browser
+            logger.warning(f"{task.func.__name__} aborted: {result.get('error') if isinstance(result, dict) else ''}")
+            _close_browser_internal()
+        _state.idle_since = monotonic()
+        _close_if_idle()
+        task.finish(result)
 
 
 def _ensure_worker():
-    global _worker_thread, _worker_started
+    """Start pool workers up to BROWSER_POOL_SIZE."""
     with _worker_lock:
-        if not _worker_started:
-            _worker_thread = threading.Thread(target=_worker_loop, daemon=True, name='playwright-worker')
-            _worker_thread.start()
-            _worker_started = True
+        _worker_threads[:] = [t for t in _worker_threads if t.is_alive()]
+        while len(_worker_threads) < _pool_size():
+            index = len(_worker_threads)
+            thread = threading.Thread(target=_worker_loop, args=(index,), daemon=True,
+                                      name='playwright-worker' if index == 0 else f'playwright-worker-{index}')
+            thread.start()
+            _worker_threads.append(thread)
+
+
+@contextmanager
+def cancellable(cancel_event):
+    """Tasks submitted from this thread inside the block stop when ``cancel_event`` is set."""
+    previous = getattr(_caller, 'cancel_event', None)
+    _caller.cancel_event = cancel_event
+    try:
+        yield
+    finally:
+        _caller.cancel_event = previous
+
+
+# Extra time a caller waits past a task's timeout for the worker to notice it
+_ABORT_GRACE_SECONDS = 30
+
 
+def _run_in_worker(func, *args, priority=PRIORITY_INTERACTIVE, timeout=300, deadline=None):
+    """Submit a task to the Playwright worker thread and wait for the result.
 
-def _run_in_worker(func, *args):
-    """Submit a task to the Playwright worker thread and wait for the result."""
+    ``timeout`` bounds the run time once the task has started; ``deadline``
+    (seconds from now) drops the task if the worker cannot start it in time.
+    If the calling thread is inside cancellable(), setting that event
+    cancels the task: immediately if still queued, at its next wait if
+    running.
+    """
     _ensure_worker()
-    result_event = threading.Event()
-    result_holder = {}
-    _task_queue.put((func, args, result_event, result_holder))
-    result_event.wait()
-    return result_holder.get('result', {'success': False, 'error': 'No result'})
+    task = _Task(func, args, priority, timeout,
+                 monotonic() + deadline if deadline is not None else None,
+                 getattr(_caller, 'cancel_event', None))
+    _task_queue.put((priority, next(_task_seq), task))
+
+    while not task.done.wait(0.5):
+        if task.cancel_event.is_set() and not task.started.is_set():
+            # The worker will skip it when it comes up
+            return {'success': False, 'error': 'Cancelled before it started'}
+        if task.run_deadline is not None and monotonic() > task.run_deadline + _ABORT_GRACE_SECONDS:
+            task.cancel_event.set()
+            logger.error(f"{func.__name__} did not finish within {timeout}s")
+            return {'success': False, 'error': f'Timed out after {timeout}s'}
+    return task.result if task.result is not None else {'success': False, 'error': 'No result'}
 
 
 # ===== Public API (thread-safe, callable from any thread) =====
 
+def _async_engine():
+    """The bot_async module when BOT_ENGINE=async, else None."""
+    if _engine() != 'async':
+        return None
+    import bot_async
+    return bot_async
+
+
 def post_to_x(text='', image_path='', scheduled_at=None):
     """Post or schedule on X. Returns dict with success, error, needs_manual_intervention keys."""
-    return _run_in_worker(_do_post, text, image_path, scheduled_at)
+    engine = _async_engine()
+    if engine:
+        return engine.post_to_x(text, image_path, scheduled_at)
+    return _run_in_worker(_do_post, text, image_path, scheduled_at, timeout=300)
+
+
+def post_many_timeout(count):
+    """Seconds post_many() may run for ``count`` items once it has started."""
+    return 120 + 180 * count
+
+
+def post_many(items, on_result=None):
+    """Post or schedule several items in a single login/browser session.
+
+    ``items`` is a list of dicts with text, image_path and scheduled_at keys.
+    Returns one result dict per item, in order. ``on_result(index, result)``
+    is called (from the worker thread) as each item finishes.
+    """
+    items = list(items)
+    if not items:
+        return []
+    engine = _async_engine()
+    if engine:
+        results = engine.post_many(items, on_result)
+        return [results] * len(items) if isinstance(results, dict) else results
+    results = _run_in_worker(_do_post_many, items, on_result,
+                             priority=PRIORITY_SCHEDULED, timeout=post_many_timeout(len(items)))
+    if isinstance(results, dict):
+        # The worker failed before producing per-item results
+        return [results] * len(items)
+    return results
 
 
 def test_connection():
     """Test X connection by checking login state. Returns dict."""
-    return _run_in_worker(_do_test_connection)
+    return _run_in_worker(_do_test_connection, timeout=120, deadline=60)
 
 
 def fetch_profile():
     """Fetch profile picture and info from X. Returns dict."""
-    return _run_in_worker(_do_fetch_profile)
+    return _run_in_worker(_do_fetch_profile, priority=PRIORITY_BACKGROUND, timeout=180)
+
+
+def prelaunch():
+    """Launch the browser in the background (PRELAUNCH_BROWSER) so the first
+    action after startup does not pay the cold start."""
+    engine = _async_engine()
+    if engine:
+        target = engine.prelaunch
+    else:
+        def target():
+            _run_in_worker(_do_prelaunch, priority=PRIORITY_BACKGROUND, timeout=120)
+    threading.Thread(target=target, daemon=True, name='browser-prelaunch').start()
 
 
 def restart_browser():
-    """Close the browser so it gets re-created with new settings on next use."""
-    return _run_in_worker(_do_close)
+    """Close the browsers so they get re-created with new settings on next use.
+
+    Each worker closes its browser within _BROWSER_CHECK_SECONDS (or after
+    its running task) and relaunches before its next task. Also picks up a
+    changed BROWSER_POOL_SIZE (the pool only grows until restart) and a
+    changed BOT_ENGINE: the engine giving up the Chrome profile closes it
+    before this returns, so the other one can open it.
+    """
+    global _browser_generation
+    _browser_generation += 1
+    _ensure_worker()
+    if _engine() == 'sync':
+        engine = sys.modules.get('bot_async')
+        if engine is not None:
+            engine.release()
+    elif not _profile_free.wait(_PROFILE_HANDOVER_SECONDS):
+        logger.warning("The sync worker still holds the Chrome profile; the async engine will wait for it")
+    return {'success': True}
 
 
 def delete_tweet(tweet_url):
     """Delete a tweet from X. Returns dict with success, error keys."""
-    return _run_in_worker(_do_delete_tweet, tweet_url)
+    engine = _async_engine()
+    if engine:
+        return engine.delete_tweet(tweet_url)
+    return _run_in_worker(_do_delete_tweet, tweet_url, timeout=180)
 
 
 def delete_scheduled_tweet(post_text):
     """Delete a scheduled tweet from X by matching text. Returns dict with success, error keys."""
-    return _run_in_worker(_do_delete_scheduled_tweet, post_text)
+    return _run_in_worker(_do_delete_scheduled_tweet, post_text, timeout=180)
+
+
+def delete_scheduled_tweets(post_texts):
+    """Cancel several scheduled tweets in one pass over X's Scheduled list.
+    Returns one dict with success, error keys per text, in order."""
+    post_texts = list(post_texts)
+    if not post_texts:
+        return []
+    results = _run_in_worker(_do_delete_scheduled_many, post_texts, timeout=120 + 60 * len(post_texts))
+    if isinstance(results, dict):
+        # The worker failed before producing per-item results
+        return [results] * len(post_texts)
+    return results
 
 
 def open_google_login():
     """Open Chrome in visible mode on Google login page. Returns dict."""
-    return _run_in_worker(_do_open_google_login)
+    return _run_in_worker(_do_open_google_login, priority=PRIORITY_BACKGROUND, timeout=360)
 
 
 def check_google_connected():
@@ -1477,10 +2379,46 @@ def check_google_connected():
 
 
 def close():
-    """Shutdown the Playwright worker thread and close browser."""
-    global _worker_started
+    """Shutdown the Playwright worker threads and close their browsers."""
     with _worker_lock:
-        if _worker_started:
-            _task_queue.put(None)
-            _worker_thread.join(timeout=10)
-            _worker_started = False
+        for _ in _worker_threads:
+            _task_queue.put((-1, next(_task_seq), None))
+        for thread in _worker_threads:
+            thread.join(timeout=10)
+        _worker_threads.clear()
+    if 'bot_async' in sys.modules:
+        sys.modules['bot_async'].close()
+    selector_cache.flush()
+
+
+def get_stats():
+    """Bot health metrics: selector hit/fallback counts, popup check cost,
+    time to first keystroke with and without a warmed compose page, page
+    load / bandwidth per operation with request blocking on and off, and
+    task queue depth and wait times per priority."""
+    with _stats_lock:
+        popup_stats = dict(_popup_stats)
+        compose_stats = {kind: dict(stats) for kind, stats in _compose_stats.items()}
+        queue_stats = {name: dict(stats) for name, stats in _queue_stats.items()}
+        net_stats = {key: dict(bucket) for key, bucket in _net_stats.items()}
+    return {
+        'selectors': selector_cache.get_stats(),
+        'popups': popup_stats,
+        'compose': {
+            kind: dict(stats, avg_seconds=round(stats['seconds'] / stats['posts'], 2) if stats['posts'] else 0)
+            for kind, stats in compose_stats.items()
+        },
+        'queue': {
+            'depth': _task_queue.qsize(),
+            'workers': len(_worker_threads),
+            'running': dict(_running),
+            'wait': {
+                name: dict(stats, avg_wait_seconds=round(stats['wait_seconds'] / stats['tasks'], 2) if stats['tasks'] else 0)
+                for name, stats in queue_stats.items()
+            },
+        },
+        'network': {
+            key: dict(bucket, avg_load_seconds=round(bucket['load_seconds'] / bucket['pages'], 2) if bucket['pages'] else 0)
+            for key, bucket in net_stats.items()
+        },
+    }
@@ -0,0 +1,649 @@
+"""Asyncio Playwright engine for the bot's hot paths (BOT_ENGINE=async).
+
+The sync engine in bot.py runs one operation per worker thread, and its
+human-like pauses block that thread. This engine runs posts, scheduled
+posts and tweet deletions as coroutines on one event loop: each operation
+gets its own page in a shared browser context, and every pause is an
+asyncio.sleep() during which the other operations make progress.
+
+Only the hot paths live here, on purpose. Profile fetch (a background
+refresh), scheduled-tweet cancellation (a rare, long page-state walk) and
+Google login (a visible window) gain nothing from concurrency, so they
+stay on the sync workers, which then leave the persistent Chrome profile
+to this engine and use the session it exports (see bot._uses_profile()).
+
+Each flow here follows its bot.py counterpart step by step. Everything
+but the awaits is shared: configuration, selectors, timeouts, text entry
+plan, toast and result handling all come from bot.py, so a change there
+applies to both engines.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+from datetime import datetime
+from random import uniform
+from time import monotonic
+
+import bot
+import metrics
+import selector_cache
+
+logger = logging.getLogger(__name__)
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+# Only touched from the event loop thread
+_playwright = None
+_context = None
+_browser_lock = None        # asyncio.Lock serialising launch and login
+_semaphore = None           # bounds concurrent pages (BOT_ASYNC_CONCURRENCY)
+_generation = None          # bot._browser_generation the browser was launched under
+_login_verified_at = None
+_inflight = 0
+_idle_since = None          # monotonic() time the last operation finished
+_warm_page = None           # idle page left on a loaded compose dialog
+_warm_page_at = None
+_warming = False
+
+# monotonic() time the current operation started (per asyncio task)
+_op_started = contextvars.ContextVar('op_started', default=None)
+
+
+def _concurrency():
+    return max(1, int(os.getenv('BOT_ASYNC_CONCURRENCY', '3')))
+
+
+def _ensure_loop():
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, daemon=True, name='playwright-async')
+            _loop_thread.start()
+    return _loop
+
+
+def _submit(coro, timeout):
+    """Run ``coro`` on the engine's loop and wait for its result dict.
+
+    Mirrors bot._run_in_worker(): the calling thread's bot.cancellable()
+    event cancels the operation, and ``timeout`` bounds its run time.
+    """
+    future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), _ensure_loop())
+    cancel_event = getattr(bot._caller, 'cancel_event', None)
+    while True:
+        try:
+            return future.result(timeout=0.5)
+        except (concurrent.futures.TimeoutError, asyncio.TimeoutError):
+            # Either our 0.5s poll or wait_for() giving up on the operation
+            if future.done():
+                return {'success': False, 'error': f'Timed out after {timeout}s'}
+        except concurrent.futures.CancelledError:
+            return {'success': False, 'error': 'Cancelled'}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        if cancel_event is not None and cancel_event.is_set():
+            future.cancel()
+
+
+# ===== Browser =====
+
+async def _close_browser():
+    global _playwright, _context, _login_verified_at, _warm_page
+    _login_verified_at = None
+    _warm_page = None
+    try:
+        if _context:
+            await _context.close()
+    except Exception:
+        pass
+    try:
+        if _playwright:
+            await _playwright.stop()
+    except Exception:
+        pass
+    if _context is not None or _playwright is not None:
+        bot._profile_free.set()
+    _playwright = None
+    _context = None
+
+
+async def _ensure_context():
+    global _playwright, _context, _generation, _browser_lock, _semaphore
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+        _semaphore = asyncio.Semaphore(_concurrency())
+    async with _browser_lock:
+        if _context is not None and _generation != bot._browser_generation:
+            logger.info("Settings changed, relaunching async browser")
+            await _close_browser()
+        if _context is not None:
+            return _context
+
+        from playwright.async_api import async_playwright
+        cfg = bot._get_config()
+        launch_kwargs = bot._launch_kwargs(cfg)
+        launch_kwargs['user_data_dir'] = bot._profile_path(cfg)
+        # The sync worker closes the profile after an engine switch; wait for it
+        await asyncio.get_running_loop().run_in_executor(None, bot._claim_profile)
+        try:
+            _playwright = await async_playwright().start()
+            logger.info(f"Launching async browser (headless={cfg['headless']}, profile={launch_kwargs['user_data_dir']})")
+            _context = await _playwright.chromium.launch_persistent_context(**launch_kwargs)
+        except Exception:
+            await _close_browser()
+            bot._profile_free.set()
+            raise
+        _generation = bot._browser_generation
+
+        cookies = bot._saved_cookies()
+        if cookies:
+            await _context.add_cookies(cookies)
+            logger.info(f"Loaded {len(cookies)} cookies from state.json")
+        return _context
+
+
+async def _new_page(operation):
+    """Open a stealth-patched page with ``operation``'s network policy."""
+    context = await _ensure_context()
+    page = await context.new_page()
+    await bot._stealth().apply_stealth_async(page)
+    groups = bot._policy_groups(operation)
+    if groups:
+        try:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send('Network.setBlockedURLs', {'urls': bot._blocked_urls(groups)})
+        except Exception as e:
+            logger.warning(f"Could not apply network policy '{operation}': {e}")
+    return page
+
+
+async def _close_if_idle():
+    if (_context is not None and _inflight == 0 and _idle_since is not None
+            and monotonic() - _idle_since >= bot._idle_timeout()):
+        logger.info(f"Closing async browser (visible mode, idle for {bot._idle_timeout()}s)")
+        await _close_browser()
+
+
+async def _warm_compose():
+    """Keep one logged-in page on a loaded compose dialog for the next post."""
+    global _warm_page, _warm_page_at, _warming
+    if (not bot._prewarm_enabled() or _context is None or _warm_page is not None or _warming
+            or _login_verified_at is None or monotonic() - _login_verified_at > bot._login_cache_ttl()):
+        return
+    _warming = True
+    try:
+        started = monotonic()
+        page = await _new_page('post')
+        await page.goto(bot._x_url(bot.COMPOSE_PATH), wait_until='domcontentloaded')
+        if await _wait(page, bot._COMPOSE_TEXTAREA, timeout=10000) and not bot._is_login_url(page.url):
+            _warm_page, _warm_page_at = page, monotonic()
+            logger.info(f"Compose page warmed in {monotonic() - started:.1f}s")
+        else:
+            await page.close()
+    except Exception as e:
+        logger.warning(f"Could not warm compose page: {e}")
+    finally:
+        _warming = False
+
+
+async def _take_warm_page():
+    """The warmed compose page if it is still fresh, else None (closed)."""
+    global _warm_page
+    page, _warm_page = _warm_page, None
+    if page is None:
+        return None
+    if (monotonic() - _warm_page_at <= bot._COMPOSE_MAX_AGE_SECONDS and not page.is_closed()
+            and '/compose/' in page.url and await _wait(page, bot._COMPOSE_TEXTAREA, timeout=1000)):
+        return page
+    try:
+        await page.close()
+    except Exception:
+        pass
+    return None
+
+
+async def _finish_operation():
+    """Re-warm the compose page, and in visible mode close the browser once
+    it has been unused for the idle timeout."""
+    global _idle_since
+    if _inflight:
+        return
+    asyncio.ensure_future(_warm_compose())
+    if bot._headless():
+        return
+    _idle_since = monotonic()
+    if bot._idle_timeout() == 0:
+        await _close_if_idle()
+    else:
+        # A later operation moves _idle_since on, so this check then does nothing
+        asyncio.get_running_loop().call_later(
+            bot._idle_timeout(), lambda: asyncio.ensure_future(_close_if_idle()))
+
+
+async def _run_operation(operation, body, *args):
+    """Run ``body(page, *args)`` on its own page, bounded by the semaphore."""
+    global _inflight
+    await _ensure_context()
+    async with _semaphore:
+        _inflight += 1
+        _op_started.set(monotonic())
+        page = None
+        # Same operation and step metrics as the sync worker (see metrics.py)
+        with metrics.operation(operation, log=logger) as timer:
+            try:
+                if operation == 'post':
+                    page = await _take_warm_page()
+                if page is not None:
+                    return timer.set_result(await body(page, *args, warm=True))
+                with metrics.span('browser'):
+                    page = await _new_page(operation)
+                with metrics.span('login'):
+                    login_result = await _login(page)
+                if not login_result['success']:
+                    return timer.set_result(login_result)
+                return timer.set_result(await body(page, *args))
+            except asyncio.CancelledError:
+                timer.outcome = 'aborted'
+                raise
+            except Exception as e:
+                logger.error(f"{operation} error: {e}")
+                timer.outcome = 'exception'
+                return {'success': False, 'error': str(e)}
+            finally:
+                _inflight -= 1
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                await _finish_operation()
+
+
+# ===== Page helpers =====
+
+async def _wait(page, selector, timeout=8000):
+    try:
+        return await page.wait_for_selector(selector, timeout=timeout)
+    except Exception:
+        return None
+
+
+async def _human_delay(low=1.0, high=2.5):
+    """Human-like pause that lets the loop's other operations run."""
+    await asyncio.sleep(uniform(low, high))
+
+
+async def _find(page, name, timeout):
+    return await selector_cache.find_async(page, name, bot._SELECTORS[name], timeout=timeout)
+
+
+async def _dismiss_popups(page, timeout=1500):
+    """Same as bot._dismiss_popups()."""
+    started = monotonic()
+    dismissed = 0
+    wait = timeout
+    for _ in range(3):
+        try:
+            btn = await page.wait_for_selector(bot._POPUP_SELECTOR, timeout=wait)
+        except Exception:
+            break
+        if not btn:
+            break
+        try:
+            await btn.click()
+            dismissed += 1
+            await _human_delay(0.5, 1)
+        except Exception:
+            break
+        wait = 500
+    bot._record_popup_check(dismissed, monotonic() - started)
+    return dismissed
+
+
+async def _has_auth_cookie():
+    try:
+        return any(c.get('name') == 'auth_token' for c in await _context.cookies(bot._x_url()))
+    except Exception:
+        return False
+
+
+async def _logged_in():
+    """Record a verified login and export the session for the sync workers,
+    which run the tasks this engine does not (profile fetch, cancellations)."""
+    global _login_verified_at
+    _login_verified_at = monotonic()
+    try:
+        await _context.storage_state(path=bot.POOL_STATE_PATH)
+    except Exception as e:
+        logger.warning(f"Could not export session for the sync workers: {e}")
+    return {'success': True}
+
+
+async def _login(page):
+    """Same checks as bot._login(); concurrent operations share one login."""
+    if (_login_verified_at is not None
+            and monotonic() - _login_verified_at <= bot._login_cache_ttl()
+            and await _has_auth_cookie()):
+        return {'success': True}
+
+    async with _browser_lock:
+        # Another operation may have logged in while we waited
+        if _login_verified_at is not None and monotonic() - _login_verified_at <= bot._login_cache_ttl():
+            return {'success': True}
+
+        cfg = bot._get_config()
+        logger.info("Navigating to X home to check login state...")
+        await page.goto(bot._x_url("/home"), wait_until='domcontentloaded')
+        await _dismiss_popups(page)
+        if not bot._is_login_url(page.url):
+            logger.info("Already logged in")
+            return await _logged_in()
+
+        logger.info("Login required, starting login flow...")
+        for attempt in range(bot._LOGIN_ATTEMPTS):
+            try:
+                await page.wait_for_load_state('networkidle', timeout=15000)
+                await _human_delay(1, 2)
+
+                username_input = await _wait(page, bot._LOGIN_USERNAME_INPUT, timeout=8000)
+                if username_input:
+                    await username_input.click()
+                    await _human_delay(0.3, 0.6)
+                    await username_input.fill('')
+                    await page.keyboard.type(cfg['username'], delay=uniform(30, 70))
+                    await _human_delay(0.5, 1)
+                    next_btn = await _find(page, 'login_next_button', timeout=5000)
+                    if next_btn:
+                        await next_btn.click()
+                        await _human_delay(0.3, 0.5)
+
+                if await _find(page, 'login_checkpoint', timeout=2000):
+                    logger.warning("Checkpoint detected - manual intervention needed")
+                    return bot._login_blocked('checkpoint')
+
+                if await _wait(page, bot._LOGIN_EXTRA_INPUT, timeout=3000):
+                    logger.warning("Extra verification step detected (phone/email)")
+                    return bot._login_blocked('verification')
+
+                password_input = await _wait(page, bot._LOGIN_PASSWORD_INPUT, timeout=8000)
+                if password_input:
+                    await password_input.click()
+                    await _human_delay(0.3, 0.6)
+                    await page.keyboard.type(cfg['password'], delay=uniform(30, 70))
+                    await _human_delay(0.5, 1)
+                    login_btn = await _find(page, 'login_button', timeout=5000)
+                    if login_btn:
+                        await login_btn.click()
+                        try:
+                            await page.wait_for_load_state('networkidle', timeout=10000)
+                        except Exception:
+                            pass
+                        await _human_delay(0.3, 0.5)
+
+                await _dismiss_popups(page)
+                if await _find(page, 'logged_in_marker', timeout=5000):
+                    logger.info("Login successful")
+                    return await _logged_in()
+
+                if await _wait(page, bot._LOGIN_IDENTITY_CHECK, timeout=2000):
+                    return bot._login_blocked('identity')
+
+            except Exception as e:
+                logger.error(f"Login attempt {attempt + 1} failed: {e}")
+                if attempt < bot._LOGIN_ATTEMPTS - 1:
+                    await _human_delay(1, 2)
+                    await page.goto(bot._x_url("/home"), wait_until='domcontentloaded')
+                    try:
+                        await page.wait_for_load_state('networkidle', timeout=10000)
+                    except Exception:
+                        pass
+
+        return {'success': False, 'error': bot._LOGIN_FAILED}
+
+
+# ===== Posting =====
+
+async def _enter_text(page, text):
+    """Same strategies as bot._enter_text() (TEXT_INPUT_MODE)."""
+    mode, prefix, rest = bot._text_entry_plan(text)
+    started = monotonic()
+    if prefix:
+        await page.keyboard.type(prefix, delay=uniform(20, 50))
+    if rest:
+        await page.keyboard.insert_text(rest)
+    logger.info(f"Entered {len(text)} chars in {monotonic() - started:.1f}s ({mode})")
+
+
+async def _compose_post(page, text, image_path, scheduled_at=None, warm=False):
+    """``warm``: page is a pre-loaded compose dialog (see _warm_compose)."""
+    with metrics.span('open compose'):
+        if not warm:
+            await page.goto(bot._x_url(bot.COMPOSE_PATH), wait_until='domcontentloaded')
+        text_input = await _wait(page, bot._COMPOSE_TEXTAREA, timeout=10000) if text else None
+
+    if text:
+        if not text_input:
+            return {'success': False, 'error': 'Could not find tweet text area'}
+        await text_input.click()
+        await _human_delay(0.3, 0.5)
+        bot._record_first_keystroke(warm, monotonic() - (_op_started.get() or monotonic()))
+        with metrics.span('type'):
+            await _enter_text(page, text)
+        await _human_delay(0.3, 0.5)
+
+    if image_path and os.path.isfile(image_path):
+        with metrics.span('upload'):
+            file_input = await _find(page, 'compose_file_input', timeout=3000)
+            if not file_input:
+                return {'success': False, 'error': 'Could not find file input for media upload'}
+            logger.info(f"Uploading image: {os.path.basename(image_path)}")
+            await file_input.set_input_files(image_path)
+            await _wait(page, bot._ATTACHMENTS, timeout=15000)
+            await _human_delay(0.3, 0.5)
+
+    if scheduled_at:
+        with metrics.span('schedule dialog'):
+            schedule_result = await _schedule_on_x(page, scheduled_at)
+        if not schedule_result['success']:
+            return schedule_result
+    with metrics.span('publish'):
+        return await _click_post(page)
+
+
+async def _click_post(page):
+    """Same checks as bot._click_post()."""
+    post_btn = await _find(page, 'post_button', timeout=5000)
+    if not post_btn:
+        return {'success': False, 'error': 'Could not find Post button'}
+
+    for _ in range(bot._POST_BUTTON_POLLS):
+        if await post_btn.get_attribute('aria-disabled') != 'true':
+            break
+        await asyncio.sleep(0.5)
+    else:
+        return {'success': False, 'error': bot._POST_BUTTON_DISABLED}
+
+    await post_btn.scroll_into_view_if_needed()
+    await _human_delay(0.2, 0.4)
+    await post_btn.click(timeout=10000)
+
+    toast_el = await _wait(page, bot._TOAST, timeout=10000)
+    if toast_el:
+        href = None
+        try:
+            view_link = await toast_el.query_selector('a[href*="/status/"]')
+            if view_link:
+                href = await view_link.get_attribute('href')
+        except Exception as e:
+            logger.warning(f"Could not capture tweet URL from toast: {e}")
+        return bot._post_toast_result(await toast_el.inner_text(), href)
+
+    return bot._post_without_toast(await _wait(page, bot._COMPOSE_TEXTAREA, timeout=2000) is not None)
+
+
+async def _schedule_on_x(page, scheduled_at):
+    try:
+        dt = datetime.fromisoformat(scheduled_at)
+    except (ValueError, TypeError) as e:
+        return {'success': False, 'error': f'Invalid scheduled_at date: {e}'}
+
+    logger.info(f"Scheduling post on X for {dt.isoformat()}")
+    schedule_btn = await _find(page, 'schedule_button', timeout=4000)
+    if not schedule_btn:
+        return {'success': False, 'error': 'Could not find Schedule button in compose toolbar'}
+
+    await schedule_btn.scroll_into_view_if_needed()
+    await _human_delay(0.3, 0.6)
+    await schedule_btn.click()
+    await _wait(page, 'select', timeout=8000)
+    await _human_delay(0.5, 1)
+
+    selects = await page.query_selector_all('select')
+    options = [await page.evaluate(bot._SELECT_OPTIONS_JS, sel) for sel in selects]
+    roles = bot._select_roles(options)
+
+    for role, attempts in bot._schedule_choices(dt, {role: options[i] for role, i in roles.items()}):
+        for kwargs in attempts:
+            try:
+                await selects[roles[role]].select_option(**kwargs)
+                break
+            except Exception:
+                continue
+        else:
+            logger.warning(f"Failed to set {role}")
+        await _human_delay(0.3, 0.5)
+
+    bot._log_schedule_set(dt, roles)
+    await _human_delay(0.5, 1)
+    confirm_btn = await _find(page, 'schedule_confirm_button', timeout=3000)
+    if not confirm_btn:
+        return {'success': False, 'error': 'Could not find Confirm button in schedule dialog'}
+    await confirm_btn.click()
+    await _human_delay(0.3, 0.5)
+    logger.info("Schedule confirmed, clicking Schedule button")
+    return {'success': True}
+
+
+# ===== Deleting =====
+
+async def _delete_tweet(page, tweet_url):
+    logger.info(f"Navigating to tweet: {tweet_url}")
+    await page.goto(tweet_url, wait_until='domcontentloaded')
+    await _human_delay(1, 2)
+    await _dismiss_popups(page)
+
+    if not await _wait(page, bot._TWEET_ARTICLE, timeout=10000):
+        if await _find(page, 'tweet_deleted_notice', timeout=2000):
+            logger.info("Tweet already deleted")
+            return {'success': True, 'already_deleted': True}
+        return {'success': False, 'error': 'Tweet not found'}
+
+    more_btn = await _find(page, 'tweet_more_button', timeout=3000)
+    if not more_btn:
+        return {'success': False, 'error': 'Could not find More button on tweet'}
+    await more_btn.click()
+    await _human_delay(0.5, 1)
+
+    delete_option = await _find(page, 'tweet_delete_menuitem', timeout=3000)
+    if not delete_option:
+        await page.keyboard.press('Escape')
+        return {'success': False, 'error': 'Could not find Delete option in menu'}
+    await delete_option.click()
+    await _human_delay(0.5, 1)
+
+    confirm_btn = await _find(page, 'tweet_delete_confirm', timeout=3000)
+    if not confirm_btn:
+        return {'success': False, 'error': 'Could not find confirmation button'}
+    await confirm_btn.click()
+    await _human_delay(1, 2)
+
+    toast_el = await _wait(page, bot._TOAST, timeout=5000)
+    if toast_el and bot._delete_confirmed_by_toast(await toast_el.inner_text()):
+        return {'success': True}
+
+    await _human_delay(0.5, 1)
+    if '/status/' not in page.url:
+        logger.info("Tweet deleted successfully (redirected away)")
+        return {'success': True}
+    if not await _wait(page, bot._TWEET_ARTICLE, timeout=2000):
+        logger.info("Tweet deleted successfully (tweet disappeared)")
+        return {'success': True}
+
+    logger.warning("Tweet deletion status uncertain")
+    return {'success': True}
+
+
+# ===== Public API (same contract as the bot.py facade) =====
+
+def post_to_x(text='', image_path='', scheduled_at=None):
+    return _submit(_run_operation('post', _compose_post, text, image_path, scheduled_at), timeout=300)
+
+
+def post_many(items, on_result=None):
+    """Post every item concurrently (up to BOT_ASYNC_CONCURRENCY pages)."""
+    async def _one(index, item):
+        result = await _run_operation('post', _compose_post, item.get('text', ''),
+                                      item.get('image_path', ''), item.get('scheduled_at'))
+        if on_result:
+            try:
+                on_result(index, result)
+            except Exception as e:
+                logger.error(f"post_many result callback failed for item {index}: {e}")
+        return result
+
+    async def _all():
+        return list(await asyncio.gather(*(_one(i, item) for i, item in enumerate(items))))
+
+    logger.info(f"Posting {len(items)} item(s) on the async engine")
+    return _submit(_all(), timeout=bot.post_many_timeout(len(items)))
+
+
+def delete_tweet(tweet_url):
+    if not tweet_url or '/status/' not in tweet_url:
+        return {'success': False, 'error': 'Invalid tweet URL'}
+    return _submit(_run_operation('delete', _delete_tweet, tweet_url), timeout=180)
+
+
+def prelaunch():
+    """Launch the async browser now; it is then kept like after an operation."""
+    async def _launch():
+        started = monotonic()
+        await _ensure_context()
+        logger.info(f"Async browser pre-launched in {monotonic() - started:.1f}s")
+        await _finish_operation()
+        return {'success': True}
+    return _submit(_launch(), timeout=120)
+
+
+def release():
+    """Close the async browser (keeping the loop) so the sync workers can
+    open the Chrome profile again, e.g. after switching BOT_ENGINE to sync."""
+    with _loop_lock:
+        loop = _loop
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_browser(), loop).result(timeout=30)
+    except Exception as e:
+        logger.warning(f"Could not close the async browser: {e}")
+
+
+def close():
+    """Close the async browser and stop the loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_close_browser(), _loop).result(timeout=10)
+        except Exception:
+            pass
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop = None
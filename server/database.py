@@ -1,96 +1,262 @@
 import sqlite3
+import json
 import os
-from datetime import datetime
-
+import logging
+import queue
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from time import monotonic
+
+import events
+import metrics
 from paths import DB_PATH
 
+logger = logging.getLogger(__name__)
 
-def get_connection():
+# Connections are opened once and recycled through a small bounded pool.
+# Flask serves each request on its own thread, so a per-thread cache would
+# still reconnect on every request; the pool hands an idle connection to
+# whichever thread asks next (one thread at a time per connection).
+POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000
+
+# Identifies this process in the lease tokens of the posts it is sending to X
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+# How long a claimed post stays reserved before it is considered abandoned
+LEASE_SECONDS = 30 * 60
+
+_pool = queue.LifoQueue()
+_pool_slots = threading.BoundedSemaphore(POOL_SIZE)
+
+
+class _TimedConnection(sqlite3.Connection):
+    """Records how long each statement and commit takes, by statement kind
+    (select, insert, update, commit...), in the xpm_db_query_seconds metric."""
+
+    def execute(self, sql, *args):
+        started = monotonic()
+        try:
+            return super().execute(sql, *args)
+        finally:
+            kind = sql.split(None, 1)[0].lower() if sql.strip() else 'other'
+            metrics.observe('xpm_db_query_seconds', monotonic() - started, statement=kind)
+
+    def commit(self):
+        started = monotonic()
+        try:
+            super().commit()
+        finally:
+            metrics.observe('xpm_db_query_seconds', monotonic() - started, statement='commit')
+
+
+metrics.describe('xpm_db_query_seconds', 'SQLite statement execution time, by statement kind.')
+metrics.describe('xpm_db_pool_wait_seconds', 'Time spent waiting for a pooled SQLite connection.')
+
+
+def _open_connection():
+    """Open a new SQLite connection and apply the per-connection PRAGMAs once."""
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False,
+                           factory=_TimedConnection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA cache_size=-8000")  # ~8 MB page cache
+    conn.execute("PRAGMA mmap_size=67108864")  # 64 MB memory-mapped I/O
     return conn
 
 
-def init_db():
-    conn = get_connection()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS posts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            text TEXT DEFAULT '',
-            image_path TEXT DEFAULT '',
-            scheduled_at TEXT,
-            status TEXT DEFAULT 'draft' CHECK(status IN ('draft','scheduled','scheduling','scheduled_on_x','posting','posted','error')),
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL,
-            posted_at TEXT,
-            error_message TEXT DEFAULT '',
-            retries_count INTEGER DEFAULT 0,
-            tweet_url TEXT DEFAULT ''
-        )
-    ''')
-    conn.commit()
-
-    # Migrate: add tweet_url column if missing
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection for the duration of the ``with`` block.
+
+    Any transaction left open by the caller is rolled back before the
+    connection goes back to the pool. Use ``transaction()`` for writes.
+    """
+    started = monotonic()
+    _pool_slots.acquire()
+    metrics.observe('xpm_db_pool_wait_seconds', monotonic() - started)
+    conn = None
     try:
-        cur = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='posts'")
-        row = cur.fetchone()
-        if row and 'tweet_url' not in (row[0] or ''):
-            conn.execute("ALTER TABLE posts ADD COLUMN tweet_url TEXT DEFAULT ''")
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            conn = _open_connection()
+        yield conn
+    finally:
+        if conn is not None:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                _pool.put(conn)
+            except sqlite3.Error:
+                conn.close()
+        _pool_slots.release()
+
+
+@contextmanager
+def transaction():
+    """Borrow a pooled connection and commit on success, roll back on error."""
+    with get_connection() as conn:
+        try:
+            yield conn
             conn.commit()
-    except Exception:
-        pass
+        except Exception:
+            conn.rollback()
+            raise
+
+
+def close_all():
+    """Close every idle pooled connection (used at shutdown)."""
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+STATUSES = ('draft', 'scheduled', 'scheduling', 'scheduled_on_x', 'posting', 'posted', 'error')
+
+# Date a post is filed under (calendar, date-range filters); other statuses use scheduled_at
+DATE_COLUMN_BY_STATUS = {'draft': 'created_at', 'posted': 'posted_at'}
+
+POST_COLUMNS = (
+    'id', 'text', 'image_path', 'scheduled_at', 'status', 'created_at', 'updated_at',
+    'posted_at', 'error_message', 'retries_count', 'tweet_url', 'next_attempt_at',
+    'lease_owner', 'lease_expires_at',
+)
+
+_CREATE_POSTS = '''
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        text TEXT DEFAULT '',
+        image_path TEXT DEFAULT '',
+        scheduled_at TEXT,
+        status TEXT DEFAULT 'draft' CHECK(status IN ('draft','scheduled','scheduling','scheduled_on_x','posting','posted','error')),
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        posted_at TEXT,
+        error_message TEXT DEFAULT '',
+        retries_count INTEGER DEFAULT 0,
+        tweet_url TEXT DEFAULT ''
+    )
+'''
+
+_CREATE_FOLLOWERS_HISTORY = '''
+    CREATE TABLE followers_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        followers_count INTEGER DEFAULT 0,
+        following_count INTEGER DEFAULT 0,
+        recorded_at TEXT NOT NULL,
+        username TEXT DEFAULT ''
+    )
+'''
+
+
+def _table_columns(conn, table):
+    return [row['name'] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _migrate_v1_baseline(conn):
+    """Create the tables, or bring a database from before schema versioning up to date."""
+    posts_columns = _table_columns(conn, 'posts')
+    if not posts_columns:
+        conn.execute(_CREATE_POSTS)
+    else:
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='posts'").fetchone()
+        if 'scheduling' not in row['sql']:
+            # The CHECK constraint predates 'scheduling'/'scheduled_on_x': rebuild the table
+            copied = ', '.join(c for c in POST_COLUMNS if c in posts_columns)
+            conn.execute('ALTER TABLE posts RENAME TO posts_old')
+            conn.execute(_CREATE_POSTS)
+            conn.execute(f'INSERT INTO posts ({copied}) SELECT {copied} FROM posts_old')
+            conn.execute('DROP TABLE posts_old')
+        elif 'tweet_url' not in posts_columns:
+            conn.execute("ALTER TABLE posts ADD COLUMN tweet_url TEXT DEFAULT ''")
+
+    followers_columns = _table_columns(conn, 'followers_history')
+    if not followers_columns:
+        conn.execute(_CREATE_FOLLOWERS_HISTORY)
+    elif 'username' not in followers_columns:
+        conn.execute("ALTER TABLE followers_history ADD COLUMN username TEXT DEFAULT ''")
+
+
+def _migrate_v2_indexes(conn):
+    """Indexes backing the status listings, the scheduler queue and the followers chart."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_created ON posts (status, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_scheduled ON posts (status, scheduled_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_followers_username_recorded ON followers_history (username, recorded_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_followers_recorded ON followers_history (recorded_at)')
+
+
+def _migrate_v3_posted_index(conn):
+    """Index for date-range queries over published posts."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_posted ON posts (status, posted_at)')
 
-    # Migrate: if the CHECK constraint is missing 'scheduling'/'scheduled_on_x', recreate the table
-    try:
-        cur = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='posts'")
-        row = cur.fetchone()
-        if row and 'scheduling' not in (row[0] or ''):
-            conn.executescript('''
-                ALTER TABLE posts RENAME TO posts_old;
-                CREATE TABLE posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    text TEXT DEFAULT '',
-                    image_path TEXT DEFAULT '',
-                    scheduled_at TEXT,
-                    status TEXT DEFAULT 'draft' CHECK(status IN ('draft','scheduled','scheduling','scheduled_on_x','posting','posted','error')),
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    posted_at TEXT,
-                    error_message TEXT DEFAULT '',
-                    retries_count INTEGER DEFAULT 0,
-                    tweet_url TEXT DEFAULT ''
-                );
-                INSERT INTO posts (id, text, image_path, scheduled_at, status, created_at, updated_at, posted_at, error_message, retries_count)
-                    SELECT id, text, image_path, scheduled_at, status, created_at, updated_at, posted_at, error_message, retries_count FROM posts_old;
-                DROP TABLE posts_old;
-            ''')
-    except Exception:
-        pass
 
+def _migrate_v4_next_attempt(conn):
+    """Retry backoff: a failed 'scheduled' post is not picked up again before next_attempt_at."""
+    conn.execute('ALTER TABLE posts ADD COLUMN next_attempt_at TEXT')
+
+
+def _migrate_v5_leases(conn):
+    """Lease columns for atomic claiming of posts being sent to X."""
+    conn.execute('ALTER TABLE posts ADD COLUMN lease_owner TEXT')
+    conn.execute('ALTER TABLE posts ADD COLUMN lease_expires_at TEXT')
+
+
+def _migrate_v6_jobs(conn):
+    """Background jobs (post now, delete from X, profile fetch...) and their results."""
     conn.execute('''
-        CREATE TABLE IF NOT EXISTS followers_history (
+        CREATE TABLE IF NOT EXISTS jobs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            followers_count INTEGER DEFAULT 0,
-            following_count INTEGER DEFAULT 0,
-            recorded_at TEXT NOT NULL,
-            username TEXT DEFAULT ''
+            kind TEXT NOT NULL,
+            post_id INTEGER,
+            status TEXT NOT NULL DEFAULT 'queued'
+                CHECK(status IN ('queued', 'running', 'done', 'error')),
+            result TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT
         )
     ''')
-    conn.commit()
 
-    # Migrate: add username column to followers_history if missing
-    try:
-        cur = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='followers_history'")
-        row = cur.fetchone()
-        if row and 'username' not in (row[0] or ''):
-            conn.execute("ALTER TABLE followers_history ADD COLUMN username TEXT DEFAULT ''")
-            conn.commit()
-    except Exception:
-        pass
 
-    conn.close()
+# Ordered schema migrations. The database's PRAGMA user_version records how
+# many have been applied; append new steps, never edit or reorder old ones.
+MIGRATIONS = [
+    _migrate_v1_baseline,
+    _migrate_v2_indexes,
+    _migrate_v3_posted_index,
+    _migrate_v4_next_attempt,
+    _migrate_v5_leases,
+    _migrate_v6_jobs,
+]
+
+
+def init_db():
+    """Apply any pending schema migrations, each one in its own transaction."""
+    with get_connection() as conn:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {target}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            logger.info(f"Database migrated to schema version {target} ({migration.__name__})")
 
 
 def _row_to_dict(row):
@@ -99,67 +265,137 @@ def _row_to_dict(row):
     return dict(row)
 
 
+def _post_changed(post_id, action, status=None):
+    """Tell connected UI clients (see events.py) that a post changed."""
+    events.publish('post', {'id': post_id, 'action': action, 'status': status})
+
+
 def create_post(text='', image_path='', scheduled_at=None, status='draft'):
     now = datetime.now().isoformat()
-    conn = get_connection()
-    cur = conn.execute(
-        '''INSERT INTO posts (text, image_path, scheduled_at, status, created_at, updated_at)
-           VALUES (?, ?, ?, ?, ?, ?)''',
-        (text, image_path, scheduled_at, status, now, now)
-    )
-    post_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cur = conn.execute(
+            '''INSERT INTO posts (text, image_path, scheduled_at, status, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (text, image_path, scheduled_at, status, now, now)
+        )
+        post_id = cur.lastrowid
+    _post_changed(post_id, 'created', status)
     return post_id
 
 
 def get_post(post_id):
-    conn = get_connection()
-    row = conn.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
-    conn.close()
+    with get_connection() as conn:
+        row = conn.execute('SELECT * FROM posts WHERE id = ?', (post_id,)).fetchone()
     return _row_to_dict(row)
 
 
-def get_posts_by_status(status):
-    conn = get_connection()
-    rows = conn.execute(
-        'SELECT * FROM posts WHERE status = ? ORDER BY created_at DESC', (status,)
-    ).fetchall()
-    conn.close()
+def get_next_attempt_at():
+    """Earliest future retry time among 'scheduled' posts, or None."""
+    now = datetime.now().isoformat()
+    with get_connection() as conn:
+        row = conn.execute(
+            '''SELECT MIN(next_attempt_at) FROM posts
+               WHERE status = 'scheduled' AND next_attempt_at > ?''',
+            (now,)
+        ).fetchone()
+    return row[0]
+
+
+def _date_column(status):
+    """Column a post with this status is filed under in date-range queries."""
+    return DATE_COLUMN_BY_STATUS.get(status, 'scheduled_at')
+
+
+def _post_filters(statuses=None, date_from=None, date_to=None):
+    """Build the WHERE terms shared by list_posts() and count_posts().
+
+    The date range (``date_from`` inclusive, ``date_to`` exclusive, ISO strings)
+    applies to each post's own date column, so it is expanded into one
+    ``status IN (...) AND <column> range`` branch per column.
+    """
+    where, params = [], []
+    if date_from or date_to:
+        by_column = {}
+        for status in statuses or STATUSES:
+            by_column.setdefault(_date_column(status), []).append(status)
+        branches = []
+        for column, group in by_column.items():
+            terms = [f"status IN ({', '.join('?' * len(group))})"]
+            params.extend(group)
+            if date_from:
+                terms.append(f'{column} >= ?')
+                params.append(date_from)
+            if date_to:
+                terms.append(f'{column} < ?')
+                params.append(date_to)
+            branches.append('(' + ' AND '.join(terms) + ')')
+        where.append('(' + ' OR '.join(branches) + ')')
+    elif statuses:
+        where.append(f"status IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    return where, params
+
+
+def list_posts(statuses=None, date_from=None, date_to=None, limit=None, after=None, fields=None):
+    """List posts newest first, keyset-paginated on (created_at, id).
+
+    ``statuses`` and the ``date_from``/``date_to`` range filter the posts (see
+    ``_post_filters``). ``after`` is the ``(created_at, id)`` of the last post
+    of the previous page. ``fields`` restricts the selected columns; ``id``
+    and ``created_at`` are always included because the cursor is built from them.
+    """
+    columns = '*'
+    if fields:
+        columns = ', '.join(dict.fromkeys(['id', 'created_at', *fields]))
+    where, params = _post_filters(statuses, date_from, date_to)
+    if after:
+        where.append('(created_at, id) < (?, ?)')
+        params.extend(after)
+    sql = f'SELECT {columns} FROM posts'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += ' ORDER BY created_at DESC, id DESC'
+    if limit:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
     return [_row_to_dict(r) for r in rows]
 
 
-def get_pending_scheduled():
-    """Get posts with status 'scheduled' that need to be sent to X for native scheduling."""
-    conn = get_connection()
-    rows = conn.execute(
-        '''SELECT * FROM posts
-           WHERE status = 'scheduled'
-           ORDER BY scheduled_at ASC'''
-    ).fetchall()
-    conn.close()
-    return [_row_to_dict(r) for r in rows]
+def count_posts(statuses=None, date_from=None, date_to=None):
+    where, params = _post_filters(statuses, date_from, date_to)
+    sql = 'SELECT COUNT(*) FROM posts'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    with get_connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+    return row[0]
 
 
-def get_all_posts():
-    conn = get_connection()
-    rows = conn.execute('SELECT * FROM posts ORDER BY created_at DESC').fetchall()
-    conn.close()
-    return [_row_to_dict(r) for r in rows]
+_UPDATABLE_FIELDS = {
+    'text', 'image_path', 'scheduled_at', 'status', 'error_message', 'retries_count', 'posted_at', 'tweet_url',
+    'next_attempt_at',
+}
+
+
+def _updatable_fields(kwargs):
+    fields = {k: v for k, v in kwargs.items() if k in _UPDATABLE_FIELDS}
+    if fields.get('status') == 'posted' and 'posted_at' not in fields:
+        fields['posted_at'] = datetime.now().isoformat()
+    return fields
 
 
 def update_post(post_id, **kwargs):
-    allowed = {'text', 'image_path', 'scheduled_at', 'status', 'error_message', 'retries_count', 'posted_at', 'tweet_url'}
-    fields = {k: v for k, v in kwargs.items() if k in allowed}
+    fields = _updatable_fields(kwargs)
     if not fields:
         return False
     fields['updated_at'] = datetime.now().isoformat()
     set_clause = ', '.join(f'{k} = ?' for k in fields)
     values = list(fields.values()) + [post_id]
-    conn = get_connection()
-    conn.execute(f'UPDATE posts SET {set_clause} WHERE id = ?', values)
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(f'UPDATE posts SET {set_clause} WHERE id = ?', values)
+    _post_changed(post_id, 'updated', fields.get('status'))
     return True
 
 
@@ -167,40 +403,254 @@ def update_post_status(post_id, status, error_message=None):
     kwargs = {'status': status}
     if error_message is not None:
         kwargs['error_message'] = error_message
-    if status == 'posted':
-        kwargs['posted_at'] = datetime.now().isoformat()
     return update_post(post_id, **kwargs)
 
 
-def delete_post(post_id):
-    conn = get_connection()
-    conn.execute('DELETE FROM posts WHERE id = ?', (post_id,))
-    conn.commit()
-    conn.close()
-    return True
+# --- Leases ---
+#
+# A post being sent to X ('scheduling' / 'posting') is leased: the claim that
+# flips its status also records who owns it and until when, in a single
+# UPDATE ... RETURNING, so two workers can never both pick the same post.
+# The owner is a token unique to that claim, returned as the post's
+# lease_owner: scheduler passes, jobs and bot workers all share one process,
+# so only the claim itself may extend the lease or record the result. It
+# clears the lease with release_post() when X answers. Deleting a post from
+# X claims it too, keeping its status, so nothing else picks it meanwhile. A lease
+# must outlive the work done under it: once it expires, claim_post() and
+# reclaim_expired_leases() treat the post as abandoned. Work that can run
+# longer than LEASE_SECONDS (a batch) extends it with extend_leases().
 
+def _lease_token():
+    return f'{WORKER_ID}:{uuid.uuid4().hex}'
 
-def add_follower_snapshot(followers_count, following_count, username=''):
-    now = datetime.now().isoformat()
-    conn = get_connection()
-    conn.execute(
-        'INSERT INTO followers_history (followers_count, following_count, recorded_at, username) VALUES (?, ?, ?, ?)',
-        (followers_count, following_count, now, username)
-    )
-    conn.commit()
-    conn.close()
 
+def _lease(lease_seconds):
+    now = datetime.now()
+    return now.isoformat(), (now + timedelta(seconds=lease_seconds)).isoformat()
 
-def get_follower_history(username=None):
-    conn = get_connection()
-    if username:
+
+def claim_pending_scheduled(limit=None, lease_seconds=LEASE_SECONDS):
+    """Atomically move due 'scheduled' posts to 'scheduling' under a lease and return them.
+
+    Posts waiting out a retry backoff (next_attempt_at in the future) or
+    leased by another action (e.g. a delete) are skipped. The posts share one lease token, their ``lease_owner``.
+    """
+    owner = _lease_token()
+    now, expires = _lease(lease_seconds)
+    with transaction() as conn:
+        rows = conn.execute(
+            '''UPDATE posts
+               SET status = 'scheduling', lease_owner = ?, lease_expires_at = ?, updated_at = ?
+               WHERE id IN (
+                   SELECT id FROM posts
+                   WHERE status = 'scheduled'
+                     AND (next_attempt_at IS NULL OR next_attempt_at <= ?)
+                     AND (lease_owner IS NULL OR lease_expires_at <= ?)
+                   ORDER BY scheduled_at ASC
+                   LIMIT ?
+               )
+               RETURNING *''',
+            (owner, expires, now, now, now, limit if limit else -1)
+        ).fetchall()
+    posts = [_row_to_dict(r) for r in rows]
+    for post in posts:
+        _post_changed(post['id'], 'updated', 'scheduling')
+    return sorted(posts, key=lambda p: p['scheduled_at'] or '')
+
+
+def claim_post(post_id, status, lease_seconds=LEASE_SECONDS, from_statuses=None, **kwargs):
+    """Atomically move one post to ``status`` under a lease and return it.
+
+    Extra keyword arguments are applied in the same UPDATE. The returned
+    post's ``lease_owner`` is the token to release it with. Returns None if
+    the post does not exist, is currently leased by someone else, or (with
+    ``from_statuses``) is no longer in one of those statuses.
+    """
+    owner = _lease_token()
+    now, expires = _lease(lease_seconds)
+    fields = _updatable_fields(kwargs)
+    fields.update(status=status, lease_owner=owner, lease_expires_at=expires, updated_at=now)
+    set_clause = ', '.join(f'{k} = ?' for k in fields)
+    where = 'id = ? AND (lease_owner IS NULL OR lease_expires_at <= ?)'
+    params = list(fields.values()) + [post_id, now]
+    if from_statuses:
+        where += f" AND status IN ({', '.join('?' * len(from_statuses))})"
+        params.extend(from_statuses)
+    with transaction() as conn:
+        row = conn.execute(f'UPDATE posts SET {set_clause} WHERE {where} RETURNING *', params).fetchone()
+    if row:
+        _post_changed(post_id, 'updated', status)
+    return _row_to_dict(row)
+
+
+def extend_leases(post_ids, owner, lease_seconds):
+    """Push the lease of posts still held by token ``owner`` to ``lease_seconds`` from now.
+
+    Returns the ids whose lease was extended; a post reclaimed or claimed
+    by someone else in the meantime is left alone.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return []
+    _, expires = _lease(lease_seconds)
+    placeholders = ', '.join('?' * len(post_ids))
+    with transaction() as conn:
         rows = conn.execute(
-            'SELECT * FROM followers_history WHERE username = ? ORDER BY recorded_at ASC',
-            (username,)
+            f'''UPDATE posts SET lease_expires_at = ?
+                WHERE id IN ({placeholders}) AND lease_owner = ?
+                RETURNING id''',
+            [expires] + post_ids + [owner]
         ).fetchall()
+    return [r['id'] for r in rows]
+
+
+def release_post(post_id, owner, **kwargs):
+    """Clear the lease on a post and apply its final fields (status, error, tweet_url...).
+
+    ``owner`` is the lease token of the claim. Ignored (returns False) if
+    another claim has taken the post in the meantime. A lease that was only reclaimed (expired and cleared) still
+    accepts the late result, so a slow success is not lost.
+    """
+    fields = _updatable_fields(kwargs)
+    fields.update(lease_owner=None, lease_expires_at=None, updated_at=datetime.now().isoformat())
+    set_clause = ', '.join(f'{k} = ?' for k in fields)
+    with transaction() as conn:
+        cur = conn.execute(
+            f'UPDATE posts SET {set_clause} WHERE id = ? AND (lease_owner = ? OR lease_owner IS NULL)',
+            list(fields.values()) + [post_id, owner]
+        )
+        released = cur.rowcount == 1
+    if released:
+        _post_changed(post_id, 'updated', fields.get('status'))
     else:
+        logger.warning(f"Post #{post_id}: lease held by another claim, result not recorded ({fields.get('status')})")
+    return released
+
+
+def reclaim_expired_leases():
+    """Release in-flight posts whose lease expired (crashed or stuck worker).
+
+    They are moved to 'error' rather than back to the queue: X may already
+    have published or scheduled them, and an automatic resend could double
+    post. The user can check X and retry. Returns the reclaimed post ids.
+    """
+    now = datetime.now().isoformat()
+    with transaction() as conn:
         rows = conn.execute(
-            'SELECT * FROM followers_history ORDER BY recorded_at ASC'
+            '''UPDATE posts
+               SET status = 'error',
+                   error_message = 'Interrupted while ' || status || ': check X before retrying',
+                   lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+               WHERE status IN ('scheduling', 'posting')
+                 AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+               RETURNING id''',
+            (now, now)
         ).fetchall()
-    conn.close()
+    post_ids = [r['id'] for r in rows]
+    if post_ids:
+        logger.warning(f"Reclaimed expired leases on posts {post_ids}")
+    for post_id in post_ids:
+        _post_changed(post_id, 'updated', 'error')
+    return post_ids
+
+
+def get_next_lease_expiry():
+    """Earliest lease expiry among in-flight posts, or None."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT MIN(lease_expires_at) FROM posts WHERE status IN ('scheduling', 'posting')"
+        ).fetchone()
+    return row[0]
+
+
+def delete_post(post_id):
+    with transaction() as conn:
+        conn.execute('DELETE FROM posts WHERE id = ?', (post_id,))
+    _post_changed(post_id, 'deleted')
+    return True
+
+
+def add_follower_snapshot(followers_count, following_count, username=''):
+    now = datetime.now().isoformat()
+    with transaction() as conn:
+        conn.execute(
+            'INSERT INTO followers_history (followers_count, following_count, recorded_at, username) VALUES (?, ?, ?, ?)',
+            (followers_count, following_count, now, username)
+        )
+
+
+def get_follower_history(username=None):
+    with get_connection() as conn:
+        if username:
+            rows = conn.execute(
+                'SELECT * FROM followers_history WHERE username = ? ORDER BY recorded_at ASC',
+                (username,)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                'SELECT * FROM followers_history ORDER BY recorded_at ASC'
+            ).fetchall()
     return [_row_to_dict(r) for r in rows]
+
+
+# --- Jobs ---
+
+def _job_to_dict(row):
+    job = _row_to_dict(row)
+    if job and job.get('result') is not None:
+        job['result'] = json.loads(job['result'])
+    return job
+
+
+def create_job(kind, post_id=None):
+    now = datetime.now().isoformat()
+    with transaction() as conn:
+        cur = conn.execute(
+            'INSERT INTO jobs (kind, post_id, status, created_at) VALUES (?, ?, ?, ?)',
+            (kind, post_id, 'queued', now)
+        )
+        return cur.lastrowid
+
+
+def get_job(job_id):
+    with get_connection() as conn:
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return _job_to_dict(row)
+
+
+def mark_job_running(job_id):
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), job_id)
+        )
+
+
+def finish_job(job_id, result, status='done'):
+    """Store the job's result dict and mark it finished ('done' or 'error')."""
+    with transaction() as conn:
+        conn.execute(
+            'UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ?',
+            (status, json.dumps(result), datetime.now().isoformat(), job_id)
+        )
+
+
+def fail_unfinished_jobs():
+    """Mark jobs left queued/running by a previous process as failed."""
+    result = json.dumps({'success': False, 'error': 'Interrupted by an application restart'})
+    with transaction() as conn:
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'error', result = ?, finished_at = ? WHERE status IN ('queued', 'running')",
+            (result, datetime.now().isoformat())
+        )
+        count = cur.rowcount
+    if count:
+        logger.warning(f"{count} unfinished job(s) from a previous run marked as failed")
+    return count
+
+
+def prune_jobs(days=7):
+    """Delete finished jobs older than ``days``."""
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    with transaction() as conn:
+        conn.execute("DELETE FROM jobs WHERE status IN ('done', 'error') AND created_at < ?", (cutoff,))
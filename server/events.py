@@ -0,0 +1,86 @@
+"""In-process event bus behind the Server-Sent Events stream (GET /api/events).
+
+The database, the job runner and the scheduler publish small JSON events
+(post changes, job progress, scheduler ticks); every open UI window holds one
+SSE connection and refreshes only when something it shows has changed,
+instead of polling the API on a timer.
+
+Recent events are kept in a short backlog so a client that reconnects with
+Last-Event-ID gets what it missed.
+"""
+
+import json
+import logging
+import queue
+import threading
+from collections import deque
+from itertools import count
+
+logger = logging.getLogger(__name__)
+
+BACKLOG_SIZE = 500
+# Events a slow client may have pending before it is disconnected
+SUBSCRIBER_QUEUE_SIZE = 1000
+# Seconds between keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+
+_lock = threading.Lock()
+_ids = count(1)
+_backlog = deque(maxlen=BACKLOG_SIZE)    # (id, type, data)
+_subscribers = set()
+
+
+def publish(event_type, data):
+    """Send ``data`` (JSON-serialisable) to every connected client as ``event_type``."""
+    with _lock:
+        event = (next(_ids), event_type, data)
+        _backlog.append(event)
+        subscribers = list(_subscribers)
+    for q in subscribers:
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            # Client stopped reading: drop it, it will reconnect and replay
+            with _lock:
+                _subscribers.discard(q)
+            with q.mutex:
+                q.queue.clear()
+            q.put_nowait(None)
+
+
+def _format(event):
+    event_id, event_type, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream(last_event_id=None):
+    """Generator of SSE-formatted events for one client, forever.
+
+    Events newer than ``last_event_id`` still in the backlog are sent first.
+    """
+    q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+    with _lock:
+        missed = [e for e in _backlog if last_event_id is not None and e[0] > last_event_id]
+        _subscribers.add(q)
+    try:
+        # Tell the browser how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        for event in missed:
+            yield _format(event)
+        while True:
+            try:
+                event = q.get(timeout=KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield _format(event)
+    finally:
+        with _lock:
+            _subscribers.discard(q)
+
+
+def subscriber_count():
+    with _lock:
+        return len(_subscribers)
@@ -0,0 +1,124 @@
+"""Background jobs for slow browser actions.
+
+Endpoints that drive the browser (post now, schedule now, retry, delete from
+X, profile fetch) submit a job and answer 202 with its id right away instead
+of holding the request thread until the Playwright worker is done. The job's
+state (queued -> running -> done/error) and result dict are stored in the
+jobs table, read back through GET /api/jobs/<id> and pushed to the UI as
+'job' events on GET /api/events.
+"""
+
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+import bot
+import database
+import events
+import logbuffer
+
+logger = logging.getLogger(__name__)
+
+# Job threads mostly wait on the browser. There is one per action the bot
+# can run at once (bot.concurrency(), which follows BROWSER_POOL_SIZE and
+# the engine) plus this many more, so the bot's queue stays fed and a
+# freed browser picks up the next action without waiting for a thread.
+QUEUED_AHEAD = 2
+
+_executor = None
+_executor_size = None
+_executor_lock = threading.Lock()
+
+# job id -> cancel event, for jobs that have not finished yet
+_cancel_events = {}
+_cancel_lock = threading.Lock()
+
+
+def _get_executor():
+    """The job executor, resized when the bot's concurrency setting changed."""
+    global _executor, _executor_size
+    size = bot.concurrency() + QUEUED_AHEAD
+    with _executor_lock:
+        if _executor is not None and _executor_size != size:
+            # Jobs already submitted finish on the old threads
+            _executor.shutdown(wait=False)
+            _executor = None
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='job')
+            _executor_size = size
+        return _executor
+
+
+def _job_changed(job_id):
+    """Push the job's new state to connected UI clients (see events.py)."""
+    events.publish('job', database.get_job(job_id))
+
+
+def _run(job_id, kind, func, args, cancel_event, post_id=None):
+    database.mark_job_running(job_id)
+    _job_changed(job_id)
+    started = monotonic()
+    # Records logged while the job runs are tagged with it (see logbuffer.py)
+    with logbuffer.job_context(job_id, post_id):
+        try:
+            # Browser tasks the job submits stop when the job is cancelled
+            with bot.cancellable(cancel_event):
+                result = func(*args)
+        except Exception as e:
+            logger.error(f"Job #{job_id} ({kind}) crashed: {e}\n{traceback.format_exc()}",
+                         extra={'duration': monotonic() - started})
+            database.finish_job(job_id, {'success': False, 'error': str(e)}, status='error')
+            _job_changed(job_id)
+            return
+        finally:
+            with _cancel_lock:
+                _cancel_events.pop(job_id, None)
+        database.finish_job(job_id, result)
+        _job_changed(job_id)
+        logger.info(f"Job #{job_id} ({kind}) finished (success={result.get('success')})",
+                    extra={'duration': monotonic() - started})
+
+
+def submit(kind, func, *args, post_id=None):
+    """Queue ``func(*args)`` and return the new job id.
+
+    ``func`` returns the result dict the client will see, e.g.
+    ``{'success': True, 'tweet_url': ...}``. It still runs when the job is
+    cancelled, with its browser calls failing fast, so it can release
+    whatever it claimed.
+    """
+    job_id = database.create_job(kind, post_id=post_id)
+    _job_changed(job_id)
+    cancel_event = threading.Event()
+    with _cancel_lock:
+        _cancel_events[job_id] = cancel_event
+    _get_executor().submit(_run, job_id, kind, func, args, cancel_event, post_id)
+    logger.info(f"Job #{job_id} ({kind}) queued" + (f" for post #{post_id}" if post_id else ''))
+    return job_id
+
+
+def cancel(job_id):
+    """Ask an unfinished job to stop. Returns False if it already finished."""
+    with _cancel_lock:
+        cancel_event = _cancel_events.get(job_id)
+    if cancel_event is None:
+        return False
+    cancel_event.set()
+    logger.info(f"Job #{job_id} cancellation requested")
+    return True
+
+
+def start():
+    """Fail jobs a previous run left unfinished (their threads are gone) and
+    drop old finished ones."""
+    database.fail_unfinished_jobs()
+    database.prune_jobs()
+
+
+def stop():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,246 @@
+"""Recent log records kept in memory as structured data.
+
+RingBufferHandler sits next to the rotating file handler and keeps the last
+LOG_BUFFER_SIZE records as dicts (time, level, logger, message, post_id,
+job_id, duration), so GET /api/logs/records can filter recent activity by
+post, job, level or time window without reading logs/app.log.
+
+post_id/job_id come from ``extra={...}`` when the caller passes them, else
+from the job the logging thread is running (see job_context()), else from a
+"Post #12" / "Job #34" mention in the message. ``duration`` (seconds) is
+only set when passed as an extra, e.g. by the bot's step timer.
+
+Records pushed out of the buffer are not lost: they are batched into
+gzip-compressed segments under logs/records/, one JSON array per record,
+with the id and time range in the file name so a time-window query only
+opens the segments that overlap it. A partial batch is written when the
+handler is flushed or closed (logging does both at exit). The oldest
+segments are deleted past LOG_SPILL_SEGMENTS.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import count
+
+DEFAULT_CAPACITY = 5000
+DEFAULT_MAX_SEGMENTS = 20
+# Records per on-disk segment
+SEGMENT_RECORDS = 1000
+
+# Order of the values in a spilled record (the first line of each segment)
+FIELDS = ('id', 'ts', 'level', 'logger', 'message', 'post_id', 'job_id', 'duration')
+
+_POST_RE = re.compile(r'\bPost #(\d+)')
+_JOB_RE = re.compile(r'\bJob #(\d+)')
+
+_context = threading.local()
+
+
+@contextmanager
+def job_context(job_id, post_id=None):
+    """Tag the records logged by this thread with ``job_id``/``post_id``."""
+    previous = getattr(_context, 'ids', None)
+    _context.ids = (job_id, post_id)
+    try:
+        yield
+    finally:
+        _context.ids = previous
+
+
+def _mentioned(pattern, message):
+    match = pattern.search(message)
+    return int(match.group(1)) if match else None
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` records; older ones spill to ``spill_dir``."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_dir=None, max_segments=DEFAULT_MAX_SEGMENTS):
+        super().__init__()
+        self.capacity = max(1, capacity)
+        self.spill_dir = spill_dir
+        self.max_segments = max_segments
+        self._records = deque()
+        self._pending = []    # evicted records not written to a segment yet
+        self._ids = count(1)
+        self._query_lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            # Carry on numbering after the segments of a previous run
+            segments = self._segments()
+            if segments:
+                self._ids = count(segments[-1][2] + 1)
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+            job_id, post_id = getattr(_context, 'ids', None) or (None, None)
+            job_id = getattr(record, 'job_id', job_id)
+            post_id = getattr(record, 'post_id', post_id)
+            if job_id is None:
+                job_id = _mentioned(_JOB_RE, message)
+            if post_id is None:
+                post_id = _mentioned(_POST_RE, message)
+            duration = getattr(record, 'duration', None)
+            item = {
+                'id': next(self._ids),
+                'ts': record.created,
+                'level': record.levelname,
+                'logger': record.name,
+                'message': message,
+                'post_id': post_id,
+                'job_id': job_id,
+                'duration': round(duration, 3) if duration is not None else None,
+            }
+            with self._query_lock:
+                self._records.append(item)
+                if len(self._records) > self.capacity:
+                    self._pending.append(self._records.popleft())
+                    if len(self._pending) >= SEGMENT_RECORDS:
+                        batch, self._pending = self._pending, []
+                    else:
+                        batch = None
+                else:
+                    batch = None
+            if batch and self.spill_dir:
+                self._write_segment(batch)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Write the evicted records of a partial batch to a segment."""
+        if not self.spill_dir:
+            return
+        with self._query_lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write_segment(batch)
+
+    def close(self):
+        # logging.shutdown() closes every handler at exit: keep the last partial batch
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    # --- On-disk segments ---
+
+    def _write_segment(self, batch):
+        first, last = batch[0], batch[-1]
+        name = f"{first['id']:012d}-{last['id']:012d}-{int(first['ts'])}-{int(last['ts']) + 1}.seg.gz"
+        path = os.path.join(self.spill_dir, name)
+        with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(FIELDS) + '\n')
+            for item in batch:
+                f.write(json.dumps([item[k] for k in FIELDS], ensure_ascii=False, separators=(',', ':')) + '\n')
+        os.replace(path + '.tmp', path)
+        segments = self._segments()
+        for segment in segments[:max(0, len(segments) - self.max_segments)]:
+            os.remove(segment[0])
+
+    def _segments(self):
+        """(path, first_id, last_id, first_ts, last_ts) per segment, oldest first."""
+        segments = []
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith('.seg.gz'):
+                continue
+            try:
+                first_id, last_id, first_ts, last_ts = (int(p) for p in name[:-len('.seg.gz')].split('-'))
+            except ValueError:
+                continue
+            segments.append((os.path.join(self.spill_dir, name), first_id, last_id, first_ts, last_ts))
+        segments.sort(key=lambda s: s[1])
+        return segments
+
+    def _read_segment(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            fields = json.loads(f.readline())
+            return [dict(zip(fields, json.loads(line))) for line in f]
+
+    # --- Queries ---
+
+    def query(self, post_id=None, job_id=None, level=None, logger_name=None,
+              since=None, until=None, limit=200, spilled=False):
+        """The last ``limit`` records matching every given filter, oldest first.
+
+        ``level`` is a minimum level name, ``logger_name`` also matches its
+        children, ``since``/``until`` are epoch seconds. Only memory is
+        searched unless ``spilled`` is set, then segments are read newest
+        first until ``limit`` matches are found.
+        """
+        min_level = logging.getLevelName(level.upper()) if level else None
+        if not isinstance(min_level, int):
+            min_level = None
+
+        def _match(item):
+            return ((post_id is None or item['post_id'] == post_id)
+                    and (job_id is None or item['job_id'] == job_id)
+                    and (min_level is None or logging.getLevelName(item['level']) >= min_level)
+                    and (not logger_name or item['logger'] == logger_name
+                         or item['logger'].startswith(logger_name + '.'))
+                    and (since is None or item['ts'] >= since)
+                    and (until is None or item['ts'] < until))
+
+        with self._query_lock:
+            recent = list(self._pending) + list(self._records)
+        picked = []
+        for item in reversed(recent):
+            if len(picked) >= limit:
+                break
+            if _match(item):
+                picked.append(item)
+
+        if spilled and self.spill_dir and len(picked) < limit:
+            for path, _, _, first_ts, last_ts in reversed(self._segments()):
+                if len(picked) >= limit or (since is not None and last_ts < since):
+                    break
+                if until is not None and first_ts >= until:
+                    continue
+                try:
+                    items = self._read_segment(path)
+                except (OSError, ValueError):
+                    continue  # removed meanwhile, or cut short by a crash
+                for item in reversed(items):
+                    if len(picked) >= limit:
+                        break
+                    if _match(item):
+                        picked.append(item)
+
+        picked.reverse()
+        return [dict(item, time=datetime.fromtimestamp(item['ts']).isoformat(timespec='milliseconds'))
+                for item in picked]
+
+    def stats(self):
+        with self._query_lock:
+            buffered = len(self._records)
+            pending = len(self._pending)
+        return {
+            'capacity': self.capacity,
+            'buffered': buffered,
+            'pending_spill': pending,
+            'segments': len(self._segments()) if self.spill_dir else 0,
+        }
+
+
+_handler = None
+
+
+def install(capacity=DEFAULT_CAPACITY, spill_dir=None, max_segments=DEFAULT_MAX_SEGMENTS, level=logging.INFO):
+    """Attach the ring buffer to the root logger (once) and return it."""
+    global _handler
+    if _handler is None:
+        _handler = RingBufferHandler(capacity, spill_dir, max_segments)
+        _handler.setLevel(level)
+        logging.getLogger().addHandler(_handler)
+    return _handler
+
+
+def get_handler():
+    return _handler
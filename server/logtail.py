@@ -0,0 +1,136 @@
+"""Cheap reads of logs/app.log for the Logs page.
+
+tail() seeks backwards from the end of the file block by block until it has
+enough lines, and read_since() returns only what was appended after a byte
+offset the client got from a previous call. Either way the cost depends on
+how much is returned, not on the size of the log file.
+
+Lines follow the app's log format (``<date> <time> [LEVEL] logger: message``).
+Lines that do not start a record (traceback lines) stay with the record
+above them when filtering by level or logger.
+"""
+
+import logging
+import os
+import re
+
+BLOCK_SIZE = 8192
+# Most bytes read_since() returns at once; the client catches up with its next call
+MAX_READ_BYTES = 256 * 1024
+
+_RECORD_RE = re.compile(r'^\S+ \S+ \[(\w+)\] ([^:\s]+): ')
+
+
+def _level_number(level):
+    if not level:
+        return None
+    number = logging.getLevelName(level.upper())
+    return number if isinstance(number, int) else None
+
+
+def make_filter(level=None, logger_name=None):
+    """A predicate over log lines: records at ``level`` or above from
+    ``logger_name`` (or one of its children). None if nothing to filter."""
+    min_level = _level_number(level)
+    if min_level is None and not logger_name:
+        return None
+    state = {'keep': False}
+
+    def _keep(line):
+        match = _RECORD_RE.match(line)
+        if not match:
+            return state['keep']  # continuation of the previous record
+        record_level = _level_number(match.group(1)) or 0
+        name = match.group(2)
+        state['keep'] = ((min_level is None or record_level >= min_level)
+                         and (not logger_name or name == logger_name or name.startswith(logger_name + '.')))
+        return state['keep']
+    return _keep
+
+
+def _reverse_lines(f, end):
+    """Complete lines of ``f`` before byte ``end``, last first (as bytes)."""
+    position = end
+    partial = b''
+    while position > 0:
+        size = min(BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        chunk = f.read(size) + partial
+        lines = chunk.split(b'\n')
+        partial = lines.pop(0)
+        for line in reversed(lines):
+            yield line
+    if partial:
+        yield partial
+
+
+def tail(path, lines=200, level=None, logger_name=None):
+    """The last ``lines`` lines (matching the filters) and the end offset.
+
+    Returns (text, offset). A line still being written is left out;
+    ``offset`` is where the next read_since() should start.
+    """
+    if not os.path.isfile(path):
+        return '', 0
+    keep = make_filter(level, logger_name)
+    picked = []
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        reverse = _reverse_lines(f, size)
+        # Whatever follows the last newline: b'' or a line still being written
+        trailing = next(reverse, b'')
+        end = size - len(trailing)
+        if keep is None:
+            for raw in reverse:
+                if len(picked) >= lines:
+                    break
+                picked.append(raw)
+            picked.reverse()
+        else:
+            # Continuation lines belong to the record above them, so group
+            # them while walking backwards and filter whole records
+            record = []
+            for raw in reverse:
+                if len(picked) >= lines:
+                    break
+                record.insert(0, raw)
+                line = raw.decode('utf-8', errors='replace')
+                if _RECORD_RE.match(line):
+                    if keep(line):
+                        picked[:0] = record
+                    record = []
+            picked = picked[-lines:] if lines else []
+    text = b'\n'.join(picked).decode('utf-8', errors='replace')
+    return (text + '\n' if text else ''), end
+
+
+def read_since(path, offset, level=None, logger_name=None, keep=None):
+    """Whole lines appended after byte ``offset``.
+
+    Returns (text, new_offset, reset). ``reset`` is True when the file is
+    now shorter than ``offset`` (it was rotated): the caller should start
+    over from a fresh tail(). ``keep`` lets a streaming caller pass one
+    make_filter() predicate across calls so traceback lines keep following
+    their record.
+    """
+    if not os.path.isfile(path):
+        return '', 0, offset > 0
+    size = os.path.getsize(path)
+    if size < offset:
+        return '', 0, True
+    if size == offset:
+        return '', offset, False
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(min(size - offset, MAX_READ_BYTES))
+    cut = data.rfind(b'\n')
+    if cut < 0:
+        return '', offset, False
+    data = data[:cut + 1]
+    text = data.decode('utf-8', errors='replace')
+    if keep is None:
+        keep = make_filter(level, logger_name)
+    if keep is not None:
+        text = ''.join(line for line in text.splitlines(keepends=True) if keep(line))
+    return text, offset + len(data), False
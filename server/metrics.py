@@ -0,0 +1,270 @@
+"""Timings of bot operations, scheduler passes and database queries, served
+in Prometheus text format by GET /api/metrics.
+
+A browser task runs inside operation(): the bot's worker loop opens one per
+task, the scheduler one per pass. Inside it, span() (a context manager or a
+decorator) times one step, e.g. login or the toast wait; spans may nest.
+Every duration lands in a histogram keyed by its labels:
+
+    xpm_step_seconds{operation, step}
+    xpm_operation_seconds{operation, outcome}
+
+Histograms use fixed buckets, so memory does not grow with traffic; they
+are exported as Prometheus summaries whose p50/p95/p99 are interpolated
+from the buckets. Counters and scrape-time gauges (queue depth, busy
+time...) are registered by the modules that own the numbers.
+"""
+
+import logging
+import math
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the histogram buckets; the last one catches the rest
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+           1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, math.inf)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_lock = threading.Lock()
+_histograms = {}    # name -> {labels: Histogram}
+_counters = {}      # name -> {labels: value}
+_gauges = {}        # name -> (function, label name or None)
+_help = {}
+
+# Timer of the operation running in this thread / asyncio task
+_current = ContextVar('metrics_operation', default=None)
+
+
+class Histogram:
+    """Count of observations per bucket, plus their sum and maximum."""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate of the ``q`` quantile, linear within the bucket it falls in."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, in_bucket in enumerate(self.buckets):
+            if in_bucket and seen + in_bucket >= rank:
+                low = BUCKETS[i - 1] if i else 0.0
+                high = min(BUCKETS[i], self.max)
+                if high <= low:
+                    return high
+                return low + (high - low) * (rank - seen) / in_bucket
+            seen += in_bucket
+        return self.max
+
+
+def _key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def describe(name, help_text):
+    """Set the HELP line of metric ``name``."""
+    _help[name] = help_text
+
+
+def observe(name, seconds, **labels):
+    """Add one duration to the ``name`` histogram with these labels."""
+    key = _key(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(max(seconds, 0.0))
+
+
+def inc(name, value=1, **labels):
+    """Add ``value`` to the ``name`` counter with these labels."""
+    key = _key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def gauge(name, func, help_text=None, label=None):
+    """Report ``func()`` as gauge ``name`` on every scrape. ``func`` returns a
+    number or, with ``label``, a dict of {label value: number}."""
+    _gauges[name] = (func, label)
+    if help_text:
+        describe(name, help_text)
+
+
+def outcome_of(result):
+    """Outcome label for a bot result: a result dict, or a list of them for
+    batch operations."""
+    if isinstance(result, list):
+        done = sum(1 for r in result if isinstance(r, dict) and r.get('success'))
+        if not result or done == len(result):
+            return 'success'
+        return 'partial' if done else 'error'
+    if not isinstance(result, dict):
+        return 'unknown'
+    if result.get('success'):
+        return 'success'
+    if result.get('needs_manual_intervention'):
+        return 'manual'
+    return 'error'
+
+
+class Timer:
+    """Step timings of one operation."""
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.started = monotonic()
+        self.steps = []
+        self.outcome = None
+
+    def _record(self, step, seconds):
+        self.steps.append((step, seconds))
+        observe('xpm_step_seconds', seconds, operation=self.operation, step=step)
+
+    @contextmanager
+    def span(self, step):
+        started = monotonic()
+        try:
+            yield
+        finally:
+            self._record(step, monotonic() - started)
+
+    def set_result(self, result):
+        """Take the outcome from ``result`` (see outcome_of) and return it."""
+        self.outcome = outcome_of(result)
+        return result
+
+    def elapsed(self):
+        return monotonic() - self.started
+
+    def summary(self):
+        """Total time and each step, in the order the steps ended."""
+        return f"{self.elapsed():.1f}s: " + ', '.join(f"{step} {seconds:.1f}s" for step, seconds in self.steps)
+
+
+@contextmanager
+def operation(name, log=None):
+    """Time the block as operation ``name``; spans inside it are its steps.
+
+    The outcome is what set_result() saw, 'success' if it was not called,
+    or 'exception' if the block raised. With ``log`` (a logger), the step
+    breakdown is logged when the operation ends.
+    """
+    timer = Timer(name)
+    token = _current.set(timer)
+    try:
+        yield timer
+    except BaseException:
+        if timer.outcome is None:
+            timer.outcome = 'exception'
+        raise
+    finally:
+        _current.reset(token)
+        outcome = timer.outcome or 'success'
+        elapsed = timer.elapsed()
+        observe('xpm_operation_seconds', elapsed, operation=name, outcome=outcome)
+        if log is not None:
+            log.info(f"{name} {outcome} in {timer.summary()}", extra={'duration': elapsed})
+
+
+def current():
+    """The Timer of the running operation, or a detached one outside of any."""
+    return _current.get() or Timer('none')
+
+
+@contextmanager
+def span(step):
+    """Time the block (or the decorated function) as a step of the running operation."""
+    timer = _current.get()
+    if timer is None:
+        started = monotonic()
+        try:
+            yield
+        finally:
+            observe('xpm_step_seconds', monotonic() - started, operation='none', step=step)
+        return
+    with timer.span(step):
+        yield
+
+
+# ===== Prometheus text format =====
+
+def _labels(key, **extra):
+    pairs = list(key) + [(k, str(v)) for k, v in extra.items()]
+    if not pairs:
+        return ''
+    escaped = (k + '="' + v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+               for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _number(value):
+    if math.isnan(value):
+        return 'NaN'
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def _header(lines, name, kind):
+    if name in _help:
+        lines.append(f"# HELP {name} {_help[name]}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render():
+    """Every metric in Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        snapshot = {name: {key: ([h.quantile(q) for q in QUANTILES], h.sum, h.count)
+                           for key, h in series.items()}
+                    for name, series in _histograms.items()}
+        counters = {name: dict(series) for name, series in _counters.items()}
+
+    for name in sorted(snapshot):
+        _header(lines, name, 'summary')
+        for key, (quantiles, total, count) in sorted(snapshot[name].items()):
+            for q, value in zip(QUANTILES, quantiles):
+                lines.append(f"{name}{_labels(key, quantile=q)} {_number(value)}")
+            lines.append(f"{name}_sum{_labels(key)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(key)} {count}")
+
+    for name in sorted(counters):
+        _header(lines, name, 'counter')
+        for key, value in sorted(counters[name].items()):
+            lines.append(f"{name}{_labels(key)} {_number(value)}")
+
+    for name in sorted(_gauges):
+        func, label = _gauges[name]
+        try:
+            value = func()
+        except Exception as e:
+            logger.warning(f"Gauge {name} failed: {e}")
+            continue
+        _header(lines, name, 'gauge')
+        if label is None:
+            lines.append(f"{name} {_number(value)}")
+            continue
+        for label_value, number in sorted(value.items()):
+            lines.append(f"{name}{_labels((), **{label: label_value})} {_number(number)}")
+
+    return '\n'.join(lines) + '\n'
+
+
+describe('xpm_operation_seconds', 'Duration of bot operations and scheduler passes, by outcome.')
+describe('xpm_step_seconds', 'Duration of the steps of an operation.')
@@ -1,63 +1,155 @@
 import os
 import logging
-from apscheduler.schedulers.background import BackgroundScheduler
+import threading
+from datetime import datetime, timedelta
 import database
 import bot
+import events
+import metrics
 
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler(daemon=True)
+# The scheduler thread sleeps until something can actually be done: a post
+# was created or updated (notify()), a retry backoff or a lease expires, or
+# stop() is called. Nothing touches the database while it is idle.
+_wakeup = threading.Event()
+_stopping = threading.Event()
+_thread = None
+
+
+def _retry_delay():
+    """Seconds to wait before retrying a post whose scheduling failed."""
+    return int(os.getenv('CHECK_INTERVAL_SECONDS', '15'))
+
+
+def _record_result(post, result):
+    """Store the outcome of sending one claimed post to X."""
+    post_id = post['id']
+    if result.get('success'):
+        database.release_post(post_id, post['lease_owner'], status='scheduled_on_x', next_attempt_at=None)
+        metrics.inc('xpm_scheduler_posts_total', outcome='scheduled')
+        logger.info(f"Post #{post_id} scheduled on X successfully")
+        return
+
+    error_msg = result.get('error', 'Unknown error')
+    retries = post.get('retries_count', 0)
+    max_retries = int(os.getenv('MAX_RETRIES', '1'))
+
+    if retries < max_retries:
+        delay = _retry_delay()
+        database.release_post(
+            post_id,
+            post['lease_owner'],
+            status='scheduled',
+            error_message=error_msg,
+            retries_count=retries + 1,
+            next_attempt_at=(datetime.now() + timedelta(seconds=delay)).isoformat(),
+        )
+        metrics.inc('xpm_scheduler_posts_total', outcome='retry')
+        logger.warning(f"Post #{post_id} scheduling failed, will retry in {delay}s ({retries + 1}/{max_retries}): {error_msg}")
+    else:
+        database.release_post(post_id, post['lease_owner'], status='error', error_message=error_msg)
+        metrics.inc('xpm_scheduler_posts_total', outcome='error')
+        logger.error(f"Post #{post_id} scheduling failed permanently: {error_msg}")
 
 
 def _process_due_posts():
     """Process posts that need action: schedule on X or post immediately."""
 
-    # 1. Handle posts that need to be scheduled on X natively
-    pending = database.get_pending_scheduled()
+    # 1. Handle posts that need to be scheduled on X natively.
+    # Claiming flips them to 'scheduling' under a lease in one statement,
+    # so a concurrent "Schedule now"/"Post now" click cannot pick them too.
+    with metrics.span('claim due posts'):
+        pending = database.claim_pending_scheduled()
+    batch = []
     for post in pending:
-        post_id = post['id']
-        scheduled_at = post.get('scheduled_at')
-        if not scheduled_at:
-            continue
-
-        logger.info(f"Scheduling post #{post_id} on X for {scheduled_at}")
-        database.update_post_status(post_id, 'scheduling')
-
-        result = bot.post_to_x(
-            text=post.get('text', ''),
-            image_path=post.get('image_path', ''),
-            scheduled_at=scheduled_at
+        if not post.get('scheduled_at'):
+            database.release_post(post['id'], post['lease_owner'], status='error',
+                                  error_message='Post has no scheduled date')
+        else:
+            batch.append(post)
+    if not batch:
+        return
+
+    # Everything due goes to X in a single browser session; each result is
+    # stored as soon as its post is done. The batch may run longer than a
+    # normal lease, so the leases are stretched to its timeout (plus the
+    # usual margin for the queue wait): otherwise a "Post now" click or the
+    # reclaim of the next pass could take a post the batch is still sending.
+    database.extend_leases([p['id'] for p in batch], batch[0]['lease_owner'],
+                           bot.post_many_timeout(len(batch)) + database.LEASE_SECONDS)
+    for post in batch:
+        logger.info(f"Scheduling post #{post['id']} on X for {post['scheduled_at']}")
+    recorded = set()
+
+    def _on_result(index, result):
+        recorded.add(index)
+        _record_result(batch[index], result)
+
+    with metrics.span('send to X'):
+        results = bot.post_many(
+            [{'text': p.get('text', ''), 'image_path': p.get('image_path', ''), 'scheduled_at': p['scheduled_at']}
+             for p in batch],
+            on_result=_on_result,
         )
+    # Results the worker could not report itself (e.g. it crashed)
+    for index, result in enumerate(results):
+        if index not in recorded:
+            _record_result(batch[index], result)
 
-        if result.get('success'):
-            database.update_post_status(post_id, 'scheduled_on_x')
-            logger.info(f"Post #{post_id} scheduled on X successfully")
-        else:
-            error_msg = result.get('error', 'Unknown error')
-            retries = post.get('retries_count', 0)
-            max_retries = int(os.getenv('MAX_RETRIES', '1'))
-
-            if retries < max_retries:
-                database.update_post(
-                    post_id,
-                    status='scheduled',
-                    error_message=error_msg,
-                    retries_count=retries + 1
-                )
-                logger.warning(f"Post #{post_id} scheduling failed, will retry ({retries + 1}/{max_retries}): {error_msg}")
-            else:
-                database.update_post_status(post_id, 'error', error_message=error_msg)
-                logger.error(f"Post #{post_id} scheduling failed permanently: {error_msg}")
+
+def _seconds_until(iso_timestamp):
+    if not iso_timestamp:
+        return None
+    delay = (datetime.fromisoformat(iso_timestamp) - datetime.now()).total_seconds()
+    return max(delay, 0)
+
+
+def _seconds_until_next_event():
+    """Seconds until a retry backoff or a lease expires, or None if nothing is pending."""
+    delays = [d for d in (
+        _seconds_until(database.get_next_attempt_at()),
+        _seconds_until(database.get_next_lease_expiry()),
+    ) if d is not None]
+    return min(delays) if delays else None
+
+
+def _run():
+    while not _stopping.is_set():
+        _wakeup.clear()
+        # Each pass is timed as the 'scheduler_pass' operation (see metrics.py)
+        with metrics.operation('scheduler_pass') as timer:
+            try:
+                with metrics.span('reclaim leases'):
+                    database.reclaim_expired_leases()
+                _process_due_posts()
+                timeout = _seconds_until_next_event()
+            except Exception as e:
+                logger.error(f"Scheduler run failed: {e}")
+                timer.outcome = 'error'
+                timeout = _retry_delay()
+        events.publish('scheduler', {'ran_at': datetime.now().isoformat(), 'next_run_in': timeout})
+        _wakeup.wait(timeout)
+
+
+metrics.describe('xpm_scheduler_posts_total', 'Scheduled posts sent to X by the scheduler, by outcome.')
+
+
+def notify():
+    """Wake the scheduler now (a post was created, edited or re-scheduled)."""
+    _wakeup.set()
 
 
 def start():
-    interval = int(os.getenv('CHECK_INTERVAL_SECONDS', '15'))
-    scheduler.add_job(_process_due_posts, 'interval', seconds=interval, id='check_posts',
-                      replace_existing=True, max_instances=1)
-    scheduler.start()
-    logger.info(f"Scheduler started (checking every {interval}s)")
+    global _thread
+    _stopping.clear()
+    _wakeup.set()  # pick up anything left 'scheduled' by a previous run
+    _thread = threading.Thread(target=_run, daemon=True, name='scheduler')
+    _thread.start()
+    logger.info(f"Scheduler started (event-driven, retry delay {_retry_delay()}s)")
 
 
 def stop():
-    scheduler.shutdown(wait=False)
+    _stopping.set()
+    _wakeup.set()
     logger.info("Scheduler stopped")
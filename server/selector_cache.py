@@ -0,0 +1,179 @@
+"""Adaptive cache for the fallback selector chains used by the bot.
+
+X changes its markup often, so most elements are located through an ordered
+list of candidate selectors. Instead of waiting on each candidate in turn,
+find() waits on all of them at once, remembers which candidate matched for
+each logical element and tries that one first next time.
+
+Hit counts are persisted to data/selector_stats.json so markup drift shows
+up in get_stats() (fallback hits, misses) rather than as a slow bot.
+"""
+
+import json
+import logging
+import os
+import threading
+from time import monotonic
+
+from paths import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+STATS_PATH = os.path.join(DATA_DIR, 'selector_stats.json')
+SAVE_INTERVAL_SECONDS = 30
+# How long the winner's element handle may take once the race saw it visible
+RESOLVE_TIMEOUT_MS = 1000
+
+_lock = threading.Lock()
+_stats = None        # name -> {'hits': {selector: n}, 'misses': n, 'fallbacks': n, 'wait_ms': total, 'last': selector}
+_dirty = False
+_last_save = 0.0
+
+
+def _load():
+    global _stats
+    if _stats is not None:
+        return _stats
+    _stats = {}
+    if os.path.isfile(STATS_PATH):
+        try:
+            with open(STATS_PATH, 'r', encoding='utf-8') as f:
+                _stats = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read selector stats, starting fresh: {e}")
+            _stats = {}
+    return _stats
+
+
+def _entry(name):
+    return _load().setdefault(name, {'hits': {}, 'misses': 0, 'fallbacks': 0, 'wait_ms': 0.0, 'last': None})
+
+
+def _ordered(name, candidates):
+    """Candidates with the last winner for this element moved to the front."""
+    with _lock:
+        last = _entry(name).get('last')
+    if last in candidates:
+        return [last] + [c for c in candidates if c != last]
+    return list(candidates)
+
+
+def _record(name, candidates, winner, elapsed):
+    global _dirty
+    with _lock:
+        entry = _entry(name)
+        entry['wait_ms'] += elapsed * 1000
+        if winner is None:
+            entry['misses'] += 1
+        else:
+            entry['hits'][winner] = entry['hits'].get(winner, 0) + 1
+            entry['last'] = winner
+            if winner != candidates[0]:
+                entry['fallbacks'] += 1
+        _dirty = True
+    if monotonic() - _last_save > SAVE_INTERVAL_SECONDS:
+        flush()
+
+
+def _visible(locator):
+    """The first *visible* match of ``locator``: X keeps hidden duplicates of
+    some elements (compose modal vs. inline composer) ahead of the visible one."""
+    return locator.filter(visible=True).first
+
+
+def find(page, name, candidates, timeout=5000):
+    """Wait for whichever of ``candidates`` shows up first and return it.
+
+    ``name`` identifies the logical element (e.g. 'post_button') for the
+    statistics. All candidates are raced with a single combined locator, so
+    a miss costs one ``timeout`` instead of one per candidate. Returns an
+    element handle, or None if nothing matched.
+    """
+    ordered = _ordered(name, candidates)
+    started = monotonic()
+
+    combined = page.locator(ordered[0])
+    for selector in ordered[1:]:
+        combined = combined.or_(page.locator(selector))
+    try:
+        _visible(combined).wait_for(state='visible', timeout=timeout)
+    except Exception:
+        _record(name, candidates, None, monotonic() - started)
+        return None
+
+    # Something matched: take the first candidate with a visible match right now
+    for selector in ordered:
+        try:
+            locator = _visible(page.locator(selector))
+            if locator.count():
+                el = locator.element_handle(timeout=RESOLVE_TIMEOUT_MS)
+                _record(name, candidates, selector, monotonic() - started)
+                return el
+        except Exception:
+            continue
+
+    # The match went away between the wait and the lookup
+    _record(name, candidates, None, monotonic() - started)
+    return None
+
+
+async def find_async(page, name, candidates, timeout=5000):
+    """find() for the asyncio engine (async Playwright page)."""
+    ordered = _ordered(name, candidates)
+    started = monotonic()
+
+    combined = page.locator(ordered[0])
+    for selector in ordered[1:]:
+        combined = combined.or_(page.locator(selector))
+    try:
+        await _visible(combined).wait_for(state='visible', timeout=timeout)
+    except Exception:
+        _record(name, candidates, None, monotonic() - started)
+        return None
+
+    for selector in ordered:
+        try:
+            locator = _visible(page.locator(selector))
+            if await locator.count():
+                el = await locator.element_handle(timeout=RESOLVE_TIMEOUT_MS)
+                _record(name, candidates, selector, monotonic() - started)
+                return el
+        except Exception:
+            continue
+
+    _record(name, candidates, None, monotonic() - started)
+    return None
+
+
+def flush():
+    """Write the statistics to disk if they changed."""
+    global _dirty, _last_save
+    with _lock:
+        if not _dirty:
+            return
+        data = json.dumps(_stats, indent=2)
+        _dirty = False
+        _last_save = monotonic()
+    try:
+        tmp_path = STATS_PATH + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, STATS_PATH)
+    except Exception as e:
+        logger.warning(f"Could not save selector stats: {e}")
+
+
+def get_stats():
+    """Per-element hit counts, misses, fallback hits and average wait (ms)."""
+    with _lock:
+        stats = {}
+        for name, entry in _load().items():
+            lookups = sum(entry['hits'].values()) + entry['misses']
+            stats[name] = {
+                'hits': dict(entry['hits']),
+                'misses': entry['misses'],
+                'fallbacks': entry['fallbacks'],
+                'preferred': entry['last'],
+                'avg_wait_ms': round(entry['wait_ms'] / lookups, 1) if lookups else 0,
+            }
+        return stats
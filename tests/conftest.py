@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The server modules import each other by their flat names (import database, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+# Keep the app's data and logs out of the checkout: modules read these paths
+# when they are imported, so redirect them before anything else loads
+import paths  # noqa: E402
+
+_scratch = tempfile.mkdtemp(prefix='xpm-tests-')
+paths.DATA_DIR = os.path.join(_scratch, 'data')
+paths.UPLOAD_DIR = os.path.join(paths.DATA_DIR, 'uploads')
+paths.DB_PATH = os.path.join(paths.DATA_DIR, 'posts.db')
+paths.LOG_DIR = os.path.join(_scratch, 'logs')
+paths.LOG_FILE = os.path.join(paths.LOG_DIR, 'app.log')
+os.makedirs(paths.UPLOAD_DIR, exist_ok=True)
+os.makedirs(paths.LOG_DIR, exist_ok=True)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """The database module on a fresh, fully migrated database."""
+    import database
+    database.close_all()
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'posts.db'))
+    database.init_db()
+    yield database
+    database.close_all()
@@ -0,0 +1,50 @@
+import pytest
+
+import bot
+
+
+class FakeButton:
+    def __init__(self):
+        self.clicks = 0
+
+    def click(self):
+        self.clicks += 1
+
+
+class FakePage:
+    def __init__(self):
+        self.button = FakeButton()
+
+    def wait_for_selector(self, selector, timeout=None):
+        return self.button
+
+
+def test_dismiss_popups_lets_an_abort_through(monkeypatch):
+    def aborted(low, high):
+        raise bot.TaskAborted('Cancelled')
+
+    monkeypatch.setattr(bot, '_human_delay', aborted)
+    page = FakePage()
+    with pytest.raises(bot.TaskAborted):
+        bot._dismiss_popups(page)
+    assert page.button.clicks == 1
+
+
+def test_post_many_stops_the_batch_on_abort(monkeypatch):
+    monkeypatch.setattr(bot, '_ensure_browser', lambda operation: object())
+    monkeypatch.setattr(bot, '_login', lambda page: {'success': True})
+    sent = []
+
+    def compose(page, text, image_path, scheduled_at):
+        if sent:
+            raise bot.TaskAborted('Timed out after 300s')
+        sent.append(text)
+        return {'success': True}
+
+    monkeypatch.setattr(bot, '_compose_post', compose)
+    reported = []
+    results = bot._do_post_many([{'text': 'a'}, {'text': 'b'}, {'text': 'c'}],
+                                on_result=lambda index, result: reported.append(index))
+    assert sent == ['a']
+    assert results == [{'success': True}] + [{'success': False, 'error': 'Timed out after 300s'}] * 2
+    assert reported == [0, 1, 2]
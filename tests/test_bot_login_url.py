@@ -0,0 +1,28 @@
+import pytest
+
+import bot
+
+
+@pytest.mark.parametrize('url', [
+    'https://x.com/login',
+    'https://x.com/login/',
+    'https://x.com/i/flow/login',
+    'https://x.com/i/flow/login?redirect_after_login=%2Fhome',
+    'https://x.com/i/flow/single_sign_on',
+    'http://127.0.0.1:8765/i/flow/login',
+])
+def test_login_pages(url):
+    assert bot._is_login_url(url)
+
+
+@pytest.mark.parametrize('url', [
+    'https://x.com/home',
+    'https://x.com/overflowdev/status/1790000000000000000',
+    'https://x.com/loginmaster',
+    'https://x.com/flow',
+    'https://x.com/compose/tweet?ref=login',
+    'about:blank',
+    '',
+])
+def test_other_pages(url):
+    assert not bot._is_login_url(url)
@@ -0,0 +1,52 @@
+import sys
+import threading
+from time import monotonic
+from types import SimpleNamespace
+
+import pytest
+
+import bot
+
+THREADS = 4
+CALLS = 2000
+
+
+@pytest.fixture
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(bot, '_popup_stats', {'calls': 0, 'dismissed': 0, 'seconds': 0.0})
+    monkeypatch.setattr(bot, '_compose_stats', {})
+    monkeypatch.setattr(bot, '_queue_stats', {})
+    monkeypatch.setattr(bot, '_net_stats', {})
+    monkeypatch.setattr(bot.logger, 'disabled', True)
+    # Switch threads as often as possible to surface lost updates
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _hammer():
+    task = SimpleNamespace(func=bot._do_post, priority=bot.PRIORITY_SCHEDULED, enqueued_at=monotonic())
+    for _ in range(CALLS):
+        bot._record_popup_check(1, 0.0)
+        bot._record_first_keystroke(True, 0.0)
+        bot._record_queue_wait(task)
+        bot._on_network_event('request', {})
+        bot._count_network(pages=1, load_seconds=0.0)
+
+
+def test_counters_do_not_lose_updates_across_threads(fresh_stats):
+    threads = [threading.Thread(target=_hammer) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = THREADS * CALLS
+    stats = bot.get_stats()
+    assert stats['popups']['calls'] == total
+    assert stats['popups']['dismissed'] == total
+    assert stats['compose']['warm']['posts'] == total
+    assert sum(s['tasks'] for s in stats['queue']['wait'].values()) == total
+    assert stats['network']['other']['requests'] == total
+    assert stats['network']['other']['pages'] == total
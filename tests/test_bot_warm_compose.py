@@ -0,0 +1,84 @@
+from time import monotonic
+
+import pytest
+
+import bot
+
+
+class FakePage:
+    def __init__(self, url='https://x.com/home'):
+        self.url = url
+        self.visits = []
+
+    def goto(self, url, **kwargs):
+        self.visits.append(url)
+        self.url = url
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """A signed-in, idle headless worker whose page is a FakePage."""
+    monkeypatch.setenv('HEADLESS', 'true')
+    monkeypatch.setenv('COMPOSE_PREWARM', 'true')
+    monkeypatch.setattr(bot, '_page_is_healthy', lambda page: True)
+    monkeypatch.setattr(bot, '_has_auth_cookie', lambda: True)
+    monkeypatch.setattr(bot, '_apply_network_policy', lambda operation: None)
+    monkeypatch.setattr(bot, '_wait', lambda page, selector, timeout=8000: object())
+    page = FakePage()
+    bot._state.context = object()
+    bot._state.page = page
+    bot._state.generation = bot._browser_generation
+    bot._state.login_verified_at = monotonic()
+    bot._state.compose_warmed_at = None
+    bot._state.warm_retry_at = None
+    bot._state.idle_since = monotonic()
+    yield page
+    bot._state.context = None
+    bot._state.page = None
+    bot._state.login_verified_at = None
+    bot._state.compose_warmed_at = None
+    bot._state.warm_retry_at = None
+    bot._state.idle_since = None
+
+
+def test_warms_idle_page(worker):
+    bot._warm_compose()
+    assert worker.visits == [bot._x_url(bot.COMPOSE_PATH)]
+    assert bot._state.compose_warmed_at is not None
+
+
+def test_fresh_warm_page_is_kept(worker):
+    bot._warm_compose()
+    bot._warm_compose()
+    assert len(worker.visits) == 1
+
+
+def test_stale_warm_page_is_reloaded(worker):
+    bot._warm_compose()
+    bot._state.compose_warmed_at -= bot._COMPOSE_MAX_AGE_SECONDS + 1
+    # Past the login cache TTL too: loading compose is the login check
+    bot._state.login_verified_at -= bot._login_cache_ttl() + 1
+    bot._warm_compose()
+    assert len(worker.visits) == 2
+    assert bot._warm_remaining() > bot._COMPOSE_MAX_AGE_SECONDS - 5
+    assert monotonic() - bot._state.login_verified_at < 5
+
+
+def test_idle_worker_wakes_when_warm_page_goes_stale(worker, monkeypatch):
+    monkeypatch.setattr(bot, '_BROWSER_CHECK_SECONDS', 3600)
+    bot._state.compose_warmed_at = monotonic() - bot._COMPOSE_MAX_AGE_SECONDS + 2
+    assert 0 < bot._queue_wait() <= 2
+
+
+def test_failed_warm_up_is_not_retried_right_away(worker, monkeypatch):
+    monkeypatch.setattr(bot, '_wait', lambda page, selector, timeout=8000: None)
+    bot._warm_compose()
+    bot._warm_compose()
+    assert len(worker.visits) == 1
+    assert bot._state.compose_warmed_at is None
+
+
+def test_no_warm_up_without_a_login(worker):
+    bot._state.login_verified_at = None
+    bot._warm_compose()
+    assert worker.visits == []
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+
+def _scheduled(db, minutes=-1):
+    when = (datetime.now() + timedelta(minutes=minutes)).isoformat()
+    return db.create_post('hello', scheduled_at=when, status='scheduled')
+
+
+def test_claim_post_is_exclusive_while_leased(db):
+    post_id = db.create_post('hello')
+    post = db.claim_post(post_id, 'posting')
+    assert post['status'] == 'posting'
+    assert post['lease_owner'].startswith(db.WORKER_ID + ':')
+    assert db.claim_post(post_id, 'posting') is None
+    assert db.get_post(post_id)['lease_owner'] == post['lease_owner']
+
+
+def test_claim_post_takes_over_an_expired_lease(db):
+    post_id = db.create_post('hello')
+    first = db.claim_post(post_id, 'posting', lease_seconds=-1)
+    second = db.claim_post(post_id, 'posting')
+    assert second['lease_owner'] != first['lease_owner']
+
+
+def test_claim_post_applies_extra_fields_and_ignores_missing_posts(db):
+    post_id = db.create_post('hello')
+    post = db.claim_post(post_id, 'posting', error_message=None, text='edited')
+    assert post['text'] == 'edited'
+    assert db.claim_post(post_id + 1, 'posting') is None
+
+
+def test_release_post_needs_the_claim_token(db):
+    post_id = db.create_post('hello')
+    post = db.claim_post(post_id, 'posting')
+    assert db.release_post(post_id, db.WORKER_ID, status='posted') is False
+    assert db.get_post(post_id)['status'] == 'posting'
+
+    assert db.release_post(post_id, post['lease_owner'], status='posted', tweet_url='https://x.com/u/status/1') is True
+    post = db.get_post(post_id)
+    assert post['status'] == 'posted'
+    assert post['tweet_url'] == 'https://x.com/u/status/1'
+    assert post['lease_owner'] is None
+    assert post['lease_expires_at'] is None
+
+
+def test_claims_in_one_process_cannot_release_each_other(db):
+    post_id = db.create_post('hello')
+    stale = db.claim_post(post_id, 'posting', lease_seconds=-1)
+    current = db.claim_post(post_id, 'posting')
+
+    # The timed-out job can neither stretch nor settle the lease it lost
+    assert db.extend_leases([post_id], stale['lease_owner'], 600) == []
+    assert db.release_post(post_id, stale['lease_owner'], status='error', error_message='timeout') is False
+    assert db.get_post(post_id)['lease_owner'] == current['lease_owner']
+
+    assert db.release_post(post_id, current['lease_owner'], status='posted') is True
+    assert db.get_post(post_id)['status'] == 'posted'
+
+
+def test_release_after_reclaim_keeps_the_late_result(db):
+    post_id = db.create_post('hello')
+    post = db.claim_post(post_id, 'posting', lease_seconds=-1)
+    assert db.reclaim_expired_leases() == [post_id]
+    assert db.release_post(post_id, post['lease_owner'], status='posted') is True
+    assert db.get_post(post_id)['status'] == 'posted'
+
+
+def test_reclaim_only_touches_expired_in_flight_posts(db):
+    expired = db.create_post('expired')
+    db.claim_post(expired, 'scheduling', lease_seconds=-1)
+    live = db.create_post('live')
+    db.claim_post(live, 'posting')
+    draft = db.create_post('draft')
+
+    assert db.reclaim_expired_leases() == [expired]
+    post = db.get_post(expired)
+    assert post['status'] == 'error'
+    assert post['error_message'] == 'Interrupted while scheduling: check X before retrying'
+    assert post['lease_owner'] is None
+    assert db.get_post(live)['status'] == 'posting'
+    assert db.get_post(draft)['status'] == 'draft'
+    assert db.reclaim_expired_leases() == []
+
+
+def test_claim_pending_scheduled_skips_backoff_and_claims_once(db):
+    # Scheduled posts are handed to X's own scheduler right away, whatever their date
+    ready = _scheduled(db, minutes=60)
+    backing_off = _scheduled(db, minutes=-10)
+    db.update_post(backing_off, next_attempt_at=(datetime.now() + timedelta(minutes=5)).isoformat())
+    retry_due = _scheduled(db, minutes=30)
+    db.update_post(retry_due, next_attempt_at=(datetime.now() - timedelta(minutes=1)).isoformat())
+    draft = db.create_post('draft')
+
+    claimed = db.claim_pending_scheduled()
+    assert [p['id'] for p in claimed] == [retry_due, ready]
+    assert {p['status'] for p in claimed} == {'scheduling'}
+    assert len({p['lease_owner'] for p in claimed}) == 1
+    assert db.claim_pending_scheduled() == []
+    assert db.get_post(backing_off)['status'] == 'scheduled'
+    assert db.get_post(draft)['status'] == 'draft'
+
+
+def test_claim_pending_scheduled_respects_the_limit_in_schedule_order(db):
+    last = _scheduled(db, minutes=-1)
+    first = _scheduled(db, minutes=-3)
+    second = _scheduled(db, minutes=-2)
+    batch = db.claim_pending_scheduled(limit=2)
+    assert [p['id'] for p in batch] == [first, second]
+    rest = db.claim_pending_scheduled()
+    assert [p['id'] for p in rest] == [last]
+    assert rest[0]['lease_owner'] != batch[0]['lease_owner']
+
+
+def test_extend_leases_only_extends_the_claims_own_posts(db):
+    mine = db.claim_post(db.create_post('mine'), 'scheduling', lease_seconds=-1)
+    theirs = db.claim_post(db.create_post('theirs'), 'scheduling', lease_seconds=-1)
+
+    assert db.extend_leases([mine['id'], theirs['id']], mine['lease_owner'], 600) == [mine['id']]
+    assert db.extend_leases([], mine['lease_owner'], 600) == []
+    assert db.reclaim_expired_leases() == [theirs['id']]
+    assert db.get_post(mine['id'])['status'] == 'scheduling'
@@ -0,0 +1,116 @@
+import sqlite3
+
+import pytest
+
+# A database from before schema versioning: the status CHECK lacks
+# 'scheduling'/'scheduled_on_x', and tweet_url / username do not exist yet
+_LEGACY_SCHEMA = '''
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        text TEXT DEFAULT '',
+        image_path TEXT DEFAULT '',
+        scheduled_at TEXT,
+        status TEXT DEFAULT 'draft' CHECK(status IN ('draft','scheduled','posting','posted','error')),
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        posted_at TEXT,
+        error_message TEXT DEFAULT '',
+        retries_count INTEGER DEFAULT 0
+    );
+    CREATE TABLE followers_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        followers_count INTEGER DEFAULT 0,
+        following_count INTEGER DEFAULT 0,
+        recorded_at TEXT NOT NULL
+    );
+    INSERT INTO posts (id, text, status, created_at, updated_at, retries_count)
+        VALUES (7, 'old post', 'posted', '2024-01-01T10:00:00', '2024-01-01T10:00:00', 2);
+    INSERT INTO followers_history (followers_count, following_count, recorded_at)
+        VALUES (100, 50, '2024-01-01T10:00:00');
+'''
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    import database
+    database.close_all()
+    path = str(tmp_path / 'posts.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(_LEGACY_SCHEMA)
+    conn.close()
+    monkeypatch.setattr(database, 'DB_PATH', path)
+    yield database
+    database.close_all()
+
+
+def _user_version(db):
+    with db.get_connection() as conn:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def _indexes(db):
+    with db.get_connection() as conn:
+        return {r['name'] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_fresh_database_gets_the_latest_schema(db):
+    assert _user_version(db) == len(db.MIGRATIONS)
+    with db.get_connection() as conn:
+        assert tuple(db._table_columns(conn, 'posts')) == db.POST_COLUMNS
+        assert 'username' in db._table_columns(conn, 'followers_history')
+        assert db._table_columns(conn, 'jobs')
+    assert {'idx_posts_status_created', 'idx_posts_status_posted', 'idx_followers_recorded'} <= _indexes(db)
+
+
+def test_legacy_database_is_upgraded_in_place(legacy_db):
+    legacy_db.init_db()
+    assert _user_version(legacy_db) == len(legacy_db.MIGRATIONS)
+
+    post = legacy_db.get_post(7)
+    assert post['text'] == 'old post'
+    assert post['status'] == 'posted'
+    assert post['retries_count'] == 2
+    assert post['tweet_url'] == ''
+    assert post['lease_owner'] is None
+    assert legacy_db.get_follower_history()[0]['followers_count'] == 100
+
+    # The rebuilt CHECK constraint accepts the newer statuses
+    post_id = legacy_db.create_post('new', status='scheduling')
+    assert legacy_db.get_post(post_id)['status'] == 'scheduling'
+    assert post_id > 7
+
+
+def test_init_db_is_a_no_op_once_up_to_date(db):
+    job_id = db.create_job('post_now')
+    db.init_db()
+    assert _user_version(db) == len(db.MIGRATIONS)
+    assert db.get_job(job_id)['kind'] == 'post_now'
+
+
+def test_upgrade_resumes_from_the_recorded_version(db, monkeypatch):
+    all_migrations = db.MIGRATIONS
+    db.close_all()
+    monkeypatch.setattr(db, 'DB_PATH', db.DB_PATH.replace('posts.db', 'older.db'))
+    monkeypatch.setattr(db, 'MIGRATIONS', all_migrations[:3])
+    db.init_db()
+    with db.get_connection() as conn:
+        assert 'next_attempt_at' not in db._table_columns(conn, 'posts')
+
+    monkeypatch.setattr(db, 'MIGRATIONS', all_migrations)
+    db.init_db()
+    assert _user_version(db) == len(all_migrations)
+    with db.get_connection() as conn:
+        assert tuple(db._table_columns(conn, 'posts')) == db.POST_COLUMNS
+
+
+def test_failed_migration_rolls_back_and_keeps_the_version(db, monkeypatch):
+    def broken(conn):
+        conn.execute('CREATE TABLE half_done (id INTEGER)')
+        raise sqlite3.OperationalError('boom')
+
+    monkeypatch.setattr(db, 'MIGRATIONS', db.MIGRATIONS + [broken])
+    with pytest.raises(sqlite3.OperationalError):
+        db.init_db()
+    assert _user_version(db) == len(db.MIGRATIONS) - 1
+    with db.get_connection() as conn:
+        assert not db._table_columns(conn, 'half_done')
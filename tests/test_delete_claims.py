@@ -0,0 +1,84 @@
+import pytest
+
+
+@pytest.fixture
+def queued(db, monkeypatch):
+    """The app's test client, with jobs recorded instead of run."""
+    import app
+    submitted = []
+
+    def submit(kind, func, *args, post_id=None):
+        submitted.append((kind, func, args))
+        return len(submitted)
+
+    monkeypatch.setattr(app.jobs, 'submit', submit)
+    return app.app.test_client(), submitted
+
+
+def _post(db, status, **fields):
+    post_id = db.create_post('hello world', status=status)
+    if fields:
+        db.update_post(post_id, **fields)
+    return post_id
+
+
+def test_second_delete_from_x_is_refused(queued, db):
+    client, submitted = queued
+    post_id = _post(db, 'posted', tweet_url='https://x.com/u/status/1')
+    assert client.post(f'/api/posts/{post_id}/delete-from-x').status_code == 202
+    assert client.post(f'/api/posts/{post_id}/delete-from-x').status_code == 409
+    assert len(submitted) == 1
+    assert db.get_post(post_id)['status'] == 'posted'
+
+
+def test_second_delete_scheduled_is_refused_and_post_now_too(queued, db):
+    client, submitted = queued
+    post_id = _post(db, 'scheduled_on_x')
+    assert client.post(f'/api/posts/{post_id}/delete-scheduled-from-x').status_code == 202
+    assert client.post(f'/api/posts/{post_id}/delete-scheduled-from-x').status_code == 409
+    assert client.post(f'/api/posts/{post_id}/post-now').status_code == 409
+    assert len(submitted) == 1
+
+
+def test_failed_delete_releases_the_post(queued, db, monkeypatch):
+    import app
+    client, submitted = queued
+    post_id = _post(db, 'scheduled_on_x')
+    client.post(f'/api/posts/{post_id}/delete-scheduled-from-x')
+    _, func, args = submitted[0]
+
+    monkeypatch.setattr(app.bot, 'delete_scheduled_tweet', lambda text: {'success': False, 'error': 'not found'})
+    assert func(*args) == {'success': False, 'error': 'not found'}
+    post = db.get_post(post_id)
+    assert post['status'] == 'scheduled_on_x'
+    assert post['lease_owner'] is None
+    assert client.post(f'/api/posts/{post_id}/delete-scheduled-from-x').status_code == 202
+
+
+def test_bulk_delete_skips_posts_already_being_deleted(queued, db):
+    client, submitted = queued
+    busy = _post(db, 'scheduled_on_x')
+    free = _post(db, 'scheduled_on_x')
+    client.post(f'/api/posts/{busy}/delete-scheduled-from-x')
+
+    response = client.post('/api/posts/bulk-delete-scheduled', json={'post_ids': [busy, free]})
+    assert response.status_code == 202
+    _, _, (posts, results) = submitted[-1]
+    assert [p['id'] for p in posts] == [free]
+    assert results[busy] == {'success': False, 'error': 'Post is already being sent to or deleted from X'}
+
+
+def test_scheduler_skips_a_post_being_deleted(db):
+    post_id = _post(db, 'scheduled_on_x')
+    claim = db.claim_post(post_id, 'scheduled_on_x', from_statuses=['scheduled_on_x'])
+    # The user moves it back to the queue while the delete is running
+    db.update_post(post_id, status='scheduled')
+    assert db.claim_pending_scheduled() == []
+    assert db.release_post(post_id, claim['lease_owner']) is True
+    assert [p['id'] for p in db.claim_pending_scheduled()] == [post_id]
+
+
+def test_claim_from_statuses_checks_the_current_status(db):
+    post_id = _post(db, 'posted')
+    assert db.claim_post(post_id, 'scheduled_on_x', from_statuses=['scheduled_on_x']) is None
+    assert db.get_post(post_id)['lease_owner'] is None
@@ -0,0 +1,41 @@
+import logging
+
+import logbuffer
+
+
+def _emit(handler, *messages):
+    for message in messages:
+        handler.handle(logging.LogRecord('bot', logging.INFO, __file__, 1, message, None, None))
+
+
+def test_close_spills_the_partial_batch(tmp_path):
+    handler = logbuffer.RingBufferHandler(capacity=2, spill_dir=str(tmp_path))
+    _emit(handler, 'Post #1 queued', 'two', 'three', 'four', 'five')
+    assert handler.stats()['pending_spill'] == 3
+    assert handler.stats()['segments'] == 0
+
+    handler.close()
+    assert handler.stats()['pending_spill'] == 0
+    assert handler.stats()['segments'] == 1
+
+    # The next run numbers on and still finds the spilled records
+    restarted = logbuffer.RingBufferHandler(capacity=2, spill_dir=str(tmp_path))
+    _emit(restarted, 'six')
+    records = restarted.query(spilled=True)
+    assert [r['message'] for r in records] == ['Post #1 queued', 'two', 'three', 'six']
+    assert records[0]['post_id'] == 1
+    assert restarted.query(post_id=1) == []
+
+
+def test_flush_without_pending_records_writes_nothing(tmp_path):
+    handler = logbuffer.RingBufferHandler(capacity=5, spill_dir=str(tmp_path))
+    _emit(handler, 'one')
+    handler.flush()
+    assert handler.stats()['segments'] == 0
+
+
+def test_flush_without_a_spill_dir_keeps_the_records(tmp_path):
+    handler = logbuffer.RingBufferHandler(capacity=1)
+    _emit(handler, 'one', 'two')
+    handler.close()
+    assert [r['message'] for r in handler.query()] == ['one', 'two']
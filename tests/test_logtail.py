@@ -0,0 +1,116 @@
+import pytest
+
+import logtail
+
+RECORDS = [
+    '2024-05-01 12:00:00,001 [INFO] app: starting\n',
+    '2024-05-01 12:00:01,002 [ERROR] bot: post failed\n',
+    'Traceback (most recent call last):\n',
+    '  File "bot.py", line 1, in post\n',
+    'TimeoutError: compose box\n',
+    '2024-05-01 12:00:02,003 [WARNING] bot.pool: slow page\n',
+    '2024-05-01 12:00:03,004 [INFO] scheduler: tick\n',
+]
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text(''.join(RECORDS), encoding='utf-8')
+    return path
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_tail_returns_the_last_lines_and_the_end_offset(log):
+    text, offset = logtail.tail(str(log), lines=2)
+    assert text == ''.join(RECORDS[-2:])
+    assert offset == log.stat().st_size
+    assert logtail.tail(str(log), lines=100)[0] == ''.join(RECORDS)
+    assert logtail.tail(str(log), lines=0)[0] == ''
+
+
+def test_tail_across_block_boundaries(log, monkeypatch):
+    monkeypatch.setattr(logtail, 'BLOCK_SIZE', 7)
+    assert logtail.tail(str(log), lines=4)[0] == ''.join(RECORDS[-4:])
+    assert logtail.tail(str(log), lines=100)[0] == ''.join(RECORDS)
+
+
+def test_tail_leaves_out_a_line_still_being_written(log):
+    complete = log.stat().st_size
+    _append(log, '2024-05-01 12:00:04,005 [INFO] app: half a li')
+    text, offset = logtail.tail(str(log), lines=1)
+    assert text == RECORDS[-1]
+    assert offset == complete
+
+
+def test_tail_level_filter_keeps_traceback_lines(log):
+    text, _ = logtail.tail(str(log), lines=100, level='error')
+    assert text == ''.join(RECORDS[1:5])
+
+
+def test_tail_logger_filter_matches_children_only(log):
+    text, _ = logtail.tail(str(log), lines=100, logger_name='bot')
+    assert text == ''.join(RECORDS[1:6])
+    assert logtail.tail(str(log), lines=100, logger_name='bo')[0] == ''
+
+
+def test_tail_filtered_line_count_counts_from_the_end(log):
+    text, _ = logtail.tail(str(log), lines=2, logger_name='bot')
+    assert text == ''.join(RECORDS[4:6])
+
+
+def test_tail_of_a_missing_file(tmp_path):
+    assert logtail.tail(str(tmp_path / 'missing.log')) == ('', 0)
+
+
+def test_read_since_returns_only_appended_whole_lines(log):
+    _, offset = logtail.tail(str(log))
+    assert logtail.read_since(str(log), offset) == ('', offset, False)
+
+    _append(log, '2024-05-01 12:00:04,005 [INFO] app: one\n2024-05-01 12:00:05,006 [INFO] app: tw')
+    text, new_offset, reset = logtail.read_since(str(log), offset)
+    assert text == '2024-05-01 12:00:04,005 [INFO] app: one\n'
+    assert not reset
+
+    _append(log, 'o\n')
+    text, final_offset, _ = logtail.read_since(str(log), new_offset)
+    assert text == '2024-05-01 12:00:05,006 [INFO] app: two\n'
+    assert final_offset == log.stat().st_size
+
+
+def test_read_since_caps_a_large_backlog(log, monkeypatch):
+    monkeypatch.setattr(logtail, 'MAX_READ_BYTES', len(RECORDS[0]) + 5)
+    text, offset, _ = logtail.read_since(str(log), 0)
+    assert text == RECORDS[0]
+    assert logtail.read_since(str(log), offset)[0] == RECORDS[1]
+
+
+def test_read_since_reports_rotation(log):
+    _, offset = logtail.tail(str(log))
+    log.write_text(RECORDS[0], encoding='utf-8')
+    assert logtail.read_since(str(log), offset) == ('', 0, True)
+    log.unlink()
+    assert logtail.read_since(str(log), offset) == ('', 0, True)
+    assert logtail.read_since(str(log), 0) == ('', 0, False)
+
+
+def test_read_since_filter_state_spans_calls(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text(''.join(RECORDS[:3]), encoding='utf-8')
+    keep = logtail.make_filter('error')
+    text, offset, _ = logtail.read_since(str(path), 0, keep=keep)
+    assert text == ''.join(RECORDS[1:3])
+
+    # The rest of the traceback arrives in the next read
+    _append(path, ''.join(RECORDS[3:]))
+    text, _, _ = logtail.read_since(str(path), offset, keep=keep)
+    assert text == ''.join(RECORDS[3:5])
+
+
+def test_make_filter_without_criteria_or_with_an_unknown_level():
+    assert logtail.make_filter() is None
+    assert logtail.make_filter('verbose') is None
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+import metrics
+
+
+def _histogram(*values):
+    histogram = metrics.Histogram()
+    for value in values:
+        histogram.observe(value)
+    return histogram
+
+
+def test_quantile_of_an_empty_histogram_is_nan():
+    assert math.isnan(metrics.Histogram().quantile(0.5))
+
+
+def test_quantile_interpolates_within_the_bucket():
+    # Ten observations in the (1, 2] bucket, the largest exactly 2
+    histogram = _histogram(*([1.5] * 9 + [2]))
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(0.9) == pytest.approx(1.9)
+    assert histogram.quantile(1) == pytest.approx(2)
+
+
+def test_quantile_never_exceeds_the_maximum():
+    histogram = _histogram(0.3)
+    assert histogram.quantile(0.5) == pytest.approx(0.275)
+    assert histogram.quantile(0.99) <= 0.3
+    assert histogram.quantile(1) == pytest.approx(0.3)
+
+
+def test_quantile_in_the_overflow_bucket_uses_the_maximum():
+    histogram = _histogram(400, 1000)
+    assert histogram.quantile(0.5) == pytest.approx(650)
+    assert histogram.quantile(1) == pytest.approx(1000)
+
+
+def test_quantile_picks_the_bucket_holding_the_rank():
+    histogram = _histogram(*([0.004] * 90 + [8] * 10))
+    assert histogram.quantile(0.5) <= 0.005
+    assert 7.5 < histogram.quantile(0.95) <= 8
+    assert histogram.quantile(0.9) <= 0.005
+
+
+def test_quantiles_are_monotonic():
+    histogram = _histogram(0.002, 0.04, 0.3, 0.3, 1.2, 4, 4, 9, 25, 70)
+    values = [histogram.quantile(q / 20) for q in range(21)]
+    assert values == sorted(values)
+
+
+def test_zero_durations():
+    histogram = _histogram(0, 0)
+    assert histogram.quantile(0.5) == 0
+    assert histogram.quantile(1) == 0
+
+
+def test_render_exports_summaries(monkeypatch):
+    monkeypatch.setattr(metrics, '_histograms', {})
+    monkeypatch.setattr(metrics, '_counters', {})
+    monkeypatch.setattr(metrics, '_gauges', {})
+    metrics.observe('xpm_test_seconds', 1.5, step='login')
+    metrics.observe('xpm_test_seconds', -1, step='login')
+    lines = metrics.render().splitlines()
+    assert '# TYPE xpm_test_seconds summary' in lines
+    assert 'xpm_test_seconds_count{step="login"} 2' in lines
+    assert 'xpm_test_seconds_sum{step="login"} 1.5' in lines
+    assert any(line.startswith('xpm_test_seconds{step="login",quantile="0.5"} ') for line in lines)
@@ -0,0 +1,93 @@
+import pytest
+
+
+@pytest.fixture
+def client(db):
+    import app
+    return app.app.test_client()
+
+
+def _post_at(db, created_at, status='draft'):
+    post_id = db.create_post(f'post at {created_at}', status=status)
+    with db.transaction() as conn:
+        conn.execute('UPDATE posts SET created_at = ? WHERE id = ?', (created_at, post_id))
+    return post_id
+
+
+def _pages(client, query):
+    """Follow X-Next-Cursor from the first page; returns the pages of ids."""
+    pages, cursor = [], None
+    while True:
+        response = client.get('/api/posts?' + query + (f'&after={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        pages.append([p['id'] for p in response.get_json()])
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages
+
+
+def test_ties_on_created_at_are_broken_by_id(db):
+    same = [_post_at(db, '2024-05-01T12:00:00') for _ in range(3)]
+    older = _post_at(db, '2024-05-01T11:00:00')
+
+    first = db.list_posts(limit=2)
+    assert [p['id'] for p in first] == [same[2], same[1]]
+    last = first[-1]
+    rest = db.list_posts(limit=2, after=(last['created_at'], last['id']))
+    assert [p['id'] for p in rest] == [same[0], older]
+
+
+def test_filters_apply_across_pages(db):
+    drafts = [_post_at(db, f'2024-05-0{day}T12:00:00') for day in range(1, 5)]
+    _post_at(db, '2024-05-03T13:00:00', status='error')
+    page = db.list_posts(statuses=['draft'], limit=2, after=('2024-05-03T12:00:00', drafts[2]))
+    assert [p['id'] for p in page] == [drafts[1], drafts[0]]
+
+
+def test_fields_always_include_the_cursor_columns(db):
+    _post_at(db, '2024-05-01T12:00:00')
+    assert set(db.list_posts(fields=['status'])[0]) == {'id', 'created_at', 'status'}
+
+
+def test_pages_cover_every_post_once(client, db):
+    ids = [_post_at(db, f'2024-05-01T12:00:0{i % 3}') for i in range(7)]
+    pages = _pages(client, 'limit=3')
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert sorted(sum(pages, [])) == sorted(ids)
+
+
+def test_no_cursor_after_an_exactly_full_last_page(client, db):
+    for i in range(4):
+        _post_at(db, f'2024-05-01T12:00:0{i}')
+    assert [len(p) for p in _pages(client, 'limit=2')] == [2, 2]
+
+
+def test_empty_result_and_total_count(client, db):
+    _post_at(db, '2024-05-01T12:00:00')
+    response = client.get('/api/posts?status=posted&limit=5')
+    assert response.get_json() == []
+    assert response.headers['X-Total-Count'] == '0'
+    assert 'X-Next-Cursor' not in response.headers
+
+    response = client.get('/api/posts?limit=1')
+    assert response.headers['X-Total-Count'] == '1'
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_cursor_round_trips_fractional_timestamps(client, db):
+    first = _post_at(db, '2024-05-01T12:00:00.123456')
+    second = _post_at(db, '2024-05-01T12:00:00.123456')
+    response = client.get('/api/posts?limit=1')
+    assert response.headers['X-Next-Cursor'] == f'2024-05-01T12:00:00.123456|{second}'
+    assert [p['id'] for p in response.get_json()] == [second]
+    assert _pages(client, 'limit=1') == [[second], [first]]
+
+
+@pytest.mark.parametrize('query', [
+    'after=garbage', 'after=2024-05-01T12:00:00|', 'after=|3', 'after=2024-05-01|x1',
+    'limit=0', 'limit=501', 'limit=abc', 'limit=-3', 'limit=2.5', 'limit=%203', 'fields=password', 'status=archived', 'from=yesterday',
+])
+def test_invalid_parameters_are_rejected(client, query):
+    response = client.get('/api/posts?' + query)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+import selector_cache
+
+# X's compose modal keeps a hidden copy of the Post button ahead of the visible one
+HIDDEN_THEN_VISIBLE = '''
+    <div style="display: none"><button data-testid="tweetButton">Post</button></div>
+    <button data-testid="tweetButton">Post</button>
+'''
+
+
+class FakeElement:
+    def __init__(self, visible):
+        self.visible = visible
+
+    def is_visible(self):
+        return self.visible
+
+
+class FakeLocator:
+    """The slice of Playwright's Locator that find() uses, over a fixed DOM."""
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def or_(self, other):
+        return FakeLocator(self.elements + other.elements)
+
+    def filter(self, visible=None):
+        return FakeLocator([e for e in self.elements if visible is None or e.visible == visible])
+
+    @property
+    def first(self):
+        return FakeLocator(self.elements[:1])
+
+    def count(self):
+        return len(self.elements)
+
+    def wait_for(self, state='visible', timeout=None):
+        if not any(e.visible for e in self.elements[:1]):
+            raise TimeoutError(f'Timeout {timeout}ms exceeded')
+
+    def element_handle(self, timeout=None):
+        return self.elements[0]
+
+
+class FakePage:
+    def __init__(self, dom):
+        self.dom = dom
+
+    def locator(self, selector):
+        return FakeLocator(self.dom.get(selector, []))
+
+    def query_selector(self, selector):
+        return (self.dom.get(selector) or [None])[0]
+
+
+class AsyncFakeLocator(FakeLocator):
+    def or_(self, other):
+        return AsyncFakeLocator(super().or_(other).elements)
+
+    def filter(self, visible=None):
+        return AsyncFakeLocator(super().filter(visible).elements)
+
+    @property
+    def first(self):
+        return AsyncFakeLocator(self.elements[:1])
+
+    async def count(self):
+        return super().count()
+
+    async def wait_for(self, state='visible', timeout=None):
+        super().wait_for(state, timeout)
+
+    async def element_handle(self, timeout=None):
+        return super().element_handle(timeout)
+
+
+class AsyncFakePage(FakePage):
+    def locator(self, selector):
+        return AsyncFakeLocator(self.dom.get(selector, []))
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(selector_cache, '_stats', {})
+    monkeypatch.setattr(selector_cache, 'flush', lambda: None)
+
+
+def _hidden_then_visible():
+    visible = FakeElement(True)
+    dom = {'[data-testid="tweetButton"]': [FakeElement(False), visible]}
+    return dom, visible
+
+
+def test_find_returns_a_visible_match_behind_a_hidden_one():
+    dom, visible = _hidden_then_visible()
+    candidates = ['button[aria-label="Post"]', '[data-testid="tweetButton"]']
+    assert selector_cache.find(FakePage(dom), 'post_button', candidates, timeout=10) is visible
+    stats = selector_cache.get_stats()['post_button']
+    assert stats['hits'] == {'[data-testid="tweetButton"]': 1}
+    assert stats['misses'] == 0
+
+
+def test_find_async_returns_a_visible_match_behind_a_hidden_one():
+    dom, visible = _hidden_then_visible()
+    found = asyncio.run(selector_cache.find_async(AsyncFakePage(dom), 'post_button',
+                                                  ['[data-testid="tweetButton"]'], timeout=10))
+    assert found is visible
+    assert selector_cache.get_stats()['post_button']['misses'] == 0
+
+
+def test_find_misses_when_every_match_is_hidden():
+    dom = {'[data-testid="tweetButton"]': [FakeElement(False)]}
+    assert selector_cache.find(FakePage(dom), 'post_button', ['[data-testid="tweetButton"]'], timeout=10) is None
+    assert selector_cache.get_stats()['post_button']['misses'] == 1
+
+
+def test_find_in_a_real_browser():
+    sync_api = pytest.importorskip('playwright.sync_api')
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            pytest.skip(f'Chromium not available: {e}')
+        try:
+            page = browser.new_page()
+            page.set_content(HIDDEN_THEN_VISIBLE)
+            el = selector_cache.find(page, 'post_button', ['[data-testid="tweetButton"]'], timeout=2000)
+            assert el is not None and el.is_visible()
+        finally:
+            browser.close()
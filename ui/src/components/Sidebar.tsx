@@ -11,8 +11,9 @@ import {
   Lock,
   Info,
 } from 'lucide-react'
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
 import { cn } from '@/lib/utils'
+import { useServerRefresh } from '@/lib/events'
 import { useSettings } from '@/contexts/SettingsContext'
 import type { TranslationKey } from '@/lib/i18n'
 
@@ -38,18 +39,16 @@ export function Sidebar({ activePage, onNavigate }: SidebarProps) {
   const { t, configured, theme } = useSettings()
   const [connected, setConnected] = useState<boolean | null>(null)
 
-  useEffect(() => {
-    const check = () => {
-      fetch('/api/profile')
-        .then(r => r.json())
-        .then(d => setConnected(!!d.username))
-        .catch(() => setConnected(false))
-    }
-    check()
-    const interval = setInterval(check, 30000)
-    return () => clearInterval(interval)
+  const check = useCallback(() => {
+    fetch('/api/profile')
+      .then(r => r.json())
+      .then(d => setConnected(!!d.username))
+      .catch(() => setConnected(false))
   }, [])
 
+  useEffect(check, [check])
+  useServerRefresh(['profile', 'settings'], check)
+
   return (
     <aside className="w-60 h-screen flex flex-col border-r border-border bg-bg-secondary shrink-0">
       {/* Logo */}
@@ -1,6 +1,7 @@
 import { createContext, useContext, useState, useCallback, useEffect, type ReactNode } from 'react'
 import { getTranslation, type Locale, type TranslationKey } from '@/lib/i18n'
 import * as api from '@/lib/api'
+import { useServerEvent, useServerRefresh } from '@/lib/events'
 
 type Theme = 'light' | 'dark'
 
@@ -81,13 +82,13 @@ export function SettingsProvider({ children }: { children: ReactNode }) {
     }
   }, [])
 
-  // Check config + Google status on mount + periodic config recheck every 30s
+  // Check config + Google status on mount, then again when the server reports a change
   useEffect(() => {
     recheckConfig()
     recheckGoogle()
-    const interval = setInterval(recheckConfig, 30000)
-    return () => clearInterval(interval)
   }, [recheckConfig, recheckGoogle])
+  useServerRefresh(['settings'], recheckConfig)
+  useServerEvent('settings', data => { if (data.google_connected !== undefined) recheckGoogle() })
 
   return (
     <SettingsContext.Provider value={{ locale, setLocale, theme, setTheme, t, configured, recheckConfig, googleConnected, checkingGoogle, recheckGoogle }}>
@@ -1,3 +1,5 @@
+import { subscribe } from '@/lib/events'
+
 const BASE = ''
 
 class ApiError extends Error {
@@ -55,12 +57,46 @@ export interface ProfileStats {
   history: FollowerSnapshot[]
 }
 
-export async function fetchPosts(status?: string): Promise<Post[]> {
-  const url = status ? `${BASE}/api/posts?status=${status}` : `${BASE}/api/posts`
-  const res = await fetch(url)
+export interface PostQuery {
+  status?: Post['status'] | Post['status'][]
+  from?: string
+  to?: string
+  limit?: number
+  after?: string | null
+}
+
+function postQueryString(query: PostQuery): string {
+  const params = new URLSearchParams()
+  if (query.status) params.set('status', Array.isArray(query.status) ? query.status.join(',') : query.status)
+  if (query.from) params.set('from', query.from)
+  if (query.to) params.set('to', query.to)
+  if (query.limit) params.set('limit', String(query.limit))
+  if (query.after) params.set('after', query.after)
+  const qs = params.toString()
+  return qs ? `?${qs}` : ''
+}
+
+export async function fetchPosts(query: PostQuery = {}): Promise<Post[]> {
+  const res = await fetch(`${BASE}/api/posts${postQueryString(query)}`)
   return handleResponse<Post[]>(res)
 }
 
+export interface PostPage {
+  posts: Post[]
+  total: number
+  nextCursor: string | null
+}
+
+export async function fetchPostsPage(query: PostQuery & { limit: number }): Promise<PostPage> {
+  const res = await fetch(`${BASE}/api/posts${postQueryString(query)}`)
+  const posts = await handleResponse<Post[]>(res)
+  return {
+    posts,
+    total: Number(res.headers.get('X-Total-Count') ?? posts.length),
+    nextCursor: res.headers.get('X-Next-Cursor'),
+  }
+}
+
 export async function fetchPost(id: number): Promise<Post> {
   const res = await fetch(`${BASE}/api/posts/${id}`)
   return handleResponse<Post>(res)
@@ -85,19 +121,71 @@ export async function deletePost(id: number): Promise<void> {
   if (!res.ok) throw new ApiError(res.status, res.statusText)
 }
 
+export interface Job<T = { success: boolean; error?: string }> {
+  id: number
+  kind: string
+  post_id: number | null
+  status: 'queued' | 'running' | 'done' | 'error'
+  result: T | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+}
+
+// Job results arrive as 'job' events; this slow poll only covers a missed event
+const JOB_FALLBACK_POLL_MS = 10000
+
+export async function fetchJob<T>(id: number): Promise<Job<T>> {
+  const res = await fetch(`${BASE}/api/jobs/${id}`)
+  return handleResponse<Job<T>>(res)
+}
+
+export async function cancelJob(id: number): Promise<{ success: boolean }> {
+  const res = await fetch(`${BASE}/api/jobs/${id}/cancel`, { method: 'POST' })
+  return handleResponse<{ success: boolean }>(res)
+}
+
+// Browser actions answer 202 with a job id; wait for its result on the event stream.
+export function waitForJob<T extends { success: boolean; error?: string }>(id: number): Promise<T> {
+  return new Promise<T>((resolve, reject) => {
+    const finish = (job: Job<T>) => {
+      if (job.id !== id || (job.status !== 'done' && job.status !== 'error')) return
+      unsubscribe()
+      clearInterval(timer)
+      resolve(job.result ?? ({ success: false } as T))
+    }
+    const check = () => fetchJob<T>(id).then(finish).catch(err => {
+      unsubscribe()
+      clearInterval(timer)
+      reject(err)
+    })
+    const unsubscribe = subscribe('job', job => finish(job as Job<T>))
+    const timer = setInterval(check, JOB_FALLBACK_POLL_MS)
+    // The job may already have finished before we subscribed
+    check()
+  })
+}
+
+async function runJob<T extends { success: boolean; error?: string }>(url: string, body?: unknown): Promise<T> {
+  const res = await fetch(url, body === undefined ? { method: 'POST' } : {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  })
+  const { job_id } = await handleResponse<{ job_id: number }>(res)
+  return waitForJob<T>(job_id)
+}
+
 export async function postNow(id: number): Promise<{ success: boolean; error?: string }> {
-  const res = await fetch(`${BASE}/api/posts/${id}/post-now`, { method: 'POST' })
-  return handleResponse<{ success: boolean; error?: string }>(res)
+  return runJob(`${BASE}/api/posts/${id}/post-now`)
 }
 
 export async function scheduleNow(id: number): Promise<{ success: boolean; error?: string }> {
-  const res = await fetch(`${BASE}/api/posts/${id}/schedule-now`, { method: 'POST' })
-  return handleResponse<{ success: boolean; error?: string }>(res)
+  return runJob(`${BASE}/api/posts/${id}/schedule-now`)
 }
 
 export async function retryPost(id: number): Promise<{ success: boolean; error?: string }> {
-  const res = await fetch(`${BASE}/api/posts/${id}/retry`, { method: 'POST' })
-  return handleResponse<{ success: boolean; error?: string }>(res)
+  return runJob(`${BASE}/api/posts/${id}/retry`)
 }
 
 export async function removeMedia(id: number): Promise<{ success: boolean }> {
@@ -111,13 +199,23 @@ export async function duplicatePost(id: number): Promise<Post> {
 }
 
 export async function deleteFromX(id: number): Promise<{ success: boolean; error?: string; already_deleted?: boolean }> {
-  const res = await fetch(`${BASE}/api/posts/${id}/delete-from-x`, { method: 'POST' })
-  return handleResponse<{ success: boolean; error?: string; already_deleted?: boolean }>(res)
+  return runJob(`${BASE}/api/posts/${id}/delete-from-x`)
 }
 
 export async function deleteScheduledFromX(id: number): Promise<{ success: boolean; error?: string }> {
-  const res = await fetch(`${BASE}/api/posts/${id}/delete-scheduled-from-x`, { method: 'POST' })
-  return handleResponse<{ success: boolean; error?: string }>(res)
+  return runJob(`${BASE}/api/posts/${id}/delete-scheduled-from-x`)
+}
+
+export interface BulkDeleteResult {
+  success: boolean
+  error?: string
+  deleted: number
+  results: { post_id: number; success: boolean; error?: string }[]
+}
+
+// Cancels every post on X in one pass over the Scheduled list
+export async function bulkDeleteScheduledFromX(ids: number[]): Promise<BulkDeleteResult> {
+  return runJob(`${BASE}/api/posts/bulk-delete-scheduled`, { post_ids: ids })
 }
 
 export async function testConnection(): Promise<{ success: boolean; error?: string; needs_manual_intervention?: boolean }> {
@@ -131,8 +229,7 @@ export async function fetchProfile(): Promise<Profile> {
 }
 
 export async function fetchProfileFromX(): Promise<{ success: boolean; display_name?: string; username?: string; error?: string }> {
-  const res = await fetch(`${BASE}/api/profile/fetch`, { method: 'POST' })
-  return handleResponse<{ success: boolean; display_name?: string; username?: string; error?: string }>(res)
+  return runJob(`${BASE}/api/profile/fetch`)
 }
 
 export async function fetchProfileStats(): Promise<ProfileStats> {
@@ -140,9 +237,22 @@ export async function fetchProfileStats(): Promise<ProfileStats> {
   return handleResponse<ProfileStats>(res)
 }
 
-export async function fetchLogs(): Promise<{ logs: string }> {
-  const res = await fetch(`${BASE}/api/logs`)
-  return handleResponse<{ logs: string }>(res)
+export interface LogChunk {
+  logs: string
+  // Cursor for the next call (byte offset in the log file)
+  offset: number
+  // The log was rotated: ``logs`` is a fresh tail, not a continuation
+  reset: boolean
+}
+
+export async function fetchLogs(params: { lines?: number; since?: number; level?: string; logger?: string } = {}): Promise<LogChunk> {
+  const query = new URLSearchParams()
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== '') query.set(key, String(value))
+  })
+  const qs = query.toString()
+  const res = await fetch(`${BASE}/api/logs${qs ? `?${qs}` : ''}`)
+  return handleResponse<LogChunk>(res)
 }
 
 export async function fetchPreferences(): Promise<Record<string, string>> {
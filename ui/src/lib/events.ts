@@ -0,0 +1,91 @@
+import { useEffect, useRef } from 'react'
+import type { Job } from '@/lib/api'
+
+// One EventSource on GET /api/events is shared by the whole app; pages
+// subscribe to the event types they display instead of polling the API.
+
+export interface PostEvent {
+  id: number
+  action: 'created' | 'updated' | 'deleted'
+  status: string | null
+}
+
+export interface SchedulerEvent {
+  ran_at: string
+  next_run_in: number | null
+}
+
+export interface ServerEvents {
+  post: PostEvent
+  job: Job
+  scheduler: SchedulerEvent
+  settings: { configured?: boolean; google_connected?: boolean }
+  profile: { username: string }
+  // Fired when the stream (re)connects: events may have been missed, reload
+  open: null
+}
+
+type Handler<K extends keyof ServerEvents> = (data: ServerEvents[K]) => void
+
+const handlers = new Map<keyof ServerEvents, Set<Handler<never>>>()
+let source: EventSource | null = null
+
+function dispatch<K extends keyof ServerEvents>(type: K, data: ServerEvents[K]) {
+  handlers.get(type)?.forEach(handler => (handler as Handler<K>)(data))
+}
+
+function listen(type: keyof ServerEvents) {
+  if (!source || type === 'open') return
+  source.addEventListener(type, e => dispatch(type, JSON.parse((e as MessageEvent).data)))
+}
+
+function connect() {
+  if (source) return
+  source = new EventSource('/api/events')
+  let opened = false
+  source.onopen = () => {
+    // The first open is covered by each page's initial load
+    if (opened) dispatch('open', null)
+    opened = true
+  }
+  handlers.forEach((_, type) => listen(type))
+}
+
+export function subscribe<K extends keyof ServerEvents>(type: K, handler: Handler<K>): () => void {
+  connect()
+  let set = handlers.get(type)
+  if (!set) {
+    set = new Set()
+    handlers.set(type, set)
+    listen(type)
+  }
+  set.add(handler as Handler<never>)
+  return () => { set.delete(handler as Handler<never>) }
+}
+
+// Calls the latest ``handler`` for every ``type`` event while mounted.
+export function useServerEvent<K extends keyof ServerEvents>(type: K, handler: Handler<K>) {
+  const ref = useRef(handler)
+  ref.current = handler
+  useEffect(() => subscribe(type, data => ref.current(data)), [type])
+}
+
+// Re-runs ``refresh`` (debounced) after any of ``types`` and after the stream
+// reconnects, so bursts of events cost a single reload.
+export function useServerRefresh(types: (keyof ServerEvents)[], refresh: () => void, delayMs = 300) {
+  const ref = useRef(refresh)
+  ref.current = refresh
+  const key = types.join(',')
+  useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | undefined
+    const schedule = () => {
+      clearTimeout(timer)
+      timer = setTimeout(() => ref.current(), delayMs)
+    }
+    const unsubscribers = [...key.split(','), 'open'].map(type => subscribe(type as keyof ServerEvents, schedule))
+    return () => {
+      clearTimeout(timer)
+      unsubscribers.forEach(unsubscribe => unsubscribe())
+    }
+  }, [key, delayMs])
+}
@@ -116,6 +116,7 @@ const translations = {
   'history.alreadyDeleted': { fr: 'Tweet déjà supprimé', en: 'Tweet already deleted' },
   'history.noTweetUrl': { fr: 'Pas de lien tweet (post ancien)', en: 'No tweet URL (old post)' },
   'history.viewOnX': { fr: 'Voir sur X', en: 'View on X' },
+  'history.loadMore': { fr: 'Charger plus', en: 'Load more' },
 
   // Logs page
   'logs.title': { fr: 'Logs', en: 'Logs' },
@@ -123,6 +124,9 @@ const translations = {
   'logs.autoRefresh': { fr: 'Auto-refresh', en: 'Auto-refresh' },
   'logs.noLogs': { fr: 'Aucun log disponible.', en: 'No logs available.' },
   'logs.copied': { fr: 'Logs copiés dans le presse-papier', en: 'Logs copied to clipboard' },
+  'logs.levelAll': { fr: 'Tous les niveaux', en: 'All levels' },
+  'logs.levelWarning': { fr: 'Avertissements et erreurs', en: 'Warnings and errors' },
+  'logs.levelError': { fr: 'Erreurs', en: 'Errors' },
 
   // Settings page
   'settings.title': { fr: 'Paramètres', en: 'Settings' },
@@ -158,7 +162,7 @@ const translations = {
   'settings.chromeEmptyHint': { fr: 'Laissez ces champs vides pour utiliser le navigateur Chromium intégré de Playwright (recommandé pour commencer).', en: 'Leave these fields empty to use Playwright\'s built-in Chromium browser (recommended to start).' },
   'settings.envHeadless': { fr: 'pour navigateur invisible', en: 'for headless browser' },
   'settings.envHeadlessAlt': { fr: 'pour le voir', en: 'to see it' },
-  'settings.envInterval': { fr: 'fréquence de vérification des posts programmés (en secondes)', en: 'check frequency for scheduled posts (in seconds)' },
+  'settings.envInterval': { fr: 'délai avant de retenter un post programmé en échec (en secondes)', en: 'delay before retrying a failed scheduled post (in seconds)' },
   'settings.manualIntervention': { fr: 'X demande une vérification manuelle. Mettez HEADLESS=false dans .env et connectez-vous manuellement.', en: 'X requires manual verification. Set HEADLESS=false in .env and log in manually.' },
   'settings.errorUnknown': { fr: 'Erreur inconnue', en: 'Unknown error' },
   'settings.failPrefix': { fr: 'Échec', en: 'Failed' },
@@ -183,7 +187,7 @@ const translations = {
   'settings.labelChromeProfile': { fr: 'Chemin profil Chrome', en: 'Chrome profile path' },
   'settings.labelChromePath': { fr: 'Chemin exécutable Chrome', en: 'Chrome executable path' },
   'settings.labelBrowser': { fr: 'Navigateur', en: 'Browser' },
-  'settings.labelCheckInterval': { fr: 'Fréquence vérification', en: 'Check frequency' },
+  'settings.labelCheckInterval': { fr: 'Délai de nouvelle tentative', en: 'Retry delay' },
   'settings.labelMaxRetries': { fr: 'Nombre de tentatives', en: 'Max retries' },
   'settings.browserVisible': { fr: 'Visible', en: 'Visible' },
   'settings.browserInvisible': { fr: 'Invisible', en: 'Invisible' },
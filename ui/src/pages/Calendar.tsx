@@ -22,6 +22,10 @@ const statusDotColors: Record<string, string> = {
   posting: 'bg-warning',
 }
 
+// Statuses placed on the calendar (drafts by creation date, published posts by
+// publication date, the rest by scheduled date; the server applies the same rule)
+const calendarStatuses: Post['status'][] = ['posted', 'scheduled', 'scheduled_on_x', 'scheduling', 'error', 'draft']
+
 export function Calendar() {
   const { t, locale } = useSettings()
   const confirm = useConfirm()
@@ -51,11 +55,14 @@ export function Calendar() {
   }, [previewPost])
 
   const load = useCallback(async () => {
+    const from = `${year}-${String(month + 1).padStart(2, '0')}-01`
+    const nextYear = month === 11 ? year + 1 : year
+    const to = `${nextYear}-${String((month + 1) % 12 + 1).padStart(2, '0')}-01`
     try {
-      const data = await api.fetchPosts()
+      const data = await api.fetchPosts({ status: calendarStatuses, from, to })
       setPosts(data)
     } catch { /* ignore */ }
-  }, [])
+  }, [year, month])
 
   useEffect(() => { load() }, [load])
 
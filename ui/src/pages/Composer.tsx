@@ -26,7 +26,7 @@ export function Composer() {
 
   const loadDrafts = useCallback(async () => {
     try {
-      const posts = await api.fetchPosts('draft')
+      const posts = await api.fetchPosts({ status: 'draft' })
       setDrafts(posts)
     } catch { /* ignore */ }
   }, [])
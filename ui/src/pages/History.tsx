@@ -12,12 +12,17 @@ import { cn } from '@/lib/utils'
 
 type Tab = 'posted' | 'error'
 
+const PAGE_SIZE = 50
+
 export function History() {
   const { t } = useSettings()
   const confirm = useConfirm()
   const [tab, setTab] = useState<Tab>('posted')
   const [posts, setPosts] = useState<Post[]>([])
+  const [total, setTotal] = useState(0)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [previewPost, setPreviewPost] = useState<Post | null>(null)
   const [profile, setProfile] = useState<api.Profile | null>(null)
 
@@ -28,8 +33,10 @@ export function History() {
   const load = useCallback(async (status: Tab) => {
     setLoading(true)
     try {
-      const data = await api.fetchPosts(status)
-      setPosts(data)
+      const page = await api.fetchPostsPage({ status, limit: PAGE_SIZE })
+      setPosts(page.posts)
+      setTotal(page.total)
+      setNextCursor(page.nextCursor)
     } catch {
       toast.error(t('common.connectionError'))
     } finally {
@@ -37,6 +44,21 @@ export function History() {
     }
   }, [t])
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await api.fetchPostsPage({ status: tab, limit: PAGE_SIZE, after: nextCursor })
+      setPosts(prev => [...prev, ...page.posts])
+      setTotal(page.total)
+      setNextCursor(page.nextCursor)
+    } catch {
+      toast.error(t('common.connectionError'))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => {
     load(tab)
   }, [tab, load])
@@ -129,6 +151,17 @@ export function History() {
               onDeleteFromX={id => handleAction('delete-from-x', id)}
             />
           ))}
+          {nextCursor && (
+            <div className="px-6 py-4 text-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="inline-flex items-center gap-1.5 px-3 py-1.5 text-xs font-medium text-text-secondary border border-border rounded-md hover:bg-bg-hover transition-colors disabled:opacity-50"
+              >
+                {loadingMore ? t('common.loading') : `${t('history.loadMore')} (${posts.length}/${total})`}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
@@ -5,33 +5,66 @@ import { PageHeader } from '@/components/PageHeader'
 import { useSettings } from '@/contexts/SettingsContext'
 import * as api from '@/lib/api'
 
+// Lines kept on screen while new ones stream in
+const MAX_LINES = 2000
+
+function keepLast(text: string) {
+  const lines = text.split('\n')
+  return lines.length > MAX_LINES + 1 ? lines.slice(-MAX_LINES - 1).join('\n') : text
+}
+
 export function Logs() {
   const { t } = useSettings()
   const [logs, setLogs] = useState('')
   const [loading, setLoading] = useState(true)
   const [autoRefresh, setAutoRefresh] = useState(true)
+  const [level, setLevel] = useState('')
+  // The tail for the current filter is loaded; the stream continues from offsetRef
+  const [ready, setReady] = useState(false)
+  const offsetRef = useRef(0)
   const preRef = useRef<HTMLPreElement>(null)
 
+  const scrollToBottom = () => {
+    requestAnimationFrame(() => {
+      if (preRef.current) preRef.current.scrollTop = preRef.current.scrollHeight
+    })
+  }
+
   const refresh = useCallback(async () => {
     try {
-      const data = await api.fetchLogs()
-      setLogs(data.logs || t('logs.noLogs'))
-      if (preRef.current) {
-        preRef.current.scrollTop = preRef.current.scrollHeight
-      }
+      const data = await api.fetchLogs({ level })
+      setLogs(data.logs)
+      offsetRef.current = data.offset
+      setReady(true)
+      scrollToBottom()
     } catch { /* ignore */ }
     finally { setLoading(false) }
-  }, [t])
+  }, [level])
 
   useEffect(() => {
     refresh()
   }, [refresh])
 
+  // Live tail: only lines appended after the loaded offset are sent
   useEffect(() => {
-    if (!autoRefresh) return
-    const interval = setInterval(refresh, 5000)
-    return () => clearInterval(interval)
-  }, [autoRefresh, refresh])
+    if (!autoRefresh || !ready) return
+    const params = new URLSearchParams({ since: String(offsetRef.current) })
+    if (level) params.set('level', level)
+    const source = new EventSource(`/api/logs/stream?${params}`)
+    source.addEventListener('log', e => {
+      const data: { lines: string; offset: number } = JSON.parse((e as MessageEvent).data)
+      offsetRef.current = data.offset
+      setLogs(prev => keepLast(prev + data.lines))
+      scrollToBottom()
+    })
+    source.addEventListener('reset', e => {
+      const data: { lines: string; offset: number } = JSON.parse((e as MessageEvent).data)
+      offsetRef.current = data.offset
+      setLogs(data.lines)
+      scrollToBottom()
+    })
+    return () => source.close()
+  }, [autoRefresh, level, ready])
 
   const copyLogs = () => {
     navigator.clipboard.writeText(logs)
@@ -45,6 +78,15 @@ export function Logs() {
         description={t('logs.desc')}
         actions={
           <div className="flex items-center gap-2">
+            <select
+              value={level}
+              onChange={e => { setReady(false); setLevel(e.target.value) }}
+              className="px-2 py-1 text-xs border border-border rounded-md focus:outline-none focus:border-accent bg-bg text-text-secondary [&>option]:bg-bg [&>option]:text-text"
+            >
+              <option value="">{t('logs.levelAll')}</option>
+              <option value="WARNING">{t('logs.levelWarning')}</option>
+              <option value="ERROR">{t('logs.levelError')}</option>
+            </select>
             <label className="flex items-center gap-1.5 text-xs text-text-muted cursor-pointer select-none">
               <input
                 type="checkbox"
@@ -74,7 +116,7 @@ export function Logs() {
         ref={preRef}
         className="flex-1 m-3 p-4 bg-[#111827] text-[#e5e7eb] font-mono text-xs leading-relaxed rounded-lg overflow-y-auto whitespace-pre-wrap break-all select-text"
       >
-        {loading ? t('common.loading') : logs}
+        {loading ? t('common.loading') : logs || t('logs.noLogs')}
       </pre>
     </div>
   )
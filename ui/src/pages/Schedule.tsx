@@ -6,6 +6,7 @@ import { EditModal } from '@/components/EditModal'
 import { useConfirm } from '@/components/ConfirmModal'
 import { useSettings } from '@/contexts/SettingsContext'
 import * as api from '@/lib/api'
+import { useServerRefresh } from '@/lib/events'
 import type { Post } from '@/lib/api'
 import { formatDate, timeFromNow, cn } from '@/lib/utils'
 import type { TranslationKey } from '@/lib/i18n'
@@ -20,6 +21,9 @@ const statusKeys: Record<Post['status'], TranslationKey> = {
   error: 'status.error',
 }
 
+// Statuses shown on this page, in display order
+const scheduleStatuses: Post['status'][] = ['posting', 'scheduling', 'scheduled', 'scheduled_on_x']
+
 export function Schedule() {
   const { t, locale } = useSettings()
   const confirm = useConfirm()
@@ -31,13 +35,8 @@ export function Schedule() {
 
   const load = useCallback(async () => {
     try {
-      const [scheduled, scheduling, scheduledOnX, posting] = await Promise.all([
-        api.fetchPosts('scheduled'),
-        api.fetchPosts('scheduling'),
-        api.fetchPosts('scheduled_on_x'),
-        api.fetchPosts('posting'),
-      ])
-      setPosts([...posting, ...scheduling, ...scheduled, ...scheduledOnX])
+      const data = await api.fetchPosts({ status: scheduleStatuses })
+      setPosts(data.sort((a, b) => scheduleStatuses.indexOf(a.status) - scheduleStatuses.indexOf(b.status)))
     } catch {
       toast.error(t('common.loadingError'))
     } finally {
@@ -45,19 +44,13 @@ export function Schedule() {
     }
   }, [t])
 
-  // Polling plus rapide quand des posts sont en cours de traitement
-  const hasProcessingPosts = posts.some(p => p.status === 'scheduling' || p.status === 'posting')
-  const pollInterval = hasProcessingPosts ? 3000 : 15000
-
   useEffect(() => {
     api.fetchProfile().then(setProfile).catch(() => {})
     load()
   }, [load])
 
-  useEffect(() => {
-    const interval = setInterval(load, pollInterval)
-    return () => clearInterval(interval)
-  }, [load, pollInterval])
+  // Recharge quand un post change cote serveur (flux /api/events)
+  useServerRefresh(['post'], load)
 
   const handleAction = async (action: string, id: number) => {
     try {